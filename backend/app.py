@@ -15,6 +15,8 @@ from services.chroma_service import initialize_collections
 from config import get_config
 import shutil
 from schedulers.environment_scheduler import start_scheduler
+from schedulers.sales_scheduler import start_scheduler as start_sales_scheduler
+from schedulers.vector_scheduler import start_scheduler as start_vector_scheduler
 import os
 from datetime import datetime
 from logging.handlers import RotatingFileHandler
@@ -165,19 +167,44 @@ def create_app():
         """컨테이너 헬스체크용 엔드포인트"""
         try:
             # 데이터베이스 연결 확인
-            from database import get_db_connection
+            from database import get_db_connection, get_pool_stats
             db = get_db_connection()
             with db.cursor() as cursor:
                 cursor.execute("SELECT 1")
                 result = cursor.fetchone()
             db.close()
             
+            # 캐시 상태 (쿼리 임베딩 캐시 hit/miss)
+            from core.embeddings.hf_embedding import get_query_cache_stats, get_disk_cache_stats
+            from services.chat_service import answer_cache
+            from core.utils.pattern_matcher import pattern_matcher
+            from core.handlers.registry import handler_registry
+            from services.environment_service import environment_service
+            from services.vector_service import vector_sync
+            from services.chroma_service import collection_registry
+            
             return jsonify({
                 "status": "healthy",
                 "timestamp": time.time(),
                 "service": "ywlab-backend",
                 "version": DEPLOY_VERSION,
-                "deploy_time": DEPLOY_TIMESTAMP
+                "deploy_time": DEPLOY_TIMESTAMP,
+                "cache": {
+                    "query_embedding": get_query_cache_stats(),
+                    "embedding_disk": get_disk_cache_stats(),
+                    "answer": answer_cache.stats(),
+                    "pattern_match": pattern_matcher.stats()
+                },
+                "handlers": handler_registry.stats(),
+                "sse": {
+                    "environment": environment_service.broker.stats()
+                },
+                "external_api": {
+                    "environment": environment_service.fetch_stats()
+                },
+                "vector_sync": vector_sync.stats(),
+                "collections": collection_registry.stats(),
+                "db_pool": get_pool_stats()
             }), 200
         except Exception as e:
             logger.error(f"헬스체크 실패: {str(e)}")
@@ -232,14 +259,24 @@ def create_app():
     # 데이터베이스 초기화
     init_db()
     
+    # 동적 응답 핸들러 등록 (잘못된 핸들러는 기동 시점에 오류 로그)
+    from core.handlers.registry import handler_registry
+    handler_registry.discover()
+    
     # ChromaDB 초기화
     try:
         # 1. ChromaDB 디렉토리 초기화
+        # - 영구 저장 모드: 기존 컬렉션을 유지하고 변경된 소스만 재임베딩
+        # - 비영구 모드: 기존처럼 디렉토리를 지우고 전체 재생성
         chroma_dir = app.config['RAG_CHROMA_DIR']
-        if os.path.exists(chroma_dir):
-            shutil.rmtree(chroma_dir)
-        os.makedirs(chroma_dir, exist_ok=True)
-        logger.info(f"[ChromaDB] 디렉토리 초기화 완료: {chroma_dir}")
+        if app.config['CHROMA_PERSISTENT']:
+            os.makedirs(chroma_dir, exist_ok=True)
+            logger.info(f"[ChromaDB] 영구 저장 모드: 기존 컬렉션 유지 ({chroma_dir})")
+        else:
+            if os.path.exists(chroma_dir):
+                shutil.rmtree(chroma_dir)
+            os.makedirs(chroma_dir, exist_ok=True)
+            logger.info(f"[ChromaDB] 디렉토리 초기화 완료: {chroma_dir}")
         
         # 2. 메타데이터 파일 경로 확인
         metadata_path = os.path.join(os.path.dirname(__file__), 'metadata', 'docx', 'ywlabs_policy_20250609.docx')
@@ -258,6 +295,14 @@ def create_app():
         # ChromaDB 초기화 실패 시에도 앱은 계속 실행
         logger.warning("[ChromaDB] 초기화 실패로 인해 벡터 검색 기능이 제한될 수 있습니다.")
     
+    # 패턴 사전 매처 구성 (벡터 검색 전 고정/템플릿 패턴 일치용)
+    from core.utils.pattern_matcher import pattern_matcher
+    pattern_matcher.refresh()
+    
+    # GPT 프롬프트 체인 미리 생성 (요청마다 클라이언트/프롬프트를 만들지 않도록)
+    from core.profiles.chain_registry import chain_registry
+    chain_registry.warmup(["policy_assistant"])
+    
     # 블루프린트 등록 (범용 라우트보다 먼저!)
     app.register_blueprint(chat_bp)
     app.register_blueprint(employee_bp)
@@ -296,6 +341,12 @@ def create_app():
     # 환경 정보 스케줄러 시작
     environment_scheduler = start_scheduler()
 
+    # 매출 집계/예측 스케줄러 시작
+    sales_scheduler = start_sales_scheduler()
+
+    # 패턴/위젯 벡터 동기화 스케줄러 시작 (변경된 행만 Chroma에 반영)
+    vector_scheduler = start_vector_scheduler()
+
     # 등록된 라우트 로깅
     logger.info("등록된 라우트:")
     for rule in app.url_map.iter_rules():
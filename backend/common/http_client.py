@@ -0,0 +1,116 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from common.logger import setup_logger
+
+logger = setup_logger('http_client')
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """회로 차단기가 열려 있어 외부 호출을 건너뜀"""
+
+class CircuitBreaker:
+    """
+    [외부 API 회로 차단기]
+    - 연속 실패가 failure_threshold회에 이르면 열림(open) 상태로 전환해 reset_timeout초 동안 호출 차단
+    - reset_timeout이 지나면 반열림(half-open) 상태로 한 번 시험 호출, 성공하면 닫힘(closed)
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 60):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+        self._stats = {'success': 0, 'failure': 0, 'rejected': 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return 'closed'
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """호출 허용 여부 (반열림 상태에서는 시험 호출 1건만 허용)"""
+        with self._lock:
+            state = self._state()
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._trial_running:
+                self._trial_running = True
+                return True
+            self._stats['rejected'] += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"[HTTP] {self.name} 회로 닫힘 (호출 복구)")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+            self._stats['success'] += 1
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._stats['failure'] += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_running:
+                    logger.warning(f"[HTTP] {self.name} 회로 열림 ({self.reset_timeout}초간 호출 차단, 연속 실패 {self._failures}회)")
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def stats(self) -> Dict[str, Any]:
+        """상태, 연속 실패 수, 성공/실패/차단 횟수"""
+        with self._lock:
+            return {'state': self._state(), 'consecutive_failures': self._failures, **self._stats}
+
+def create_session(pool_size: int = 4, retries: int = 2, backoff_factor: float = 0.5) -> requests.Session:
+    """
+    연결 풀 + 재시도 설정을 적용한 requests 세션 생성
+    - 연결 오류, 429/5xx 응답은 backoff_factor 기반 지수 백오프로 retries회까지 재시도 (GET만)
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def guarded_get(session: requests.Session, breaker: CircuitBreaker, url: str, timeout, **kwargs) -> requests.Response:
+    """
+    회로 차단기를 거친 GET 요청 (상태 코드 오류 포함 실패 시 차단기에 기록)
+    - 회로가 열려 있으면 요청 없이 CircuitOpenError
+    """
+    if not breaker.allow():
+        raise CircuitOpenError(f"{breaker.name} 회로가 열려 있어 호출을 건너뜁니다")
+    try:
+        response = session.get(url, timeout=timeout, **kwargs)
+        response.raise_for_status()
+    except requests.exceptions.RequestException:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+    return response
@@ -0,0 +1,104 @@
+import json
+import queue
+import threading
+from typing import Any, Dict, Iterator, Optional
+
+from common.logger import setup_logger
+
+logger = setup_logger('sse_broker')
+
+class Subscription:
+    """SSE 구독자 (구독자마다 크기가 제한된 큐 하나)"""
+
+    def __init__(self, queue_size: int):
+        self.queue: "queue.Queue[str]" = queue.Queue(maxsize=queue_size)
+        self.closed = False
+
+class SSEBroker:
+    """
+    [SSE 발행/구독 브로커]
+    - subscribe()로 구독자별 큐를 만들고 publish()로 모든 구독자 큐에 이벤트를 넣음
+    - stream()은 큐를 블로킹 대기하다가 heartbeat_interval초 동안 이벤트가 없으면 ping 전송
+      (유휴 연결은 대기만 하므로 CPU를 거의 쓰지 않음)
+    - 큐가 가득 찬(느린) 구독자는 연결을 끊어 다른 구독자와 발행자를 막지 않음
+    """
+
+    def __init__(self, name: str, queue_size: int = 16, heartbeat_interval: float = 30):
+        self.name = name
+        self.queue_size = queue_size
+        self.heartbeat_interval = heartbeat_interval
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._stats = {'published': 0, 'delivered': 0, 'dropped': 0}
+
+    @staticmethod
+    def format_event(data: Dict[str, Any]) -> str:
+        """SSE data 이벤트 문자열"""
+        return f"data: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+    def subscribe(self) -> Subscription:
+        """구독자 등록"""
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+            count = len(self._subscribers)
+        logger.info(f"[SSE] {self.name} 구독자 연결 (현재 {count}명)")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """구독자 해제"""
+        subscription.closed = True
+        with self._lock:
+            if subscription not in self._subscribers:
+                return
+            self._subscribers.discard(subscription)
+            count = len(self._subscribers)
+        logger.info(f"[SSE] {self.name} 구독자 연결 종료 (현재 {count}명)")
+
+    def publish(self, data: Dict[str, Any]) -> int:
+        """모든 구독자에게 이벤트 전송 (전달된 구독자 수 반환)"""
+        event = self.format_event(data)
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self._stats['published'] += 1
+        delivered = 0
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(event)
+                delivered += 1
+            except queue.Full:
+                logger.warning(f"[SSE] {self.name} 구독자 큐가 가득 차 연결을 끊습니다")
+                with self._lock:
+                    self._stats['dropped'] += 1
+                self.unsubscribe(subscription)
+        with self._lock:
+            self._stats['delivered'] += delivered
+        return delivered
+
+    def stream(self, initial: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        구독자 이벤트 스트림 (Response 본문으로 사용)
+        - 스트림이 시작될 때 구독하고 끝나면 해제 (응답 전송 전에 끊긴 연결은 구독되지 않음)
+        - initial: 연결 직후 먼저 보낼 이벤트
+        - 클라이언트가 끊거나 느린 구독자로 제외되면 종료
+        """
+        subscription = self.subscribe()
+        try:
+            if initial is not None:
+                yield self.format_event(initial)
+            while not subscription.closed:
+                try:
+                    yield subscription.queue.get(timeout=self.heartbeat_interval)
+                except queue.Empty:
+                    yield self.format_event({'type': 'ping'})
+        finally:
+            self.unsubscribe(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def stats(self) -> Dict[str, Any]:
+        """구독자 수 및 발행/전달/끊김 횟수"""
+        with self._lock:
+            return {'subscribers': len(self._subscribers), **self._stats}
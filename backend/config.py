@@ -19,6 +19,16 @@ class BaseConfig:
 
         # RAG용 ChromaDB 및 컬렉션별 설정
         self.RAG_CHROMA_DIR = os.path.join(os.path.dirname(__file__), 'chromadb', 'rag_db')
+        # 영구 저장 모드 (true: 기존 컬렉션 유지 후 변경분만 재임베딩, false: 기동 시마다 전체 재생성)
+        self.CHROMA_PERSISTENT = os.getenv('CHROMA_PERSISTENT', 'true').lower() == 'true'
+        # 다중 컬렉션 병렬 검색 스레드 수
+        self.CHROMA_SEARCH_WORKERS = int(os.getenv('CHROMA_SEARCH_WORKERS', 4))
+        # DB 컬렉션 동기화 시 delete/upsert 배치 크기
+        self.CHROMA_SYNC_BATCH_SIZE = int(os.getenv('CHROMA_SYNC_BATCH_SIZE', 256))
+        # 컬렉션 재생성 시 새 버전 공개 전 검증 검색 수
+        self.COLLECTION_SANITY_QUERIES = int(os.getenv('COLLECTION_SANITY_QUERIES', 3))
+        # 패턴/위젯 변경 감지 주기(초) - 0이면 새벽 검증 작업만 실행
+        self.VECTOR_SYNC_INTERVAL = int(os.getenv('VECTOR_SYNC_INTERVAL', 10))
         self.RAG_CHROMA_COLLECTIONS = [
             {
                 "path": os.path.join(os.path.dirname(__file__), 'metadata', 'docx', 'ywlabs_policy_20250609.docx'),
@@ -67,6 +77,55 @@ class BaseConfig:
             },
         ]
 
+        # RAG 문서 적재 파이프라인 설정
+        self.INGESTION_WORKERS = int(os.getenv('INGESTION_WORKERS', min(4, os.cpu_count() or 1)))  # 파일 파싱 프로세스 수 (1 이하면 프로세스 없이 파싱)
+        self.INGESTION_BATCH_SIZE = int(os.getenv('INGESTION_BATCH_SIZE', 64))  # 임베딩/저장 배치 크기(청크 수)
+        self.INGESTION_QUEUE_SIZE = int(os.getenv('INGESTION_QUEUE_SIZE', 8))  # 파싱-임베딩 사이 대기 배치 수
+
+        # 임베딩 관련 설정
+        self.EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', 64))  # 문서 임베딩 시 모델 배치 크기
+        self.QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv('QUERY_EMBEDDING_CACHE_SIZE', 2048))  # 쿼리 임베딩 캐시 최대 항목 수
+        self.QUERY_EMBEDDING_CACHE_TTL = int(os.getenv('QUERY_EMBEDDING_CACHE_TTL', 3600))  # 쿼리 임베딩 캐시 유지 시간(초)
+        self.EMBEDDING_DISK_CACHE_ENABLED = os.getenv('EMBEDDING_DISK_CACHE_ENABLED', 'true').lower() == 'true'  # 문서 임베딩 디스크 캐시 사용 여부
+        self.EMBEDDING_DISK_CACHE_DIR = os.getenv('EMBEDDING_DISK_CACHE_DIR', os.path.join(os.path.dirname(__file__), 'chromadb', 'embedding_cache'))  # 캐시 파일 위치 (워커 간 공유)
+
+        # OpenAI(LLM) 호출 설정
+        self.OPENAI_TIMEOUT = float(os.getenv('OPENAI_TIMEOUT', 60))  # 요청 타임아웃(초)
+        self.OPENAI_MAX_CONNECTIONS = int(os.getenv('OPENAI_MAX_CONNECTIONS', 20))  # 공유 HTTP 연결 풀 크기
+
+        # GPT 답변 의미 캐시 설정 (유사 질문 + 동일 검색 문서이면 이전 답변 재사용)
+        self.ANSWER_CACHE_ENABLED = os.getenv('ANSWER_CACHE_ENABLED', 'true').lower() == 'true'
+        self.ANSWER_CACHE_SIZE = int(os.getenv('ANSWER_CACHE_SIZE', 512))  # 최대 항목 수
+        self.ANSWER_CACHE_TTL = int(os.getenv('ANSWER_CACHE_TTL', 86400))  # 유지 시간(초)
+        self.ANSWER_CACHE_MAX_DISTANCE = float(os.getenv('ANSWER_CACHE_MAX_DISTANCE', 0.05))  # 허용 코사인 거리
+
+        # 챗봇 히스토리 비동기 저장 설정
+        self.CHAT_HISTORY_QUEUE_SIZE = int(os.getenv('CHAT_HISTORY_QUEUE_SIZE', 10000))  # 저장 대기열 최대 크기
+        self.CHAT_HISTORY_BATCH_SIZE = int(os.getenv('CHAT_HISTORY_BATCH_SIZE', 100))  # 1회 INSERT 최대 행 수
+        self.CHAT_HISTORY_FLUSH_MS = int(os.getenv('CHAT_HISTORY_FLUSH_MS', 500))  # 최대 저장 지연(ms)
+        self.CHAT_HISTORY_SPILL_FILE = os.getenv('CHAT_HISTORY_SPILL_FILE', os.path.join(os.path.dirname(__file__), 'data', 'chat_history_spill.jsonl'))  # DB 장애 시 보관 파일
+
+        # 매출 집계 캐시 설정
+        self.SALES_CACHE_CHECK_INTERVAL = int(os.getenv('SALES_CACHE_CHECK_INTERVAL', 60))  # sales_history 변경 확인 주기(초)
+
+        # 직원 디렉터리 캐시 설정
+        self.EMPLOYEE_CACHE_CHECK_INTERVAL = int(os.getenv('EMPLOYEE_CACHE_CHECK_INTERVAL', 60))  # employees 변경 확인 주기(초)
+
+        # SSE 설정
+        self.SSE_QUEUE_SIZE = int(os.getenv('SSE_QUEUE_SIZE', 16))  # 구독자별 대기 이벤트 수 (초과 시 연결 종료)
+        self.SSE_HEARTBEAT_INTERVAL = int(os.getenv('SSE_HEARTBEAT_INTERVAL', 30))  # ping 전송 주기(초)
+
+        # 환경 정보(날씨/대기질) 외부 API 설정 (로컬 스텁 서버로 바꿔 시험 가능)
+        self.ENV_WEATHER_URL = os.getenv('ENV_WEATHER_URL', 'https://api.openweathermap.org/data/2.5/weather')  # OpenWeather 현재 날씨
+        self.ENV_AIR_QUALITY_URL = os.getenv('ENV_AIR_QUALITY_URL', 'http://openapi.seoul.go.kr:8088/{api_key}/xml/ListAirQualityByDistrictService/1/5/111274/')  # 서울시 대기질 ({api_key} 치환)
+        self.ENV_FETCH_CONNECT_TIMEOUT = float(os.getenv('ENV_FETCH_CONNECT_TIMEOUT', 3))  # 연결 타임아웃(초)
+        self.ENV_FETCH_READ_TIMEOUT = float(os.getenv('ENV_FETCH_READ_TIMEOUT', 5))  # 응답 타임아웃(초)
+        self.ENV_FETCH_RETRIES = int(os.getenv('ENV_FETCH_RETRIES', 2))  # 연결 오류/5xx 재시도 횟수
+        self.ENV_FETCH_BACKOFF = float(os.getenv('ENV_FETCH_BACKOFF', 0.5))  # 재시도 지수 백오프 계수(초)
+        self.ENV_BREAKER_FAILURES = int(os.getenv('ENV_BREAKER_FAILURES', 3))  # 회로 차단까지 연속 실패 횟수
+        self.ENV_BREAKER_RESET = int(os.getenv('ENV_BREAKER_RESET', 300))  # 회로 차단 유지 시간(초)
+        self.ENV_STALE_SECONDS = int(os.getenv('ENV_STALE_SECONDS', 600))  # 스냅샷 백그라운드 갱신 기준(초)
+
         # JWT 인증 관련 설정
         self.JWT_SECRET = os.getenv('JWT_SECRET', 'ywlabs_secret')
         self.JWT_EXPIRE_MINUTES = int(os.getenv('JWT_EXPIRE_MINUTES', 60))
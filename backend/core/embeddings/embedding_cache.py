@@ -0,0 +1,163 @@
+import hashlib
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import logging
+
+try:
+    import fcntl  # 프로세스 간 파일 잠금 (POSIX)
+except ImportError:  # Windows 등에서는 프로세스 내 잠금만 사용
+    fcntl = None
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+def text_key(text: str) -> str:
+    """캐시 키 (본문 sha256 hex)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class EmbeddingDiskCache:
+    """
+    [모델별 디스크 임베딩 캐시]
+    - {모델}.f32: float32 임베딩 행을 이어 붙인 파일 (memmap으로 읽기)
+    - {모델}.keys: 행 순서대로 본문 sha256을 한 줄씩 기록한 키 인덱스
+    - 쓰기는 파일 잠금(.lock) 안에서 벡터 -> 키 순서로 추가하므로 여러 워커 프로세스가 같은 캐시를 공유
+      (키 파일에 기록된 행만 유효, 중단된 쓰기의 남은 벡터는 다음 쓰기 때 잘라냄)
+    - 다른 프로세스가 추가한 행은 조회 시 키 파일 크기 변화를 보고 이어서 읽음
+    """
+
+    def __init__(self, directory: str, model_name: str, dimension: int):
+        os.makedirs(directory, exist_ok=True)
+        safe_name = re.sub(r'[^\w.-]', '_', model_name)
+        self.model_name = model_name
+        self.dimension = dimension
+        self.row_bytes = dimension * 4
+        self.vectors_path = os.path.join(directory, f"{safe_name}.f32")
+        self.keys_path = os.path.join(directory, f"{safe_name}.keys")
+        self.lock_path = os.path.join(directory, f"{safe_name}.lock")
+        self._index: Dict[str, int] = {}
+        self._rows = 0
+        self._keys_offset = 0
+        self._matrix: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stored': 0}
+        with self._lock:
+            self._sync()
+        logger.info(f"[EMBED_CACHE] 디스크 임베딩 캐시 로드: {model_name} ({self._rows}개)")
+
+    def _sync(self) -> None:
+        """키 파일에 새로 추가된 행을 인덱스에 반영하고 memmap 갱신 (self._lock 안에서 호출)"""
+        if not os.path.exists(self.keys_path):
+            return
+        if os.path.getsize(self.keys_path) == self._keys_offset:
+            return
+        with open(self.keys_path, 'rb') as f:
+            f.seek(self._keys_offset)
+            data = f.read()
+        # 줄바꿈까지 기록된 키만 유효
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            self._index.setdefault(line.decode('ascii'), self._rows)
+            self._rows += 1
+        self._keys_offset += end
+        self._matrix = None
+        if self._rows:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode='r', shape=(self._rows, self.dimension))
+
+    def lookup(self, keys: List[str]) -> Tuple[np.ndarray, List[int]]:
+        """
+        캐시 조회
+        - 출력: ((len(keys), dimension) 배열 - 없는 행은 0, 캐시에 없는 키의 위치 목록)
+        """
+        result = np.zeros((len(keys), self.dimension), dtype=np.float32)
+        missing = []
+        with self._lock:
+            self._sync()
+            rows = []
+            positions = []
+            for position, key in enumerate(keys):
+                row = self._index.get(key)
+                if row is None:
+                    missing.append(position)
+                else:
+                    rows.append(row)
+                    positions.append(position)
+            if rows:
+                result[positions] = self._matrix[rows]
+            self._stats['hits'] += len(rows)
+            self._stats['misses'] += len(missing)
+        return result, missing
+
+    def store(self, keys: List[str], vectors: np.ndarray) -> int:
+        """새 임베딩 추가 (이미 있는 키는 건너뜀) - 추가된 행 수 반환"""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dimension:
+            raise ValueError(f"임베딩 차원 불일치: {vectors.shape} != (N, {self.dimension})")
+        with self._lock, open(self.lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._sync()
+                new_keys = []
+                new_rows = []
+                seen = set()
+                for key, vector in zip(keys, vectors):
+                    if key in self._index or key in seen:
+                        continue
+                    seen.add(key)
+                    new_keys.append(key)
+                    new_rows.append(vector)
+                if not new_keys:
+                    return 0
+
+                # 1. 벡터 추가 (키가 기록되지 않은 이전 쓰기의 남은 행은 잘라냄)
+                with open(self.vectors_path, 'ab') as f:
+                    f.truncate(self._rows * self.row_bytes)
+                    f.write(np.asarray(new_rows, dtype=np.float32).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                # 2. 키 추가 (줄바꿈 없이 끝난 키는 잘라냄)
+                with open(self.keys_path, 'ab') as f:
+                    f.truncate(self._keys_offset)
+                    f.write(''.join(f"{key}\n" for key in new_keys).encode('ascii'))
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._sync()
+                self._stats['stored'] += len(new_keys)
+                return len(new_keys)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def stats(self) -> Dict[str, Any]:
+        """저장된 행 수 및 조회 hit/miss, 추가 행 수"""
+        with self._lock:
+            total = self._stats['hits'] + self._stats['misses']
+            return {
+                'model': self.model_name,
+                'rows': self._rows,
+                **self._stats,
+                'hit_rate': round(self._stats['hits'] / total, 4) if total else None
+            }
+
+# 모델별 디스크 캐시 (프로세스 내 공유)
+_caches: Dict[str, EmbeddingDiskCache] = {}
+_caches_lock = threading.Lock()
+
+def get_embedding_cache(directory: str, model_name: str, dimension: int) -> EmbeddingDiskCache:
+    """모델별 디스크 임베딩 캐시 반환 (최초 호출 시 로드)"""
+    with _caches_lock:
+        cache = _caches.get(model_name)
+        if cache is None:
+            cache = EmbeddingDiskCache(directory, model_name, dimension)
+            _caches[model_name] = cache
+        return cache
+
+def get_embedding_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """로드된 모델별 디스크 캐시 통계"""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.model_name: cache.stats() for cache in caches}
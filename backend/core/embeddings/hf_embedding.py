@@ -5,10 +5,13 @@ import time
 import threading
 import os
 import shutil
-from typing import List, Union, Dict
+from typing import List, Union, Dict, Optional, Any
 from sentence_transformers import SentenceTransformer
 from config import get_config
+from core.utils.cache_utils import TTLCache
+from core.embeddings.embedding_cache import get_embedding_cache, get_embedding_cache_stats, text_key
 import numpy as np
+import unicodedata
 
 # 로거 설정
 logger = logging.getLogger(__name__)
@@ -29,6 +32,28 @@ MODEL_DIMENSIONS = {
 MODEL_LOAD_TIMEOUT = 300  # 5분 타임아웃
 MODEL_LOAD_RETRIES = 3    # 3회 재시도
 
+# 쿼리 임베딩 캐시 ((모델명, 정규화된 쿼리) -> 임베딩 벡터)
+_query_cache = TTLCache(
+    maxsize=config.QUERY_EMBEDDING_CACHE_SIZE,
+    ttl=config.QUERY_EMBEDDING_CACHE_TTL
+)
+
+def normalize_query_text(text: str) -> str:
+    """캐시 키용 쿼리 정규화 (유니코드 NFC + 앞뒤/중복 공백 제거)"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+def get_query_cache_stats() -> Dict[str, Any]:
+    """쿼리 임베딩 캐시 통계(hit/miss 등) 반환"""
+    return _query_cache.stats()
+
+def clear_query_cache() -> None:
+    """쿼리 임베딩 캐시 비우기"""
+    _query_cache.clear()
+
+def get_disk_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """모델별 디스크 임베딩 캐시 통계 반환"""
+    return get_embedding_cache_stats()
+
 def reduce_dimension(embedding: List[float], target_dim: int = 384) -> List[float]:
     """
     [임베딩 차원 축소]
@@ -99,85 +124,132 @@ class EmbeddingWrapper:
         self.dimension = MODEL_DIMENSIONS.get(model_name)
         if self.dimension is None:
             raise ValueError(f"지원하지 않는 모델입니다: {model_name}")
+        # 디스크 임베딩 캐시 (재빌드/다른 워커에서 이미 임베딩한 본문은 모델을 거치지 않음)
+        self.disk_cache = None
+        if config.EMBEDDING_DISK_CACHE_ENABLED:
+            try:
+                self.disk_cache = get_embedding_cache(config.EMBEDDING_DISK_CACHE_DIR, model_name, self.dimension)
+            except Exception as e:
+                logger.warning(f"[HF] 디스크 임베딩 캐시를 사용할 수 없습니다: {str(e)}")
+        
+    def _postprocess(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        [임베딩 행렬 후처리]
+        - NaN/Inf 대체, 차원 변환(768 -> 384), L2 정규화를 행렬 단위로 한 번에 처리
+        - 출력: (N, dimension) 크기의 연속(contiguous) float32 배열
+        """
+        target_dim = self.dimension or 384
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        
+        # 1. NaN/Inf 체크 및 대체
+        if not np.isfinite(matrix).all():
+            logger.warning("[HF] 임베딩에 NaN/Inf 값 포함, 0으로 대체")
+            matrix = np.nan_to_num(matrix, nan=0.0, posinf=1.0, neginf=-1.0)
+        
+        # 2. 차원 변환 (768 -> 384, 평균 풀링)
+        if matrix.shape[1] == 768:
+            matrix = matrix.reshape(matrix.shape[0], 2, 384).mean(axis=1)
+        
+        # 3. 차원 검증 (불일치 시 0으로 채우거나 잘라냄)
+        if matrix.shape[1] != target_dim:
+            logger.warning(f"[HF] 임베딩 차원 불일치: {matrix.shape[1]} != {target_dim}, 0으로 채움")
+            resized = np.zeros((matrix.shape[0], target_dim), dtype=np.float32)
+            width = min(matrix.shape[1], target_dim)
+            resized[:, :width] = matrix[:, :width]
+            matrix = resized
+        
+        # 4. L2 정규화 (0 벡터는 그대로 유지)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        
+        return np.ascontiguousarray(matrix, dtype=np.float32)
+    
+    def embed_documents_array(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        [문서 리스트의 임베딩 행렬 반환]
+        - 입력:
+            - texts: 임베딩할 문서 리스트
+            - batch_size: 모델 배치 크기 (기본값: config.EMBEDDING_BATCH_SIZE)
+        - 출력: (len(texts), dimension) 크기의 L2 정규화된 float32 배열
+            - 입력 순서를 그대로 유지하며, 빈 문자열은 0 벡터로 채움
+            - 디스크 캐시에 있는 본문은 캐시 값을 사용하고 나머지만 모델로 임베딩 후 캐시에 추가
+        """
+        target_dim = self.dimension or 384
+        result = np.zeros((len(texts), target_dim), dtype=np.float32)
+        
+        # 1. 빈 문자열 제외
+        valid_indices = [i for i, text in enumerate(texts) if text and text.strip()]
+        if len(valid_indices) < len(texts):
+            logger.warning(f"[HF] 빈 문서 {len(texts) - len(valid_indices)}개는 0 벡터로 대체")
+        if not valid_indices:
+            return result
+        
+        # 2. 디스크 캐시 조회 (캐시에 없는 본문만 임베딩 대상)
+        pending = valid_indices
+        pending_keys = []
+        if self.disk_cache is not None:
+            keys = [text_key(texts[i]) for i in valid_indices]
+            cached, missing = self.disk_cache.lookup(keys)
+            result[valid_indices] = cached
+            pending = [valid_indices[i] for i in missing]
+            pending_keys = [keys[i] for i in missing]
+            if not pending:
+                return result
+        
+        # 3. 배치 단위 임베딩 생성
+        batch_size = batch_size or config.EMBEDDING_BATCH_SIZE
+        embeddings = self.model.encode(
+            [texts[i] for i in pending],
+            batch_size=batch_size,
+            output_value='sentence_embedding',
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        
+        # 4. 행렬 단위 후처리
+        result[pending] = self._postprocess(embeddings)
+        
+        # 5. 새 임베딩을 디스크 캐시에 추가 (실패해도 임베딩 결과는 반환)
+        if self.disk_cache is not None:
+            try:
+                self.disk_cache.store(pending_keys, result[pending])
+            except Exception as e:
+                logger.warning(f"[HF] 디스크 임베딩 캐시 저장 실패: {str(e)}")
+        return result
         
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """문서 리스트의 임베딩 벡터 반환"""
+        """문서 리스트의 임베딩 벡터 반환 (Chroma/LangChain 호환용 리스트 어댑터)"""
         try:
-            # 1. 입력 검증
             if not texts:
                 return []
-                
-            # 2. 빈 문자열 필터링
-            valid_texts = [text for text in texts if text and text.strip()]
-            if not valid_texts:
-                return []
-                
-            # 3. 임베딩 생성
-            embeddings = self.model.encode(valid_texts, output_value='sentence_embedding')
-            
-            # 4. 차원 축소 및 검증
-            reduced = []
-            for emb in embeddings:
-                try:
-                    # 4-1. NaN/Inf 체크 및 대체
-                    if np.any(np.isnan(emb)) or np.any(np.isinf(emb)):
-                        logger.warning("[HF] 임베딩에 NaN/Inf 값 포함, 0으로 대체")
-                        emb = np.nan_to_num(emb, nan=0.0, posinf=1.0, neginf=-1.0)
-                    
-                    # 4-2. 차원 변환 (768 -> 384)
-                    if len(emb) == 768:
-                        # 768차원을 384차원으로 변환 (평균 풀링)
-                        emb = emb.reshape(2, 384).mean(axis=0)
-                    
-                    # 4-3. 차원 검증
-                    if len(emb) != self.dimension:
-                        logger.warning(f"[HF] 임베딩 차원 불일치: {len(emb)} != {self.dimension}, 0으로 채움")
-                        result = np.zeros(self.dimension or 384)
-                        result[:len(emb)] = emb
-                        emb = result
-                    
-                    reduced.append(emb.tolist())
-                    
-                except Exception as e:
-                    logger.error(f"[HF] 임베딩 처리 중 오류 발생: {str(e)}")
-                    # 오류 발생 시 0 벡터로 대체
-                    reduced.append(np.zeros(self.dimension or 384).tolist())
-            
-            return reduced
+            return self.embed_documents_array(texts).tolist()
             
         except Exception as e:
             logger.error(f"[HF] 문서 임베딩 생성 중 오류 발생: {str(e)}")
             return []
             
     def embed_query(self, text: str) -> List[float]:
-        """단일 쿼리의 임베딩 벡터 반환"""
+        """단일 쿼리의 임베딩 벡터 반환 (동일 쿼리는 LRU+TTL 캐시에서 반환)"""
         try:
             # 1. 입력 검증
             if not text or not text.strip():
                 return np.zeros(self.dimension or 384).tolist()
-                
-            # 2. 임베딩 생성
-            embedding = self.model.encode(text, output_value='sentence_embedding')
             
-            # 3. NaN/Inf 체크 및 대체
-            if np.any(np.isnan(embedding)) or np.any(np.isinf(embedding)):
-                logger.warning("[HF] 쿼리 임베딩에 NaN/Inf 값 포함, 0으로 대체")
-                embedding = np.nan_to_num(embedding, nan=0.0, posinf=1.0, neginf=-1.0)
-            
-            # 4. 차원 변환 (768 -> 384)
-            if len(embedding) == 768:
-                # 768차원을 384차원으로 변환 (평균 풀링)
-                reshaped = embedding.reshape(2, 384)
-                embedding = np.mean(reshaped, axis=0)
-            
-            # 5. 차원 검증
-            if len(embedding) != self.dimension:
-                logger.warning(f"[HF] 임베딩 차원 불일치: {len(embedding)} != {self.dimension}, 0으로 채움")
-                result = np.zeros(self.dimension or 384)
-                result[:len(embedding)] = embedding
-                embedding = result
+            # 2. 캐시 조회
+            cache_key = (self.model_name, normalize_query_text(text))
+            cached = _query_cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
+                
+            # 3. 임베딩 생성
+            embedding = self.model.encode(cache_key[1], output_value='sentence_embedding')
             
-            return embedding.tolist()
+            # 4. NaN/Inf 대체, 차원 변환, 정규화 후 캐시에 저장
+            vector = self._postprocess(embedding)[0].tolist()
+            _query_cache.set(cache_key, tuple(vector))
+            return vector
             
         except Exception as e:
             logger.error(f"[HF] 쿼리 임베딩 생성 중 오류 발생: {str(e)}")
@@ -1,5 +1,4 @@
-from services.employee_service import extract_employee_name, get_employee_info_and_fill_template
-from database import get_db_connection
+from services.employee_service import extract_employee_name, get_employee_info_and_fill_template, employee_directory
 from common.logger import setup_logger
 from datetime import datetime
 
@@ -23,20 +22,10 @@ def handle(user_message: str, meta: dict, response: str) -> dict:
             'timestamp': datetime.now().isoformat()
         }
     
-    # 직원 정보 DB 조회
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cursor:
-            logger.debug(f"[핸들러] 직원 DB에서 name={name}으로 정보 조회")
-            cursor.execute('''
-                SELECT name, position, dept_nm, email, phone 
-                FROM employees 
-                WHERE name = %s
-            ''', (name,))
-            employee = cursor.fetchone()
-            logger.debug(f"[핸들러] 직원 정보: {employee}")
-    finally:
-        conn.close()
+    # 직원 디렉터리 캐시 조회 (DB 재조회 없음)
+    logger.debug(f"[핸들러] 직원 디렉터리에서 name={name}으로 정보 조회")
+    employee = employee_directory.get(name)
+    logger.debug(f"[핸들러] 직원 정보: {employee}")
     
     if not employee:
         logger.warning(f"[핸들러] 직원 정보 없음: {name}")
@@ -0,0 +1,133 @@
+import bisect
+import importlib
+import inspect
+import pkgutil
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import logging
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 핸들러 실행 시간 히스토그램 구간 상한(ms) - 마지막 구간은 그 이상
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+class HandlerRegistry:
+    """
+    [동적 응답 핸들러 레지스트리]
+    - 기동 시 core/handlers/ 아래 모듈을 모두 불러와 handle(user_message, meta, response) 함수를 검증/캐시
+    - 요청 시에는 dict 조회만으로 핸들러 실행 (importlib 호출 없음)
+    - 핸들러별 호출 수, 오류 수, 실행 시간 히스토그램 기록
+    """
+
+    def __init__(self, package: str = 'core.handlers'):
+        self.package = package
+        self._handlers: Dict[str, Callable] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._discovered = False
+        self._lock = threading.Lock()
+
+    def discover(self) -> Dict[str, Callable]:
+        """핸들러 모듈 탐색 및 검증 (잘못된 모듈은 기동 로그에 오류로 남김)"""
+        package = importlib.import_module(self.package)
+        handlers: Dict[str, Callable] = {}
+        for module_info in pkgutil.iter_modules(package.__path__):
+            name = module_info.name
+            if name.startswith('_') or name == 'registry':
+                continue
+            try:
+                module = importlib.import_module(f"{self.package}.{name}")
+            except Exception as e:
+                logger.error(f"[핸들러] 모듈 로드 실패: {name} - {str(e)}")
+                continue
+            handler_func = getattr(module, 'handle', None)
+            if not callable(handler_func):
+                logger.error(f"[핸들러] handle 함수가 없습니다: {name}")
+                continue
+            try:
+                inspect.signature(handler_func).bind(None, None, None)
+            except TypeError:
+                logger.error(f"[핸들러] handle(user_message, meta, response) 형식이 아닙니다: {name}")
+                continue
+            handlers[name] = handler_func
+
+        with self._lock:
+            self._handlers = handlers
+            for name in handlers:
+                self._stats.setdefault(name, self._empty_stats())
+            self._discovered = True
+        logger.info(f"[핸들러] 핸들러 등록 완료: {sorted(handlers)}")
+        return handlers
+
+    def validate(self, handler_names: Iterable[Optional[str]]) -> bool:
+        """패턴에 설정된 핸들러 이름 검증 (등록되지 않은 이름은 오류 로그)"""
+        if not self._discovered:
+            self.discover()
+        missing = sorted({name for name in handler_names if name and name not in self._handlers})
+        if missing:
+            logger.error(f"[핸들러] 등록되지 않은 response_handler가 패턴에 설정되어 있습니다: {missing}")
+        return not missing
+
+    def get(self, name: str) -> Optional[Callable]:
+        """핸들러 함수 반환 (없으면 None)"""
+        if not self._discovered:
+            self.discover()
+        return self._handlers.get(name)
+
+    def dispatch(self, name: str, user_message: str, meta: dict, response: str) -> dict:
+        """
+        핸들러 실행
+        - 등록되지 않은 이름이면 KeyError
+        - 핸들러 예외는 오류 수만 기록하고 그대로 전달
+        """
+        handler_func = self.get(name)
+        if handler_func is None:
+            raise KeyError(f"등록되지 않은 핸들러: {name}")
+        start = time.perf_counter()
+        error = False
+        try:
+            return handler_func(user_message, meta, response)
+        except Exception:
+            error = True
+            raise
+        finally:
+            self._record(name, (time.perf_counter() - start) * 1000, error)
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        return {
+            'calls': 0,
+            'errors': 0,
+            'total_ms': 0.0,
+            'max_ms': 0.0,
+            'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        }
+
+    def _record(self, name: str, elapsed_ms: float, error: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(name, self._empty_stats())
+            stats['calls'] += 1
+            stats['errors'] += int(error)
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+            stats['buckets'][bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """핸들러별 호출/오류 수, 평균/최대 실행 시간, 구간별 히스토그램"""
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        with self._lock:
+            return {
+                name: {
+                    'calls': stats['calls'],
+                    'errors': stats['errors'],
+                    'avg_ms': round(stats['total_ms'] / stats['calls'], 2) if stats['calls'] else 0.0,
+                    'max_ms': round(stats['max_ms'], 2),
+                    'histogram': dict(zip(labels, stats['buckets']))
+                }
+                for name, stats in self._stats.items()
+            }
+
+# 전역 핸들러 레지스트리
+handler_registry = HandlerRegistry()
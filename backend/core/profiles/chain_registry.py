@@ -0,0 +1,89 @@
+import threading
+from typing import Dict, Iterable, Optional
+
+import httpx
+from langchain_openai import ChatOpenAI
+from langchain_core.output_parsers import StrOutputParser
+
+from config import config
+from core.profiles.prompt_utils import get_prompt_template, get_profile_mtime, load_prompt_profile
+import logging
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 프로필별 LLM 기본 설정 (프로필 JSON의 "llm" 키로 덮어쓸 수 있음)
+DEFAULT_LLM_SETTINGS = {
+    "model": "gpt-4-turbo",
+    "temperature": 0.3,
+    "max_tokens": 1500
+}
+
+class ChainRegistry:
+    """
+    프롬프트 프로필별 LangChain 체인 레지스트리
+    - 프로필마다 prompt | llm | StrOutputParser 체인을 한 번만 생성해 재사용
+    - ChatOpenAI 클라이언트는 같은 설정끼리 공유하고, HTTP 연결 풀(httpx)은 전체가 공유
+    - gpt_prompt_profile.json의 mtime이 바뀌면 체인을 다시 생성 (hot reload)
+    """
+
+    def __init__(self):
+        self._chains: Dict[str, object] = {}
+        self._llms: Dict[tuple, ChatOpenAI] = {}
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+        self._http_client: Optional[httpx.Client] = None
+
+    def _get_http_client(self) -> httpx.Client:
+        if self._http_client is None:
+            self._http_client = httpx.Client(
+                timeout=config.OPENAI_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=config.OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=config.OPENAI_MAX_CONNECTIONS
+                )
+            )
+        return self._http_client
+
+    def _get_llm(self, settings: Dict) -> ChatOpenAI:
+        key = tuple(sorted(settings.items()))
+        if key not in self._llms:
+            self._llms[key] = ChatOpenAI(**settings, http_client=self._get_http_client())
+        return self._llms[key]
+
+    def _build(self, profile_name: str):
+        prompt = get_prompt_template(profile_name)
+        if prompt is None:
+            return None
+        settings = {**DEFAULT_LLM_SETTINGS, **load_prompt_profile(profile_name).get("llm", {})}
+        logger.info(f"[CHAIN] 체인 생성: {profile_name} ({settings['model']})")
+        return prompt | self._get_llm(settings) | StrOutputParser()
+
+    def get(self, profile_name: str):
+        """
+        프로필 체인 반환
+        - 프로필 파일이 바뀌었으면 캐시된 체인을 모두 버리고 다시 생성
+        - 템플릿 프로필이 아니거나 없으면 None
+        """
+        mtime = get_profile_mtime()
+        with self._lock:
+            if mtime != self._mtime:
+                if self._mtime is not None:
+                    logger.info("[CHAIN] 프롬프트 프로필 파일 변경 감지, 체인 재생성")
+                self._chains.clear()
+                self._mtime = mtime
+            if profile_name not in self._chains:
+                self._chains[profile_name] = self._build(profile_name)
+            return self._chains[profile_name]
+
+    def warmup(self, profile_names: Iterable[str]) -> None:
+        """기동 시 체인 미리 생성"""
+        for profile_name in profile_names:
+            try:
+                if self.get(profile_name) is None:
+                    logger.warning(f"[CHAIN] 템플릿 프로필이 아닙니다: {profile_name}")
+            except Exception as e:
+                logger.error(f"[CHAIN] 체인 생성 실패: {profile_name} - {str(e)}")
+
+# 전역 체인 레지스트리
+chain_registry = ChainRegistry()
@@ -1,8 +1,30 @@
 import json
 import os
+import threading
 from typing import Dict, List, Optional
 from langchain_core.prompts import ChatPromptTemplate
 
+# 프로필 파일 경로
+PROFILE_PATH = os.path.join(os.path.dirname(__file__), 'gpt_prompt_profile.json')
+
+# 파싱된 프로필 캐시 (파일 mtime이 바뀔 때만 다시 읽음)
+_profiles_cache = {'mtime': None, 'profiles': None}
+_profiles_lock = threading.Lock()
+
+def get_profile_mtime() -> float:
+    """프로필 파일 수정 시각 반환"""
+    return os.path.getmtime(PROFILE_PATH)
+
+def _load_profiles() -> Dict:
+    """프로필 파일 전체 로드 (mtime 기반 캐시)"""
+    mtime = get_profile_mtime()
+    with _profiles_lock:
+        if _profiles_cache['mtime'] != mtime:
+            with open(PROFILE_PATH, 'r', encoding='utf-8') as f:
+                _profiles_cache['profiles'] = json.load(f)
+            _profiles_cache['mtime'] = mtime
+        return _profiles_cache['profiles']
+
 def load_prompt_profile(profile_name: str) -> Dict:
     """
     프롬프트 프로필을 로드하는 함수
@@ -17,12 +39,8 @@ def load_prompt_profile(profile_name: str) -> Dict:
         FileNotFoundError: 프로필 파일을 찾을 수 없는 경우
         KeyError: 요청한 프로필이 존재하지 않는 경우
     """
-    # 프로필 파일 경로
-    profile_path = os.path.join(os.path.dirname(__file__), 'gpt_prompt_profile.json')
-    
-    # 프로필 파일 로드
-    with open(profile_path, 'r', encoding='utf-8') as f:
-        profiles = json.load(f)
+    # 프로필 파일 로드 (변경 시에만 다시 파싱)
+    profiles = _load_profiles()
     
     # 요청한 프로필이 존재하는지 확인
     if profile_name not in profiles:
@@ -106,9 +124,4 @@ def get_available_profiles() -> List[str]:
     Returns:
         List[str]: 프로필 이름 목록
     """
-    profile_path = os.path.join(os.path.dirname(__file__), 'gpt_prompt_profile.json')
-    
-    with open(profile_path, 'r', encoding='utf-8') as f:
-        profiles = json.load(f)
-    
-    return list(profiles.keys()) 
\ No newline at end of file
+    return list(_load_profiles().keys()) 
\ No newline at end of file
@@ -2,6 +2,8 @@
 유틸리티 함수 모음
 - date_utils: 날짜 관련 유틸리티
 - employee_utils: 직원 정보 관련 유틸리티
+- cache_utils: 캐시 관련 유틸리티
+- template_utils: 응답 템플릿 렌더링 유틸리티
 """
 
 import importlib
@@ -9,12 +11,18 @@ from typing import Callable, Any
 
 from .date_utils import extract_year, get_current_year, format_date
 from .employee_utils import extract_employee_name
+from .cache_utils import TTLCache, SemanticCache
+from .template_utils import render_template, compile_template
 
 __all__ = [
     'extract_year',
     'get_current_year',
     'format_date',
     'extract_employee_name',
+    'TTLCache',
+    'SemanticCache',
+    'render_template',
+    'compile_template',
     'get_func_from_str'
 ]
 
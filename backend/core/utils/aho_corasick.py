@@ -0,0 +1,67 @@
+from collections import deque
+from typing import Any, Dict, Iterator, List, Tuple
+
+class AhoCorasick:
+    """
+    Aho-Corasick 다중 문자열 검색 오토마톤
+    - add()로 키워드를 등록하고 build() 후 search()로 텍스트 한 번 순회에 모든 키워드 위치를 찾음
+    - 키워드마다 임의의 값(value)을 함께 저장
+    """
+
+    def __init__(self):
+        # 노드별 전이 테이블 / 실패 링크 / 노드에서 끝나는 키워드 / 출력(실패 링크 포함) 목록
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._keywords: List[List[Tuple[str, Any]]] = [[]]
+        self._output: List[List[Tuple[str, Any]]] = [[]]
+        self._built = False
+
+    def __len__(self) -> int:
+        return sum(len(keywords) for keywords in self._keywords)
+
+    def add(self, keyword: str, value: Any = None) -> None:
+        """키워드 등록 (빈 문자열 무시)"""
+        if not keyword:
+            return
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._keywords.append([])
+            node = next_node
+        self._keywords[node].append((keyword, value))
+        self._built = False
+
+    def build(self) -> "AhoCorasick":
+        """실패 링크 계산 (BFS)"""
+        self._output = [list(keywords) for keywords in self._keywords]
+        queue = deque(self._goto[0].values())
+        for node in queue:
+            self._fail[node] = 0
+        while queue:
+            node = queue.popleft()
+            for char, next_node in self._goto[node].items():
+                queue.append(next_node)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_node] = self._goto[fail].get(char, 0)
+                self._output[next_node] = self._output[next_node] + self._output[self._fail[next_node]]
+        self._built = True
+        return self
+
+    def search(self, text: str) -> Iterator[Tuple[int, str, Any]]:
+        """텍스트에서 등록된 키워드 검색 - (시작 위치, 키워드, 값)"""
+        if not self._built:
+            self.build()
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for keyword, value in self._output[node]:
+                yield index - len(keyword) + 1, keyword, value
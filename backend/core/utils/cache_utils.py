@@ -0,0 +1,170 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+class TTLCache:
+    """
+    스레드 안전한 LRU + TTL 캐시
+    - maxsize를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+    - ttl(초)이 지난 항목은 조회 시 만료 처리 (ttl이 0 이하이면 만료 없음)
+    - hit/miss/eviction 카운터 제공
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """키에 해당하는 값 반환 (없거나 만료되었으면 default)"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """값 저장 (용량 초과 시 LRU 항목 제거)"""
+        expires_at = time.monotonic() + self.ttl if self.ttl and self.ttl > 0 else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """항목 제거"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """전체 항목 제거 (카운터는 유지)"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """캐시 통계 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / total, 4) if total else None
+            }
+
+class SemanticCache:
+    """
+    스레드 안전한 의미 기반(임베딩 유사도) LRU + TTL 캐시
+    - 같은 context_key(예: 검색된 문서 ID 목록) 안에서 쿼리 임베딩의
+      코사인 거리가 max_distance 이하인 항목을 찾아 반환
+    - maxsize/ttl 동작과 hit/miss/eviction 카운터는 TTLCache와 동일
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 86400, max_distance: float = 0.05):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_distance = max_distance
+        # entry_id -> (embedding, context_key, value, expires_at)
+        self._data: "OrderedDict[int, tuple]" = OrderedDict()
+        # context_key -> entry_id 집합 (같은 문맥의 항목만 비교)
+        self._by_context: Dict[Hashable, set] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _remove(self, entry_id: int) -> None:
+        _, context_key, _, _ = self._data.pop(entry_id)
+        ids = self._by_context.get(context_key)
+        if ids is not None:
+            ids.discard(entry_id)
+            if not ids:
+                del self._by_context[context_key]
+
+    def get(self, embedding, context_key: Hashable) -> Optional[Tuple[Any, float]]:
+        """유사 항목 조회 - (값, 코사인 유사도) 또는 None"""
+        query = self._normalize(embedding)
+        now = time.monotonic()
+        with self._lock:
+            best_id, best_similarity = None, -1.0
+            for entry_id in list(self._by_context.get(context_key, ())):
+                vector, _, _, expires_at = self._data[entry_id]
+                if expires_at is not None and expires_at < now:
+                    self._remove(entry_id)
+                    continue
+                similarity = float(np.dot(query, vector))
+                if similarity > best_similarity:
+                    best_id, best_similarity = entry_id, similarity
+            if best_id is None or 1.0 - best_similarity > self.max_distance:
+                self.misses += 1
+                return None
+            self._data.move_to_end(best_id)
+            self.hits += 1
+            return self._data[best_id][2], best_similarity
+
+    def set(self, embedding, context_key: Hashable, value: Any) -> None:
+        """항목 저장 (용량 초과 시 LRU 항목 제거)"""
+        vector = self._normalize(embedding)
+        expires_at = time.monotonic() + self.ttl if self.ttl and self.ttl > 0 else None
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._data[entry_id] = (vector, context_key, value, expires_at)
+            self._by_context.setdefault(context_key, set()).add(entry_id)
+            while len(self._data) > self.maxsize:
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """전체 항목 제거 (카운터는 유지)"""
+        with self._lock:
+            self._data.clear()
+            self._by_context.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """캐시 통계 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'max_distance': self.max_distance,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / total, 4) if total else None
+            }
@@ -16,4 +16,8 @@ def is_numeric(text):
 # 문자열을 카멜케이스로 변환 (예: hello_world → helloWorld)
 def to_camel_case(text):
     parts = text.split('_')
-    return parts[0] + ''.join(word.capitalize() for word in parts[1:]) 
\ No newline at end of file
+    return parts[0] + ''.join(word.capitalize() for word in parts[1:])
+
+# 매칭용 문자열 정규화 (공백/특수문자 제거, 영문 소문자화 - 한글, 영문, 숫자만 남김)
+def normalize_text(text):
+    return re.sub(r'[\W_]+', '', text or '').lower()
@@ -0,0 +1,155 @@
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from langchain.schema import Document
+
+from core.converters.pattern_converter import pattern_to_document
+from core.utils.aho_corasick import AhoCorasick
+from core.utils.common_utils import normalize_text
+import logging
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 템플릿 플레이스홀더별 값 패턴 (여기 없는 플레이스홀더는 오탐 방지를 위해 벡터 검색에 맡김)
+PLACEHOLDER_PATTERNS = {
+    'year': r'\d{4}|\d{2}'
+}
+
+PLACEHOLDER_RE = re.compile(r'\{(\w+)\}')
+
+# 키워드 일치 시 질문 중 패턴이 차지해야 하는 최소 비율 (짧은 키워드가 긴 질문을 가로채지 않도록)
+KEYWORD_MIN_COVERAGE = 0.6
+
+class PatternMatcher:
+    """
+    [챗봇 패턴 사전 매처]
+    - refresh()로 기동 시/패턴 변경 시 인덱스를 만들고, 벡터 검색 전에 먼저 조회
+    - exact: 정규화(공백/특수문자 제거)한 질문이 고정 패턴과 같음
+    - keyword: 고정 패턴이 질문에 포함되고(Aho-Corasick) 질문의 대부분을 차지함
+    - template: {year} 등 플레이스홀더 패턴의 고정 부분이 포함되고 정규식이 전체 일치함
+    - 일치 시 벡터 검색 결과와 같은 형태의 Document(similarity_score=1.0) 반환
+    """
+
+    def __init__(self):
+        self._exact: Dict[str, Document] = {}
+        self._keywords = AhoCorasick().build()
+        self._templates = AhoCorasick().build()
+        self._lock = threading.Lock()
+        self.stats_counter = {'exact': 0, 'keyword': 0, 'template': 0, 'miss': 0}
+
+    def build(self, pattern_rows: List[Dict[str, Any]]) -> None:
+        """패턴 행 목록으로 인덱스 재구성 (우선순위 순 정렬 가정, 같은 패턴은 첫 행 사용)"""
+        exact: Dict[str, Document] = {}
+        keywords = AhoCorasick()
+        templates = AhoCorasick()
+        template_count = 0
+        for row in pattern_rows:
+            pattern = row.get('pattern')
+            if not pattern:
+                continue
+            try:
+                document = pattern_to_document(row)
+            except ValueError:
+                continue
+
+            placeholders = PLACEHOLDER_RE.findall(pattern)
+            if not placeholders:
+                key = normalize_text(pattern)
+                if key and key not in exact:
+                    exact[key] = document
+                    keywords.add(key, document)
+                continue
+
+            if any(name not in PLACEHOLDER_PATTERNS for name in placeholders):
+                continue
+            # 고정 부분은 정규화, 플레이스홀더는 값 패턴으로 치환한 정규식
+            # (같은 플레이스홀더가 다시 나오면 이름 없는 그룹 - 예: "{year}년과 {year}년 비교"는 서로 다른 연도)
+            parts = PLACEHOLDER_RE.split(pattern)
+            regex_parts = []
+            named = set()
+            for i, part in enumerate(parts):
+                if i % 2 == 0:
+                    regex_parts.append(re.escape(normalize_text(part)))
+                elif part in named:
+                    regex_parts.append(f"(?:{PLACEHOLDER_PATTERNS[part]})")
+                else:
+                    named.add(part)
+                    regex_parts.append(f"(?P<{part}>{PLACEHOLDER_PATTERNS[part]})")
+            literals = [normalize_text(part) for i, part in enumerate(parts) if i % 2 == 0 and normalize_text(part)]
+            if not literals:
+                continue
+            try:
+                compiled = re.compile(''.join(regex_parts))
+            except re.error as e:
+                logger.error(f"[PATTERN] 템플릿 패턴 정규식 오류, 건너뜀: {pattern} - {str(e)}")
+                continue
+            # 가장 긴 고정 부분을 후보 선별용 키워드로 사용
+            templates.add(max(literals, key=len), (compiled, document))
+            template_count += 1
+
+        keywords.build()
+        templates.build()
+        with self._lock:
+            self._exact, self._keywords, self._templates = exact, keywords, templates
+        logger.info(f"[PATTERN] 패턴 매처 구성: 고정 {len(exact)}개, 템플릿 {template_count}개")
+
+    def refresh(self) -> None:
+        """DB에서 전체 패턴을 다시 읽어 인덱스 재구성 (실패 시 기존 인덱스 유지)"""
+        from services.pattern_service import get_all_patterns
+        try:
+            self.build(get_all_patterns())
+        except Exception as e:
+            logger.error(f"[PATTERN] 패턴 매처 갱신 실패: {str(e)}")
+
+    def _hit(self, match_type: str, document: Document) -> Document:
+        self.stats_counter[match_type] += 1
+        logger.info(f"[PATTERN] 사전 일치({match_type}): {document.page_content}")
+        return Document(
+            page_content=document.page_content,
+            metadata={**document.metadata, 'similarity_score': 1.0, 'match_type': match_type}
+        )
+
+    def match(self, text: str) -> Optional[Document]:
+        """질문과 일치하는 패턴 Document 반환 (없으면 None - 벡터 검색으로 진행)"""
+        query = normalize_text(text)
+        if not query:
+            self.stats_counter['miss'] += 1
+            return None
+        with self._lock:
+            exact, keywords, templates = self._exact, self._keywords, self._templates
+
+        # 1. 정확히 일치
+        document = exact.get(query)
+        if document is not None:
+            return self._hit('exact', document)
+
+        # 2. 템플릿 (고정 부분 포함 후보만 정규식 검사)
+        for _, _, (regex, document) in templates.search(query):
+            if regex.fullmatch(query):
+                return self._hit('template', document)
+
+        # 3. 키워드 (서로 다른 패턴이 여러 개 걸리면 애매하므로 벡터 검색에 맡김)
+        found = {keyword: document for _, keyword, document in keywords.search(query)}
+        if found:
+            longest = max(found, key=len)
+            others = [keyword for keyword in found if keyword not in longest]
+            if not others and len(longest) / len(query) >= KEYWORD_MIN_COVERAGE:
+                return self._hit('keyword', found[longest])
+
+        self.stats_counter['miss'] += 1
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """일치 유형별 횟수 및 적중률"""
+        total = sum(self.stats_counter.values())
+        hits = total - self.stats_counter['miss']
+        return {
+            **self.stats_counter,
+            'patterns': len(self._exact),
+            'hit_rate': round(hits / total, 4) if total else None
+        }
+
+# 전역 패턴 매처
+pattern_matcher = PatternMatcher()
@@ -0,0 +1,77 @@
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# {path} 또는 {path:formatter} 형식의 플레이스홀더 (예: {employee.name}, {sales.total_sales:comma})
+PLACEHOLDER_RE = re.compile(r'\{([A-Za-z_][\w.]*)(?::(\w+))?\}')
+
+# 값 포매터 (None 값은 포매터를 거치지 않고 빈 문자열로 출력)
+FORMATTERS: Dict[str, Callable[[Any], str]] = {
+    'str': str,
+    'comma': lambda value: format(value, ','),  # 천 단위 구분 (예: 1,234,567)
+    'int': lambda value: format(int(value), ','),  # 정수 + 천 단위 구분
+    'percent': lambda value: f"{value:.1f}%"  # 소수 첫째 자리 백분율 (예: 12.3%)
+}
+
+class CompiledTemplate:
+    """
+    파싱된 응답 템플릿
+    - 리터럴 문자열과 (경로, 포매터) 플레이스홀더 목록으로 보관
+    - render()는 조각을 한 번 순회해 결과 문자열 생성
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        self.parts: List[Union[str, Tuple[Tuple[str, ...], Optional[str], str]]] = []
+        position = 0
+        for match in PLACEHOLDER_RE.finditer(template):
+            if match.start() > position:
+                self.parts.append(template[position:match.start()])
+            path, formatter = match.group(1), match.group(2)
+            self.parts.append((tuple(path.split('.')), formatter, match.group(0)))
+            position = match.end()
+        if position < len(template):
+            self.parts.append(template[position:])
+
+    def render(self, context: Dict[str, Any], formatters: Optional[Dict[str, str]] = None) -> str:
+        """
+        템플릿 렌더링
+        - context: 플레이스홀더 경로의 최상위 키를 담은 dict (예: {'employee': {...}})
+        - formatters: 경로별 기본 포매터 (템플릿에 :formatter가 없을 때 사용)
+        - context에 없는 플레이스홀더는 원문 그대로 유지
+        """
+        output = []
+        for part in self.parts:
+            if isinstance(part, str):
+                output.append(part)
+                continue
+            path, formatter, raw = part
+            found, value = _resolve(context, path)
+            if not found:
+                output.append(raw)
+                continue
+            if value is None:
+                output.append('')
+                continue
+            formatter = formatter or (formatters or {}).get('.'.join(path))
+            output.append(FORMATTERS.get(formatter, str)(value))
+        return ''.join(output)
+
+def _resolve(context: Dict[str, Any], path: Tuple[str, ...]) -> Tuple[bool, Any]:
+    value: Any = context
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return False, None
+        value = value[key]
+    return True, value
+
+@lru_cache(maxsize=512)
+def compile_template(template: str) -> CompiledTemplate:
+    """템플릿 파싱 (같은 템플릿 문자열은 캐시된 결과 재사용)"""
+    return CompiledTemplate(template)
+
+def render_template(template: Optional[str], context: Dict[str, Any], formatters: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """템플릿 문자열을 컴파일(캐시)한 뒤 렌더링 (template이 None이면 None)"""
+    if template is None:
+        return None
+    return compile_template(template).render(context, formatters)
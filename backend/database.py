@@ -1,5 +1,9 @@
 import pymysql
+from pymysql.constants import SERVER_STATUS
 import os
+import threading
+import time
+from collections import deque
 from dotenv import load_dotenv
 import logging
 
@@ -8,24 +12,252 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+class PoolExhaustedError(Exception):
+    """커넥션 풀에서 대기 시간 내에 연결을 얻지 못한 경우"""
+    pass
+
+class PooledConnection:
+    """
+    풀에서 대여한 연결 래퍼
+    - close() / with 블록 종료 시 실제로 닫지 않고 풀에 반환
+    - 그 외 속성/메서드(cursor, commit, rollback 등)는 원본 연결에 위임
+    """
+
+    def __init__(self, pool: "ConnectionPool", conn, created_at: float):
+        self._pool = pool
+        self._conn = conn
+        self._created_at = created_at
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        """연결을 풀에 반환 (중복 호출 무시)"""
+        if self._released:
+            return
+        self._released = True
+        self._pool._release(self._conn, self._created_at)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        # close()를 빠뜨린 경우에도 풀 슬롯이 새지 않도록 반환
+        try:
+            self.close()
+        except Exception:
+            pass
+
+class ConnectionPool:
+    """
+    스레드 안전한 PyMySQL 커넥션 풀
+    - min_size: 기동 시 미리 만들어 두는 연결 수
+    - max_size: 동시에 대여 가능한 최대 연결 수 (초과 시 timeout초까지 대기)
+    - max_lifetime: 생성 후 이 시간(초)이 지난 연결은 반환/대여 시 폐기 후 재생성
+    - ping_interval: 유휴 시간이 이 값(초) 이상인 연결은 대여 시 ping으로 생존 확인
+    """
+
+    def __init__(self, connect_kwargs: dict, min_size: int = 1, max_size: int = 10,
+                 timeout: float = 10.0, max_lifetime: float = 1800.0, ping_interval: float = 5.0):
+        self.connect_kwargs = connect_kwargs
+        self.min_size = min_size
+        self.max_size = max(max_size, 1)
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+        # 유휴 연결: (conn, created_at, last_used_at)
+        self._idle = deque()
+        self._size = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            'checkouts': 0,
+            'created': 0,
+            'recycled': 0,
+            'ping_failures': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'total_wait_ms': 0.0,
+            'max_wait_ms': 0.0
+        }
+
+    def _create(self):
+        conn = pymysql.connect(**self.connect_kwargs)
+        with self._cond:
+            self._stats['created'] += 1
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def warmup(self):
+        """min_size만큼 유휴 연결 미리 생성"""
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._create()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                now = time.monotonic()
+                self._idle.append((conn, now, now))
+                self._cond.notify()
+
+    def acquire(self) -> PooledConnection:
+        """풀에서 연결 대여 (유휴 연결 재사용, 없으면 생성, 최대치면 대기)"""
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+        with self._cond:
+            while not self._idle and self._size >= self.max_size:
+                waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolExhaustedError(f"DB 커넥션 풀 대기 시간 초과 ({self.timeout}s, 최대 {self.max_size}개 사용 중)")
+                self._cond.wait(remaining)
+            item = self._idle.pop() if self._idle else None
+            if item is None:
+                self._size += 1
+            wait_ms = (time.monotonic() - start) * 1000
+            self._stats['checkouts'] += 1
+            if waited:
+                self._stats['waits'] += 1
+                self._stats['total_wait_ms'] += wait_ms
+                self._stats['max_wait_ms'] = max(self._stats['max_wait_ms'], wait_ms)
+
+        try:
+            if item is not None:
+                conn, created_at, last_used_at = item
+                now = time.monotonic()
+                if now - created_at >= self.max_lifetime:
+                    # 최대 수명 초과 -> 재생성
+                    self._discard(conn)
+                    with self._cond:
+                        self._stats['recycled'] += 1
+                    conn, created_at = self._create(), time.monotonic()
+                elif now - last_used_at >= self.ping_interval:
+                    # 오래 유휴 상태였던 연결은 생존 확인
+                    try:
+                        conn.ping(reconnect=False)
+                    except Exception as e:
+                        logger.warning(f"[DB] 풀 연결 ping 실패, 재연결: {str(e)}")
+                        self._discard(conn)
+                        with self._cond:
+                            self._stats['ping_failures'] += 1
+                        conn, created_at = self._create(), time.monotonic()
+            else:
+                conn, created_at = self._create(), time.monotonic()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        return PooledConnection(self, conn, created_at)
+
+    def _release(self, conn, created_at: float):
+        """연결 반환 (열린 트랜잭션은 롤백, 수명 초과/끊긴 연결은 폐기)"""
+        reusable = bool(getattr(conn, 'open', False))
+        if reusable and conn.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+            # 커밋되지 않은 트랜잭션(조회 전용 포함)이 다음 사용자에게 넘어가지 않도록 롤백
+            try:
+                conn.rollback()
+            except Exception:
+                reusable = False
+        now = time.monotonic()
+        if reusable and now - created_at >= self.max_lifetime:
+            reusable = False
+            with self._cond:
+                self._stats['recycled'] += 1
+        if not reusable:
+            self._discard(conn)
+        with self._cond:
+            if reusable:
+                self._idle.append((conn, created_at, now))
+            else:
+                self._size -= 1
+            self._cond.notify()
+
+    def close_all(self):
+        """유휴 연결 모두 닫기 (대여 중인 연결은 반환 시 재사용)"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+    def stats(self) -> dict:
+        """풀 상태 및 대기 시간 통계"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'avg_wait_ms': round(stats['total_wait_ms'] / stats['waits'], 2) if stats['waits'] else 0.0
+            })
+            stats['total_wait_ms'] = round(stats['total_wait_ms'], 2)
+            stats['max_wait_ms'] = round(stats['max_wait_ms'], 2)
+            return stats
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
+    """전역 커넥션 풀 반환 (최초 호출 시 생성)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    connect_kwargs=dict(
+                        host=os.getenv('DB_HOST', '192.168.0.200'),
+                        user=os.getenv('DB_USER', 'ywlabsdev'),
+                        password=os.getenv('DB_PASSWORD', 'ywlabs#20151010Q'),
+                        database=os.getenv('DB_NAME', 'ywlabtest'),
+                        port=3307,
+                        charset='utf8mb4',
+                        cursorclass=pymysql.cursors.DictCursor
+                    ),
+                    min_size=int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+                    max_size=int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+                    timeout=float(os.getenv('DB_POOL_TIMEOUT', 10)),
+                    max_lifetime=float(os.getenv('DB_POOL_MAX_LIFETIME', 1800)),
+                    ping_interval=float(os.getenv('DB_POOL_PING_INTERVAL', 5))
+                )
+    return _pool
+
 def get_db_connection():
-    """데이터베이스 연결"""
-    return pymysql.connect(
-        host=os.getenv('DB_HOST', '192.168.0.200'),
-        user=os.getenv('DB_USER', 'ywlabsdev'),
-        password=os.getenv('DB_PASSWORD', 'ywlabs#20151010Q'),
-        database=os.getenv('DB_NAME', 'ywlabtest'),
-        port=3307,
-        charset='utf8mb4',
-        cursorclass=pymysql.cursors.DictCursor
-    )
+    """데이터베이스 연결 (커넥션 풀에서 대여, close() 시 풀에 반환)"""
+    return get_pool().acquire()
+
+def get_pool_stats() -> dict:
+    """커넥션 풀 통계 반환"""
+    return get_pool().stats()
 
 def init_db():
     """데이터베이스 초기화"""
     try:
+        get_pool().warmup()
         connection = get_db_connection()
         if connection:
-            logger.info("[DB] 데이터베이스 연결 성공")
+            logger.info(f"[DB] 데이터베이스 연결 성공 (커넥션 풀: {get_pool().stats()})")
             connection.close()
     except Exception as e:
         logger.error(f"[DB] 초기화 중 오류 발생: {str(e)}")
@@ -1,8 +1,10 @@
-from flask import Blueprint, request, g
-from services.chat_service import get_chat_history, get_popular_questions, save_chat_interaction, get_ai_response, migrate_chat_history_user_id
+from flask import Blueprint, request, g, Response, stream_with_context
+from services.chat_service import get_chat_history, get_popular_questions, save_chat_interaction, get_ai_response, stream_ai_response, migrate_chat_history_user_id
 from common.logger import setup_logger
 from database import get_db_connection
 import re
+import json
+import time
 from services.employee_service import extract_employee_name, get_employee_info_and_fill_template
 from flask import current_app
 from common.response import ApiResponse
@@ -47,6 +49,64 @@ def chat():
         logger.error(f"챗봇 응답 생성 중 오류 발생: {str(e)}", exc_info=True)
         return ApiResponse.error("ERR_SERVER", "서버 오류가 발생했습니다.", reason=str(e), status=500)
 
+@chat_bp.route('/api/chat/stream', methods=['POST'])
+@jwt_required  # JWT 인증 필요
+def chat_stream():
+    """
+    챗봇 메시지 스트리밍 처리 (SSE)
+    - GPT 응답은 토큰 단위 이벤트로, DB 기반 응답은 단일 이벤트로 전송
+    - 스트림 종료 후 조립된 응답을 한 번 저장
+    """
+    data = request.get_json(silent=True) or {}
+    user_message = data.get('message')
+    chat_history = data.get('chat_history', [])
+    
+    if not user_message:
+        return ApiResponse.error("ERR_NO_MESSAGE", "메시지가 필요합니다.", reason="message 파라미터 없음", status=400)
+    
+    # JWT 토큰에서 사용자 ID 가져오기
+    user_id = g.user.get('user_id')
+    logger.info(f"[CHAT] 챗봇 스트리밍 요청 - 사용자: {user_id}, 메시지: {user_message[:50]}...")
+    
+    def generate():
+        start_time = time.time()
+        response = None
+        try:
+            for event in stream_ai_response(user_message, chat_history):
+                if event['type'] in ('answer', 'done'):
+                    response = event['data']
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            logger.error(f"챗봇 스트리밍 응답 생성 중 오류 발생: {str(e)}", exc_info=True)
+            error_data = {
+                'type': 'error',
+                'message': '서버 오류가 발생했습니다.'
+            }
+            yield f"data: {json.dumps(error_data, ensure_ascii=False)}\n\n"
+        finally:
+            # 완성된 응답만 저장 (클라이언트가 중간에 끊은 경우 제외)
+            if response:
+                save_chat_interaction(
+                    user_message,
+                    response.get('response', '응답을 생성할 수 없습니다.'),
+                    response.get('pattern_type'),
+                    response.get('route_code'),
+                    response.get('response_type'),
+                    round(time.time() - start_time, 3),
+                    response,
+                    user_id
+                )
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'Connection': 'keep-alive',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
 @chat_bp.route('/api/chat/history', methods=['GET'])
 @jwt_required  # JWT 인증 필요
 def chat_history():
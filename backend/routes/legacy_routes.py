@@ -1,6 +1,8 @@
-from flask import Blueprint, jsonify, Response
+from flask import Blueprint, jsonify, Response, request
+from werkzeug.http import http_date
+from datetime import datetime
 from common.logger import setup_logger
-from services.environment_service import EnvironmentService
+from services.environment_service import environment_service
 from common.response import ApiResponse
 import json
 import logging
@@ -12,20 +14,33 @@ logger = setup_logger('legacy_routes')
 # Blueprint 생성
 legacy_bp = Blueprint('legacy', __name__)
 
+def _with_cache_headers(response, etag, last_modified):
+    """ETag/Last-Modified 헤더 설정 (매 요청 재검증)"""
+    response.headers['Cache-Control'] = 'no-cache'
+    if etag:
+        response.set_etag(etag)
+    if last_modified:
+        response.headers['Last-Modified'] = http_date(last_modified)
+    return response
+
 @legacy_bp.route('/api/environment/current', methods=['GET'])
 @jwt_required  # JWT 인증 필요
 def get_environment_current():
     """현재 환경 정보 조회"""
     try:
-        logger.info("[API] 현재 환경 정보 조회 요청 시작")
+        logger.debug("[API] 현재 환경 정보 조회 요청 시작")
         
-        # 환경 정보 서비스 인스턴스 생성
-        environment_service = EnvironmentService()
-        logger.info("[API] EnvironmentService 인스턴스 생성 성공")
+        # 최신 환경 정보 스냅샷 조회 (저장할 때만 갱신, DB 조회 없음)
+        env, etag = environment_service.get_snapshot()
+        # 없거나 오래된 스냅샷은 백그라운드에서 갱신 (이번 응답은 기다리지 않고 현재 스냅샷 사용)
+        environment_service.revalidate_if_stale(env)
+        last_modified = datetime.fromisoformat(env['timestamp']) if env and env.get('timestamp') else None
         
-        # 최신 환경 정보 조회
-        env = environment_service.get_latest_environment()
-        logger.info(f"[API] get_latest_environment() 결과: {env}")
+        # 클라이언트가 가진 데이터와 같으면 304 응답
+        if etag and (etag in request.if_none_match or
+                     (not request.if_none_match and last_modified and request.if_modified_since
+                      and request.if_modified_since.replace(tzinfo=None) >= last_modified.replace(microsecond=0))):
+            return _with_cache_headers(Response(status=304), etag, last_modified)
         
         # 환경 정보가 없는 경우 처리
         if not env:
@@ -59,8 +74,9 @@ def get_environment_current():
             },
             'timestamp': env['timestamp']
         }
-        logger.info(f"[API] 응답 데이터 구성 완료: {data}")
-        return ApiResponse.success(data=data, message="환경 정보 조회 성공")
+        logger.debug(f"[API] 응답 데이터 구성 완료: {data}")
+        response, status = ApiResponse.success(data=data, message="환경 정보 조회 성공")
+        return _with_cache_headers(response, etag, last_modified), status
         
     except Exception as e:
         logger.error(f"환경 정보 조회 중 예외 발생: {str(e)}", exc_info=True)
@@ -72,60 +88,27 @@ def get_environment_stream():
     """SSE 스트림 연결"""
     logger.info("[API] SSE 스트림 연결 요청: /environment/stream")
     
-    # 환경 정보 서비스 인스턴스 생성
-    environment_service = EnvironmentService()
-    
-    def generate():
-        try:
-            # 클라이언트 연결 시 초기 데이터 전송
-            env = environment_service.get_latest_environment()
-            if env:
-                data = {
-                    'status': 'success',
-                    'data': env
-                }
-                yield f"data: {json.dumps(data)}\n\n"
-            else:
-                # 초기 데이터가 없는 경우 에러 메시지 전송
-                error_data = {
-                    'status': 'error',
-                    'message': '환경 정보를 찾을 수 없습니다.'
-                }
-                yield f"data: {json.dumps(error_data)}\n\n"
-
-            # 클라이언트를 SSE 클라이언트 목록에 추가
-            environment_service.add_sse_client(generate)
-            logger.info("[API] SSE 클라이언트 연결됨")
-
-            # 연결 유지 및 주기적 데이터 전송
-            while True:
-                try:
-                    # 30초마다 ping 메시지 전송
-                    yield "data: {\"type\": \"ping\"}\n\n"
-                    yield "data: {\"type\": \"ping\"}\n\n"
-                except Exception as e:
-                    logger.error(f"SSE 데이터 전송 중 오류 발생: {str(e)}")
-                    error_data = {
-                        'status': 'error',
-                        'message': '데이터 전송 중 오류가 발생했습니다.'
-                    }
-                    yield f"data: {json.dumps(error_data)}\n\n"
-                    break
-
-        except Exception as e:
-            logger.error(f"SSE 스트림 생성 중 오류 발생: {str(e)}")
-            error_data = {
-                'status': 'error',
-                'message': '스트림 연결 중 오류가 발생했습니다.'
-            }
-            yield f"data: {json.dumps(error_data)}\n\n"
-        finally:
-            # 클라이언트 연결 종료 시 제거
-            environment_service.remove_sse_client(generate)
-            logger.error(f"SSE 클라이언트 연결 종료")
+    # 클라이언트 연결 시 초기 데이터 전송 (스냅샷)
+    try:
+        env, _ = environment_service.get_snapshot()
+    except Exception as e:
+        logger.error(f"SSE 초기 데이터 조회 중 오류 발생: {str(e)}")
+        env = None
+    if env:
+        initial = {
+            'status': 'success',
+            'data': env
+        }
+    else:
+        # 초기 데이터가 없는 경우 에러 메시지 전송
+        initial = {
+            'status': 'error',
+            'message': '환경 정보를 찾을 수 없습니다.'
+        }
 
+    # 구독자별 큐로 이벤트 수신, 이벤트가 없으면 heartbeat 주기로 ping
     return Response(
-        generate(),
+        environment_service.broker.stream(initial),
         mimetype='text/event-stream',
         headers={
             'Cache-Control': 'no-cache',
@@ -1,5 +1,5 @@
-from flask import Blueprint
-from services.sales_service import get_sales_summary, predict_sales
+from flask import Blueprint, request
+from services.sales_service import get_sales_summary, predict_sales, get_sales_range
 from common.response import ApiResponse
 import logging
 from routes import jwt_required  # JWT 인증 데코레이터 import
@@ -26,4 +26,25 @@ def get_sales_data(year):
         return ApiResponse.success(data=data, message="매출 데이터 조회 성공")
     except Exception as e:
         logging.error(f"매출 데이터 조회 중 오류 발생: {str(e)}", exc_info=True)
-        return ApiResponse.error("ERR_SERVER", "매출 데이터 조회 실패", reason=str(e), status=500) 
\ No newline at end of file
+        return ApiResponse.error("ERR_SERVER", "매출 데이터 조회 실패", reason=str(e), status=500)
+
+# 조회 가능한 최대 연도 구간 길이
+MAX_RANGE_YEARS = 50
+
+# 연도 구간 매출 및 AI 예측 결과를 한 번에 반환하는 API
+@sales_bp.route('/api/sales/range', methods=['GET'])
+@jwt_required  # JWT 인증 필요
+def get_sales_range_data():
+    """연도 구간 매출 데이터 조회 (연도별 값을 컬럼 배열로 반환)"""
+    from_year = request.args.get('from', type=int)
+    to_year = request.args.get('to', type=int)
+    if from_year is None or to_year is None:
+        return ApiResponse.error("ERR_INVALID_PARAM", "조회 연도 구간이 필요합니다.", reason="from, to 파라미터 없음", status=400)
+    if from_year > to_year or to_year - from_year + 1 > MAX_RANGE_YEARS:
+        return ApiResponse.error("ERR_INVALID_PARAM", "조회 연도 구간이 올바르지 않습니다.", reason=f"from <= to, 최대 {MAX_RANGE_YEARS}년", status=400)
+    try:
+        data = get_sales_range(from_year, to_year)
+        return ApiResponse.success(data=data, message="매출 데이터 조회 성공")
+    except Exception as e:
+        logging.error(f"매출 구간 데이터 조회 중 오류 발생: {str(e)}", exc_info=True)
+        return ApiResponse.error("ERR_SERVER", "매출 데이터 조회 실패", reason=str(e), status=500)
@@ -0,0 +1,35 @@
+from apscheduler.schedulers.background import BackgroundScheduler
+from services.sales_service import sales_forecaster
+from common.logger import setup_logger
+from config import config
+
+logger = setup_logger('sales_scheduler')
+
+def refresh_sales_job():
+    """매출 집계/예측 갱신 작업 (데이터가 바뀐 경우에만 다시 집계/학습)"""
+    try:
+        if sales_forecaster.refresh():
+            logger.info("매출 집계/예측 갱신 완료")
+    except Exception as e:
+        logger.error(f"매출 집계/예측 갱신 실패: {str(e)}")
+
+def start_scheduler():
+    """스케줄러 시작"""
+    scheduler = BackgroundScheduler()
+    
+    # 설정된 주기마다 매출 데이터 변경 확인 후 갱신
+    scheduler.add_job(
+        refresh_sales_job,
+        'interval',
+        seconds=config.SALES_CACHE_CHECK_INTERVAL,
+        id='refresh_sales',
+        replace_existing=True
+    )
+    
+    scheduler.start()
+    logger.info("매출 스케줄러 시작됨")
+    
+    # 기동 시 한 번 미리 집계/학습
+    refresh_sales_job()
+    
+    return scheduler
@@ -1,9 +1,19 @@
 from apscheduler.schedulers.background import BackgroundScheduler
-from services.vector_service import validate_vector_store
+from services.vector_service import sync_vector_store, validate_vector_store
 from common.logger import setup_logger
+from config import config
 
 logger = setup_logger('vector_scheduler')
 
+def sync_vector_store_job():
+    """패턴/위젯 변경분 동기화 작업"""
+    try:
+        results = sync_vector_store()
+        if results:
+            logger.info(f"벡터 스토어 동기화 완료: {list(results)}")
+    except Exception as e:
+        logger.error(f"벡터 스토어 동기화 실패: {str(e)}")
+
 def update_vector_store_job():
     """벡터 스토어 검증 작업"""
     try:
@@ -17,6 +27,16 @@ def start_scheduler():
     """스케줄러 시작"""
     scheduler = BackgroundScheduler()
     
+    # 설정된 주기마다 패턴/위젯 변경 확인 후 바뀐 행만 동기화
+    if config.VECTOR_SYNC_INTERVAL > 0:
+        scheduler.add_job(
+            sync_vector_store_job,
+            'interval',
+            seconds=config.VECTOR_SYNC_INTERVAL,
+            id='sync_vector_store',
+            replace_existing=True
+        )
+    
     # 매일 새벽 3시에 벡터 스토어 검증 작업 실행
     scheduler.add_job(
         update_vector_store_job,
@@ -29,4 +49,4 @@ def start_scheduler():
     scheduler.start()
     logger.info("벡터 스토어 스케줄러 시작됨")
     
-    return scheduler 
\ No newline at end of file
+    return scheduler
@@ -0,0 +1,302 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import pymysql
+
+from config import config
+from database import get_db_connection
+import logging
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+INSERT_SQL = '''
+    INSERT INTO chat_history
+    (user_id, user_message, ai_response, intent_tag, route_code, response_source, response_time, response_json, created_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+'''
+
+# 디스크 보관분 재적재 최소 간격(초) - DB 장애 중 반복 시도 방지
+SPILL_REPLAY_INTERVAL = 30
+
+# DB 연결 자체가 실패한 경우 (행 단위 재시도 대신 전체를 디스크에 보관)
+CONNECTION_ERRORS = (pymysql.err.OperationalError, pymysql.err.InterfaceError)
+
+class ChatHistoryWriter:
+    """
+    [챗봇 히스토리 비동기 배치 저장기]
+    - 요청 처리 스레드는 큐에 넣기만 하고 바로 반환
+    - 백그라운드 스레드가 batch_size건 또는 flush_interval_ms마다 multi-row INSERT 후 1회 커밋
+    - 큐가 가득 차거나 MySQL에 쓸 수 없으면 spill_file(JSONL)에 보관, 다음 flush 때 재적재
+    - 프로세스 종료 시(atexit) 남은 항목을 모두 flush
+    """
+
+    def __init__(self, queue_size: int = 10000, batch_size: int = 100,
+                 flush_interval_ms: int = 500, spill_file: Optional[str] = None):
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = max(flush_interval_ms, 1) / 1000.0
+        self.spill_file = spill_file
+        self._queue: "queue.Queue[Tuple]" = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._last_replay = 0.0
+        # 기동 후 첫 재적재 전 (종료된 프로세스가 남긴 재적재 파일 확인 필요)
+        self._orphans_checked = False
+        self.stats = {'enqueued': 0, 'written': 0, 'batches': 0, 'spilled': 0, 'dropped': 0}
+
+    def start(self):
+        """백그라운드 스레드 시작 (중복 호출 무시)"""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='chat-history-writer', daemon=True)
+            self._thread.start()
+            logger.info(f"[CHAT] 히스토리 저장기 시작 (batch={self.batch_size}, interval={int(self.flush_interval * 1000)}ms)")
+
+    def enqueue(self, row: Tuple):
+        """저장할 행 추가 (블로킹 없음, 큐가 가득 차면 디스크에 보관)"""
+        self.start()
+        try:
+            self._queue.put_nowait(row)
+            self.stats['enqueued'] += 1
+        except queue.Full:
+            logger.warning("[CHAT] 히스토리 큐가 가득 차 디스크에 보관합니다")
+            self._spill([row])
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._collect_batch()
+            if batch:
+                self._write(batch)
+            elif ((self._has_spill() or (self.spill_file and not self._orphans_checked))
+                  and time.monotonic() - self._last_replay >= SPILL_REPLAY_INTERVAL):
+                self._last_replay = time.monotonic()
+                self._replay_spill()
+
+    def _collect_batch(self) -> List[Tuple]:
+        """batch_size건이 모이거나 flush_interval이 지날 때까지 수집"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[Tuple]):
+        """multi-row INSERT 1회 + 커밋 1회 (실패 시 행 단위 재시도/디스크 보관)"""
+        batch = [serialize_row(row) for row in batch]
+        try:
+            conn = get_db_connection()
+        except Exception as e:
+            logger.error(f"[CHAT] 히스토리 저장용 DB 연결 실패, 디스크에 보관: {str(e)}")
+            self._spill(batch)
+            return
+        try:
+            with conn.cursor() as cursor:
+                # PyMySQL executemany는 INSERT ... VALUES를 multi-row 문으로 합쳐서 실행
+                cursor.executemany(INSERT_SQL, batch)
+            conn.commit()
+            self.stats['written'] += len(batch)
+            self.stats['batches'] += 1
+            logger.info(f"[CHAT] 챗봇 상호작용 {len(batch)}건 저장 완료")
+        except CONNECTION_ERRORS as e:
+            logger.error(f"[CHAT] 챗봇 상호작용 저장 실패, 디스크에 보관: {str(e)}")
+            self._safe_rollback(conn)
+            self._spill(batch)
+        except Exception as e:
+            # 일부 행의 데이터 오류로 배치 전체가 실패한 경우 행 단위로 재시도
+            logger.error(f"[CHAT] 배치 저장 실패, 행 단위 재시도: {str(e)}")
+            self._safe_rollback(conn)
+            self._write_rows(conn, batch)
+        finally:
+            conn.close()
+
+    def _write_rows(self, conn, batch: List[Tuple]):
+        for row in batch:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(INSERT_SQL, row)
+                conn.commit()
+                self.stats['written'] += 1
+            except CONNECTION_ERRORS as e:
+                logger.error(f"[CHAT] 챗봇 상호작용 저장 실패, 디스크에 보관: {str(e)}")
+                self._spill([row])
+            except Exception as e:
+                logger.error(f"[CHAT] 챗봇 상호작용 저장 실패 (행 폐기): {str(e)}")
+                self._safe_rollback(conn)
+                self.stats['dropped'] += 1
+
+    def _safe_rollback(self, conn):
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+
+    def _spill(self, rows: List[Tuple]):
+        """저장하지 못한 행을 JSONL 파일에 추가"""
+        if not self.spill_file:
+            logger.error(f"[CHAT] 보관 파일 미설정, {len(rows)}건 폐기")
+            self.stats['dropped'] += len(rows)
+            return
+        try:
+            with self._spill_lock:
+                os.makedirs(os.path.dirname(self.spill_file), exist_ok=True)
+                with open(self.spill_file, 'a', encoding='utf-8') as f:
+                    for row in rows:
+                        f.write(json.dumps(serialize_row(row), ensure_ascii=False) + '\n')
+            self.stats['spilled'] += len(rows)
+        except Exception as e:
+            logger.error(f"[CHAT] 디스크 보관 실패, {len(rows)}건 폐기: {str(e)}")
+            self.stats['dropped'] += len(rows)
+
+    def _has_spill(self) -> bool:
+        return bool(self.spill_file) and os.path.exists(self.spill_file) and os.path.getsize(self.spill_file) > 0
+
+    def _replay_spill(self):
+        """
+        보관 파일의 행을 다시 저장
+        - 보관 파일을 프로세스/재적재마다 고유한 이름으로 옮긴 뒤 처리 (여러 워커가 같은 파일을 공유해도 서로 덮어쓰지 않음)
+        - 종료된 프로세스가 처리하지 못하고 남긴 재적재 파일도 함께 처리
+        - 재적재 파일은 모든 행을 저장(또는 다시 보관)한 뒤에만 삭제 (도중에 종료되면 다음 재적재 때 다시 처리)
+        """
+        if not self.spill_file:
+            return
+        replay_paths = self._claim_orphaned_replays()
+        self._orphans_checked = True
+        with self._spill_lock:
+            replay_path = f"{self.spill_file}.{os.getpid()}.{time.time_ns()}.replay"
+            try:
+                os.replace(self.spill_file, replay_path)
+                replay_paths.append(replay_path)
+            except FileNotFoundError:
+                pass
+        for path in replay_paths:
+            self._replay_file(path)
+
+    def _claim_orphaned_replays(self) -> List[str]:
+        """종료된 프로세스가 남긴 재적재 파일을 이 프로세스 이름으로 옮겨 가져옴"""
+        directory = os.path.dirname(self.spill_file) or '.'
+        prefix = f"{os.path.basename(self.spill_file)}."
+        claimed = []
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return claimed
+        for name in names:
+            if not (name.startswith(prefix) and name.endswith('.replay')):
+                continue
+            pid = name[len(prefix):].split('.', 1)[0]
+            if not pid.isdigit() or int(pid) == os.getpid() or _pid_alive(int(pid)):
+                continue
+            claimed_path = f"{self.spill_file}.{os.getpid()}.{time.time_ns()}.replay"
+            try:
+                os.replace(os.path.join(directory, name), claimed_path)
+            except FileNotFoundError:
+                # 다른 워커가 먼저 가져감
+                continue
+            logger.warning(f"[CHAT] 종료된 프로세스({pid})가 남긴 재적재 파일 처리: {name}")
+            claimed.append(claimed_path)
+        return claimed
+
+    def _replay_file(self, replay_path: str):
+        rows = []
+        with open(replay_path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(tuple(json.loads(line)))
+                except ValueError as e:
+                    # 기록 도중 종료되어 잘린 줄 등
+                    logger.error(f"[CHAT] 보관 파일 {line_no}번째 줄을 읽을 수 없어 건너뜀: {str(e)}")
+                    self.stats['dropped'] += 1
+        logger.info(f"[CHAT] 디스크 보관 히스토리 {len(rows)}건 재적재 시작")
+        for i in range(0, len(rows), self.batch_size):
+            # _write는 저장하지 못한 행을 다시 보관 파일에 기록
+            self._write(rows[i:i + self.batch_size])
+        os.remove(replay_path)
+
+    def flush(self):
+        """큐에 남은 항목을 현재 스레드에서 모두 저장"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    def shutdown(self, timeout: float = 5.0):
+        """백그라운드 스레드 정지 후 남은 항목 flush"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+        logger.info(f"[CHAT] 히스토리 저장기 종료: {self.stats}")
+
+def _pid_alive(pid: int) -> bool:
+    """같은 호스트에서 해당 프로세스가 실행 중인지 여부 (확인할 수 없는 환경에서는 실행 중으로 간주)"""
+    if os.name == 'nt':
+        # Windows의 os.kill은 시그널 0으로도 프로세스를 종료하므로 사용하지 않음
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+def build_row(user_message, ai_response, intent_tag, route_code, response_source, response_time, response_json=None, user_id=None) -> Tuple:
+    """
+    chat_history INSERT 파라미터 생성
+    - created_at은 요청 시각으로 고정 (저장이 지연되어도 순서 유지)
+    - response_json 직렬화는 저장 스레드에서 수행 (serialize_row)
+    """
+    return (
+        user_id,
+        user_message,
+        ai_response,
+        intent_tag,
+        route_code,
+        response_source,
+        response_time,
+        response_json or None,
+        datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    )
+
+def serialize_row(row: Tuple) -> Tuple:
+    """response_json(dict)을 JSON 문자열로 변환 (이미 문자열이면 그대로)"""
+    response_json = row[7]
+    if response_json is None or isinstance(response_json, str):
+        return row
+    return row[:7] + (json.dumps(response_json, ensure_ascii=False, default=str),) + row[8:]
+
+# 전역 히스토리 저장기
+chat_history_writer = ChatHistoryWriter(
+    queue_size=config.CHAT_HISTORY_QUEUE_SIZE,
+    batch_size=config.CHAT_HISTORY_BATCH_SIZE,
+    flush_interval_ms=config.CHAT_HISTORY_FLUSH_MS,
+    spill_file=config.CHAT_HISTORY_SPILL_FILE
+)
+atexit.register(chat_history_writer.shutdown)
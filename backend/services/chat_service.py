@@ -4,16 +4,16 @@ from database import get_db_connection
 import time
 from common.logger import setup_logger
 import json
-from services.chroma_service import search_similar_in_collection, search_rag_documents
+from services.chat_history_writer import chat_history_writer, build_row
+from services.chroma_service import search_similar_in_collection, search_rag_documents, embed_query_for_collection, collection_registry
 from config import config
-from langchain_openai import ChatOpenAI
-from typing import Dict, Any, List, Optional
-import importlib
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime
 import logging
-from core.profiles.prompt_utils import get_prompt_template, format_system_prompt
-from langchain_core.runnables import RunnablePassthrough
-from langchain_core.output_parsers import StrOutputParser
+from core.utils.cache_utils import SemanticCache
+from core.profiles.chain_registry import chain_registry
+from core.utils.pattern_matcher import pattern_matcher
+from core.handlers.registry import handler_registry
 from langchain_core.documents import Document
 
 # 로거 설정
@@ -25,6 +25,13 @@ openai_client = OpenAI(
     timeout=20.0
     )
 
+# GPT 응답 의미 캐시 (유사 질문 + 동일 검색 문서이면 이전 답변 재사용)
+answer_cache = SemanticCache(
+    maxsize=config.ANSWER_CACHE_SIZE,
+    ttl=config.ANSWER_CACHE_TTL,
+    max_distance=config.ANSWER_CACHE_MAX_DISTANCE
+)
+
 def create_response(
     response: str,
     response_type: str = "text",
@@ -51,15 +58,17 @@ def create_response(
         response_data['metadata'] = metadata
     return response_data
 
-def get_db_response(user_message: str) -> Optional[Dict[str, Any]]:
+def get_db_response(user_message: str, docs: Optional[List[Document]] = None) -> Optional[Dict[str, Any]]:
     """
     DB 기반 응답(챗봇 기능)을 먼저 확인합니다.
     - 메뉴 이동, 지정된 답변, 동적 핸들러 등을 처리합니다.
+    - docs: 미리 검색한 chatbot_collection 결과 (없으면 여기서 검색)
     - 처리할 내용이 없으면 None을 반환합니다.
     """
     logger.info(f"[DB 응답 시도] 사용자 질문: {user_message}")
     
-    docs = search_similar_in_collection("chatbot_collection", user_message, top_k=1)
+    if docs is None:
+        docs = search_similar_in_collection("chatbot_collection", user_message, top_k=1)
     
     if not docs:
         logger.info("[DB 응답] 유사한 QnA를 찾지 못했습니다.")
@@ -81,9 +90,7 @@ def get_db_response(user_message: str) -> Optional[Dict[str, Any]]:
         if response_handler:
             try:
                 logger.info(f"[핸들러] 동적 핸들러 실행: {response_handler}")
-                handler_module = importlib.import_module(f"core.handlers.{response_handler}")
-                handler_func = getattr(handler_module, 'handle')
-                return handler_func(user_message, meta, meta.get('response'))
+                return handler_registry.dispatch(response_handler, user_message, meta, meta.get('response'))
             except Exception as e:
                 logger.error(f"[핸들러] 핸들러 실행 실패: {str(e)}")
                 return create_response("죄송합니다. 요청을 처리하는 중에 오류가 발생했습니다.", "error")
@@ -106,29 +113,32 @@ def get_db_response(user_message: str) -> Optional[Dict[str, Any]]:
     logger.info(f"[DB 응답] 일치 항목을 찾았으나, GPT로 처리하기 위해 건너뜁니다. (유사도: {similarity_score}, 임계값: {similarity_threshold})")
     return None
 
-def get_gpt_response(question: str, chat_history: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
+def get_gpt_response(question: str, chat_history: Optional[List[Dict[str, str]]] = None, rag_docs: Optional[List[Document]] = None) -> Dict[str, Any]:
     """
     RAG + LLM을 사용하여 문서 기반의 답변을 생성합니다.
+    - rag_docs: 미리 검색한 RAG 문서 (없으면 여기서 검색)
     """
     logger.info(f"[GPT 응답 시도] 사용자 질문: {question}")
     
     # 1. RAG 문서 검색
-    rag_docs = search_rag_documents(question)
+    if rag_docs is None:
+        rag_docs = search_rag_documents(question)
     if not rag_docs:
         logger.warning("[GPT 응답] 관련 문서를 찾지 못했습니다.")
         return create_response("죄송합니다. 질문과 관련된 정보를 찾을 수 없습니다.", "not_found")
         
+    # 2. 유사 질문 + 동일 검색 문서에 대한 이전 답변이 있으면 재사용
+    cached_response, cache_lookup = get_cached_answer(question, rag_docs)
+    if cached_response:
+        return cached_response
+        
     context = "\n\n".join(doc.page_content for doc in rag_docs)
 
-    # 2. LangChain을 사용한 답변 생성
-    llm = ChatOpenAI(model="gpt-4-turbo", temperature=0.3, max_tokens=1500)
+    # 3. LangChain을 사용한 답변 생성
     # RAG 검색 결과는 policy_assistant 프롬프트를 사용해 정확하게 답변하도록 합니다.
-    prompt = get_prompt_template("policy_assistant")
-    
-    if not prompt:
+    chain = chain_registry.get("policy_assistant")
+    if chain is None:
         return create_response("죄송합니다. 응답 생성에 필요한 프롬프트를 찾을 수 없습니다.", "error")
-
-    chain = prompt | llm | StrOutputParser()
     
     ai_message = chain.invoke({
         "context": context,
@@ -136,8 +146,63 @@ def get_gpt_response(question: str, chat_history: Optional[List[Dict[str, str]]]
     })
     
     logger.info("[GPT 응답] 생성 완료")
-    return create_response(response=ai_message, response_type="gpt")
+    response = create_response(response=ai_message, response_type="gpt")
+    store_cached_answer(cache_lookup, response)
+    return response
+
+def _answer_context_key(rag_docs: List[Document]) -> tuple:
+    """
+    답변 캐시 문맥 키 = 검색된 문서 ID 목록 + 컬렉션 버전
+    - 컬렉션이 다시 만들어지면(레지스트리 버전 증가) 이전 답변은 더 이상 일치하지 않음
+    """
+    doc_ids = tuple(sorted(
+        (doc.metadata.get('collection_name'), doc.metadata.get('document_id')) for doc in rag_docs
+    ))
+    collection_names = sorted({doc.metadata.get('collection_name') for doc in rag_docs if doc.metadata.get('collection_name')})
+    versions = tuple((name, collection_registry.version(name)) for name in collection_names)
+    return doc_ids + versions
+
+def get_cached_answer(question: str, rag_docs: List[Document]):
+    """
+    [답변 캐시 조회]
+    - 출력: (캐시된 응답 또는 None, 저장 시 재사용할 (쿼리 임베딩, 문맥 키))
+    """
+    if not config.ANSWER_CACHE_ENABLED or not rag_docs:
+        return None, None
+    if any(doc.metadata.get('document_id') is None for doc in rag_docs):
+        return None, None
+    try:
+        query_embedding = embed_query_for_collection(rag_docs[0].metadata.get('collection_name'), question)
+        if query_embedding is None:
+            return None, None
+        context_key = _answer_context_key(rag_docs)
+        cached = answer_cache.get(query_embedding, context_key)
+    except Exception as e:
+        logger.error(f"[답변 캐시] 조회 실패: {str(e)}")
+        return None, None
+    if cached is None:
+        return None, (query_embedding, context_key)
+    
+    response, similarity = cached
+    logger.info(f"[답변 캐시] 캐시된 답변 반환 (유사도: {similarity:.4f})")
+    cached_response = dict(response)
+    cached_response['timestamp'] = datetime.now().isoformat()
+    cached_response['metadata'] = {
+        **(response.get('metadata') or {}),
+        'cache': {
+            'hit': True,
+            'similarity': round(similarity, 4),
+            'cached_at': response.get('timestamp')
+        }
+    }
+    return cached_response, None
 
+def store_cached_answer(cache_lookup, response: Dict[str, Any]) -> None:
+    """GPT 응답을 답변 캐시에 저장 (get_cached_answer의 조회 결과 사용)"""
+    if cache_lookup is None or not response.get('response'):
+        return
+    query_embedding, context_key = cache_lookup
+    answer_cache.set(query_embedding, context_key, response)
 
 def get_ai_response(question: str, chat_history: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
     """
@@ -148,13 +213,21 @@ def get_ai_response(question: str, chat_history: Optional[List[Dict[str, str]]]
     start_time = time.time()
     logger.info(f"===== AI 응답 프로세스 시작: {question} =====")
     
-    # 1. DB 기반 응답 시도 (챗봇 기능)
+    # 0. 패턴 사전 일치 시 임베딩/벡터 검색 없이 바로 DB 응답
+    matched_doc = pattern_matcher.match(question)
+    if matched_doc:
+        db_response = get_db_response(question, [matched_doc])
+        if db_response:
+            logger.info(f"[최종 응답] 패턴 사전 일치 응답 반환. (소요시간: {time.time() - start_time:.4f}초)")
+            return db_response
+    
+    # 1. DB 기반 응답 시도 (챗봇 기능, chatbot_collection만 검색)
     db_response = get_db_response(question)
     if db_response:
         logger.info(f"[최종 응답] DB 기반 응답 반환. (소요시간: {time.time() - start_time:.2f}초)")
         return db_response
         
-    # 2. RAG + GPT 기반 응답 시도
+    # 2. DB 응답이 없을 때만 RAG 컬렉션 검색 + GPT 응답 시도 (쿼리 임베딩은 캐시에서 재사용)
     gpt_response = get_gpt_response(question, chat_history)
     
     # gpt 응답 결과가 not_found일때 최종적으로 응답할 메세지
@@ -164,6 +237,67 @@ def get_ai_response(question: str, chat_history: Optional[List[Dict[str, str]]]
     logger.info(f"[최종 응답] GPT 기반 응답 반환. (소요시간: {time.time() - start_time:.2f}초)")
     return gpt_response
 
+def stream_ai_response(question: str, chat_history: Optional[List[Dict[str, str]]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    [AI 응답 스트리밍]
+    - get_ai_response와 같은 순서(DB 응답 -> RAG + GPT)로 처리하되 결과를 이벤트 단위로 반환
+    - 출력 이벤트:
+        - {'type': 'answer', 'data': 응답}: DB 기반 응답/문서 없음 등 한 번에 완성되는 응답
+        - {'type': 'token', 'data': 문자열}: GPT 응답 토큰 조각
+        - {'type': 'done', 'data': 응답}: GPT 스트리밍 종료 시 조립된 전체 응답
+    """
+    start_time = time.time()
+    logger.info(f"===== AI 응답 스트리밍 시작: {question} =====")
+    
+    # 0. 패턴 사전 일치 시 벡터 검색 없이 단일 이벤트로 전송
+    matched_doc = pattern_matcher.match(question)
+    if matched_doc:
+        db_response = get_db_response(question, [matched_doc])
+        if db_response:
+            yield {'type': 'answer', 'data': db_response}
+            return
+    
+    # 1. DB 기반 응답은 단일 이벤트로 전송 (chatbot_collection만 검색)
+    db_response = get_db_response(question)
+    if db_response:
+        logger.info(f"[스트리밍] DB 기반 응답 반환. (소요시간: {time.time() - start_time:.2f}초)")
+        yield {'type': 'answer', 'data': db_response}
+        return
+    
+    # 2. DB 응답이 없을 때만 RAG 컬렉션 검색 (쿼리 임베딩은 캐시에서 재사용), 문서가 없으면 안내 메시지 전송
+    rag_docs = search_rag_documents(question)
+    if not rag_docs:
+        logger.warning("[스트리밍] 관련 문서를 찾지 못했습니다.")
+        yield {'type': 'answer', 'data': create_response("죄송합니다. 현재 질문에 대해 답변할 수 있는 정보가 없습니다. 다른 질문을 해주시거나 관리자에게 문의해주세요.", "text")}
+        return
+    
+    # 3. 유사 질문에 대한 이전 답변이 있으면 단일 이벤트로 전송
+    cached_response, cache_lookup = get_cached_answer(question, rag_docs)
+    if cached_response:
+        yield {'type': 'answer', 'data': cached_response}
+        return
+    
+    chain = chain_registry.get("policy_assistant")
+    if chain is None:
+        yield {'type': 'answer', 'data': create_response("죄송합니다. 응답 생성에 필요한 프롬프트를 찾을 수 없습니다.", "error")}
+        return
+    
+    # 4. GPT 응답을 토큰 단위로 전송 후 전체 응답 조립
+    context = "\n\n".join(doc.page_content for doc in rag_docs)
+    chunks = []
+    for chunk in chain.stream({"context": context, "question": question}):
+        if not chunk:
+            continue
+        if not chunks:
+            logger.info(f"[스트리밍] 첫 토큰 수신 (소요시간: {time.time() - start_time:.2f}초)")
+        chunks.append(chunk)
+        yield {'type': 'token', 'data': chunk}
+    
+    logger.info(f"[스트리밍] GPT 응답 완료. (소요시간: {time.time() - start_time:.2f}초)")
+    response = create_response(response="".join(chunks), response_type="gpt")
+    store_cached_answer(cache_lookup, response)
+    yield {'type': 'done', 'data': response}
+
 def save_chat_interaction(user_message, ai_response, intent_tag, route_code, response_source, response_time, response_json=None, user_id=None):
     """
     [챗봇 상호작용 저장]
@@ -177,29 +311,18 @@ def save_chat_interaction(user_message, ai_response, intent_tag, route_code, res
         - response_json: 응답 JSON 데이터
         - user_id: 사용자 ID (새로 추가)
     """
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cursor:
-            cursor.execute('''
-                INSERT INTO chat_history 
-                (user_id, user_message, ai_response, intent_tag, route_code, response_source, response_time, response_json)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            ''', (
-                user_id,
-                user_message,
-                ai_response,
-                intent_tag,
-                route_code,
-                response_source,
-                response_time,
-                json.dumps(response_json, ensure_ascii=False) if response_json else None
-            ))
-            conn.commit()
-            logger.info(f"[CHAT] 챗봇 상호작용 저장 완료 - 사용자: {user_id}")
-    except Exception as e:
-        logger.error(f"[CHAT] 챗봇 상호작용 저장 실패: {str(e)}")
-    finally:
-        conn.close()
+    # 요청 지연을 줄이기 위해 백그라운드 저장기 큐에 넣고 바로 반환 (배치 INSERT)
+    chat_history_writer.enqueue(build_row(
+        user_message,
+        ai_response,
+        intent_tag,
+        route_code,
+        response_source,
+        response_time,
+        response_json,
+        user_id
+    ))
+    logger.debug(f"[CHAT] 챗봇 상호작용 저장 대기열 추가 - 사용자: {user_id}")
 
 def get_chat_history(user_id, limit=20):
     """
@@ -13,15 +13,26 @@ import importlib
 from core.embeddings.hf_embedding import get_hf_embedding
 from langchain_openai import OpenAIEmbeddings
 from common.logger import setup_logger
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 from langchain_core.documents import Document
-from core.parsers.document_loader import load_documents
+from services.ingestion_service import IngestionPipeline
 import logging
 from chromadb import Client, Settings
 from chromadb.config import Settings as ChromaSettings
 from core.utils import get_func_from_str
 from config import get_config
 import numpy as np
+import hashlib
+import json
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+try:
+    import fcntl  # 프로세스 간 파일 잠금 (POSIX)
+except ImportError:  # Windows 등에서는 프로세스 내 잠금만 사용
+    fcntl = None
 
 # 로거 설정
 logger = logging.getLogger(__name__)
@@ -46,11 +57,363 @@ def get_openai_embeddings():
     return _embeddings
 
 # ChromaDB 클라이언트 초기화
+# - CHROMA_PERSISTENT=true 이면 디스크에 컬렉션을 유지하고 기동 시 변경분만 재임베딩
 client = Client(ChromaSettings(
+    is_persistent=config.CHROMA_PERSISTENT,
     persist_directory=config.RAG_CHROMA_DIR,
     anonymized_telemetry=False
 ))
 
+# 다중 컬렉션 병렬 검색용 스레드 풀
+_search_executor = ThreadPoolExecutor(max_workers=config.CHROMA_SEARCH_WORKERS, thread_name_prefix='chroma-search')
+
+# 컬렉션별 소스 지문(fingerprint) 기록 파일
+MANIFEST_FILE_NAME = 'collection_manifest.json'
+
+# 버전 컬렉션 이름 구분자 ("{논리 이름}__v{버전}", Chroma 컬렉션 이름에는 '@'를 쓸 수 없음)
+VERSION_SEPARATOR = '__v'
+
+# manifest 안의 alias 기록 키
+ALIASES_KEY = '_aliases'
+
+# 버전 컬렉션 빌드/공개 잠금 파일 (manifest와 같은 디렉터리)
+BUILD_LOCK_FILE_NAME = 'collection_manifest.lock'
+
+# RAG 컬렉션 적재 방식 버전 (바뀌면 기존 컬렉션을 재사용하지 않고 새로 적재)
+# - 2: 컬렉션 embedding_model(SBERT)로 임베딩 (이전에는 OpenAI 임베딩)
+# - 3: 청크 ID에 파일 경로 해시 포함 (내용이 같은 파일끼리 ID 충돌 방지)
+RAG_INGESTION_VERSION = 3
+
+def _list_collection_names() -> List[str]:
+    """클라이언트 버전에 관계없이 컬렉션 이름 목록 반환 (구버전은 Collection 객체, 신버전은 이름 반환)"""
+    return [col if isinstance(col, str) else col.name for col in client.list_collections()]
+
+def _hash_text(text: str) -> str:
+    """문자열의 sha256 지문 반환"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def compute_file_fingerprint(file_path: str) -> str:
+    """
+    [파일 지문 계산]
+    - 입력: file_path (원본 문서 경로)
+    - 출력: 파일 내용의 sha256 hex 문자열
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def compute_row_fingerprint(row: Dict[str, Any]) -> str:
+    """
+    [DB 행 지문 계산]
+    - 입력: row (get_all_patterns/get_all_widgets 결과 한 행)
+    - 출력: 행 내용의 sha256 hex 문자열
+    """
+    return _hash_text(json.dumps(row, sort_keys=True, ensure_ascii=False, default=str))
+
+def _collection_config_fingerprint(item: Dict[str, Any]) -> str:
+    """컬렉션 설정(임베딩 모델, HNSW 파라미터 등) 지문 - 값이 바뀌면 컬렉션을 새로 만들어야 함"""
+    settings = {k: v for k, v in item.items() if k != "path"}
+    return _hash_text(json.dumps(settings, sort_keys=True, default=str))
+
+def _manifest_path() -> str:
+    return os.path.join(config.RAG_CHROMA_DIR, MANIFEST_FILE_NAME)
+
+def load_collection_manifest() -> Dict[str, Any]:
+    """컬렉션별 소스 지문 기록 로드 (없거나 손상된 경우 빈 dict)"""
+    path = _manifest_path()
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"[CHROMA] 지문 기록 파일을 읽을 수 없어 전체 재생성합니다: {str(e)}")
+        return {}
+
+def save_collection_manifest(manifest: Dict[str, Any]) -> None:
+    """컬렉션별 소스 지문 기록 저장 (임시 파일 작성 후 교체, alias는 항상 현재 값으로 기록)"""
+    manifest[ALIASES_KEY] = collection_aliases.snapshot()
+    os.makedirs(config.RAG_CHROMA_DIR, exist_ok=True)
+    path = _manifest_path()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def _build_collection_metadata(item: Dict[str, Any], default_ef: int, default_m: int, default_threshold: float) -> Dict[str, Any]:
+    """config 항목으로부터 컬렉션 metadata 구성"""
+    return {
+        "hnsw:space": item.get("hnsw:space", "cosine"),
+        "hnsw:construction_ef": item.get("hnsw:construction_ef", default_ef),
+        "hnsw:search_ef": item.get("hnsw:search_ef", default_ef),
+        "hnsw:M": item.get("hnsw:M", default_m),
+        "embedding_model": item["embedding_model"],
+        "type": item["type"],
+        "parser": item["parser"],
+        "search_top_k": item["search_top_k"],
+        "similarity_threshold": item.get("similarity_threshold", default_threshold)
+    }
+
+def _can_reuse_collection(collection_name: str, manifest_entry: Dict[str, Any], config_fingerprint: str) -> bool:
+    """영구 저장 모드에서 기존 컬렉션을 그대로 재사용할 수 있는지 여부"""
+    return (
+        config.CHROMA_PERSISTENT
+        and manifest_entry.get("config_fingerprint") == config_fingerprint
+        and collection_aliases.resolve(collection_name) in _list_collection_names()
+    )
+
+class CollectionAliases:
+    """
+    [논리 컬렉션 이름 -> 실제(버전) 컬렉션 이름]
+    - 재생성은 "{이름}__v{N}" 새 컬렉션에 만든 뒤 검증이 끝나면 alias만 교체 (검색은 만들고 있는 컬렉션을 보지 않음)
+    - 직전 버전은 previous로 남겨 rollback() 가능, 그보다 오래된 버전은 교체 시 삭제
+    - manifest의 '_aliases'에 저장 ({이름: {'current': 실제 이름, 'previous': 실제 이름 또는 None, 'version': N}})
+    - alias가 없으면 논리 이름 그대로 사용 (버전 도입 전 컬렉션)
+    """
+
+    def __init__(self):
+        self._aliases: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.RLock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._aliases is None:
+            self._aliases = dict(load_collection_manifest().get(ALIASES_KEY, {}))
+        return self._aliases
+
+    def reload(self) -> None:
+        """manifest에서 alias 다시 읽기 (다른 프로세스가 교체한 버전 반영)"""
+        with self._lock:
+            self._aliases = None
+            self._load()
+
+    def resolve(self, name: str) -> str:
+        """현재 검색에 사용할 실제 컬렉션 이름"""
+        with self._lock:
+            alias = self._load().get(name)
+            return alias['current'] if alias else name
+
+    def next_name(self, name: str) -> str:
+        """새로 만들 버전 컬렉션 이름"""
+        with self._lock:
+            alias = self._load().get(name)
+            return f"{name}{VERSION_SEPARATOR}{(alias['version'] if alias else 0) + 1}"
+
+    def swap(self, name: str, physical_name: str) -> Optional[str]:
+        """
+        alias를 새 버전으로 교체 (현재 버전은 previous로 보관)
+        - 출력: 더 이상 참조되지 않는 이전 previous 컬렉션 이름 (호출자가 삭제)
+        """
+        version = int(physical_name.rsplit(VERSION_SEPARATOR, 1)[1])
+        with self._lock:
+            aliases = self._load()
+            alias = aliases.get(name)
+            current = alias['current'] if alias else name
+            retired = alias.get('previous') if alias else None
+            aliases[name] = {'current': physical_name, 'previous': current, 'version': version}
+        return retired if retired not in (current, physical_name) else None
+
+    def rollback(self, name: str) -> Optional[str]:
+        """current와 previous 교체 - 교체 후 current 반환 (previous가 없으면 None)"""
+        with self._lock:
+            alias = self._load().get(name)
+            if not alias or not alias.get('previous'):
+                return None
+            alias['current'], alias['previous'] = alias['previous'], alias['current']
+            return alias['current']
+
+    def logical_name(self, physical_name: str) -> str:
+        """실제 컬렉션 이름의 논리 이름 (버전 접미사 제거)"""
+        base, separator, version = physical_name.rpartition(VERSION_SEPARATOR)
+        return base if separator and version.isdigit() else physical_name
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: dict(alias) for name, alias in self._load().items()}
+
+# 전역 컬렉션 alias
+collection_aliases = CollectionAliases()
+
+# 프로세스 내 빌드 잠금 (파일 잠금과 함께 사용)
+_build_lock = threading.Lock()
+
+@contextmanager
+def collection_build_lock():
+    """
+    [컬렉션 빌드 잠금]
+    - 재사용 판단 -> 새 버전 생성 -> 검증 -> 공개 구간을 프로세스 간 파일 잠금(fcntl.flock)으로 직렬화
+      (여러 워커가 같은 "__vN"을 골라 다른 워커가 공개한 버전을 지우는 것 방지)
+    - 잠금을 얻은 뒤 다른 프로세스가 기록한 alias를 manifest에서 다시 읽음
+    """
+    os.makedirs(config.RAG_CHROMA_DIR, exist_ok=True)
+    with _build_lock, open(os.path.join(config.RAG_CHROMA_DIR, BUILD_LOCK_FILE_NAME), 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            collection_aliases.reload()
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def get_live_collection(collection_name: str):
+    """논리 이름으로 현재 버전 컬렉션 핸들 반환"""
+    return client.get_collection(collection_aliases.resolve(collection_name))
+
+def create_collection_version(collection_name: str, metadata: Dict[str, Any]):
+    """
+    새 버전 컬렉션 생성 (검색 중인 현재 버전은 건드리지 않음, collection_build_lock 안에서 호출)
+    - 출력: (실제 컬렉션 이름, 컬렉션) - 채운 뒤 publish_collection_version으로 공개
+    """
+    physical_name = collection_aliases.next_name(collection_name)
+    if physical_name in _list_collection_names():
+        # 이전에 실패한 빌드가 남긴 컬렉션
+        client.delete_collection(physical_name)
+    collection = client.create_collection(name=physical_name, metadata=metadata)
+    logger.info(f"[CHROMA] 새 버전 컬렉션 생성됨: {physical_name} (metadata: {metadata})")
+    return physical_name, collection
+
+def discard_collection_version(physical_name: str) -> None:
+    """공개하지 않은 새 버전 컬렉션 삭제 (빌드/검증 실패 시)"""
+    try:
+        client.delete_collection(physical_name)
+        logger.warning(f"[CHROMA] 새 버전 컬렉션 폐기: {physical_name}")
+    except Exception as e:
+        logger.warning(f"[CHROMA] 새 버전 컬렉션 폐기 실패: {physical_name} - {str(e)}")
+
+def check_collection_version(collection, expected_count: int, embedding_model: str) -> None:
+    """
+    [새 버전 컬렉션 검증]
+    - 문서 수가 기대값과 같은지 확인 (기대값이 0이면 빈 컬렉션이므로 실패)
+    - 고르게 고른 문서(최대 config.COLLECTION_SANITY_QUERIES개)의 본문으로 검색해 1위가 같은 본문인지 확인
+      (인덱스/임베딩 이상 감지)
+    - 본문 임베딩은 쿼리 캐시를 거치지 않는 embed_documents_array 사용 (사용자 쿼리 LRU를 문서 본문으로 채우지 않음)
+    - 실패 시 ValueError
+    """
+    if expected_count <= 0:
+        raise ValueError("검증할 문서가 없음 (빈 컬렉션은 공개하지 않음)")
+    count = collection.count()
+    if count != expected_count:
+        raise ValueError(f"문서 수 불일치: {count} != {expected_count}")
+    sample_count = min(config.COLLECTION_SANITY_QUERIES, count)
+    embeddings = get_hf_embedding(embedding_model)
+    for i in range(sample_count):
+        sample = collection.get(offset=i * count // sample_count, limit=1, include=["documents"])
+        doc_id, text = sample["ids"][0], sample["documents"][0]
+        result = collection.query(
+            query_embeddings=[embeddings.embed_documents_array([text])[0].tolist()],
+            n_results=1,
+            include=["documents"]
+        )
+        top_ids = (result.get("ids") or [[]])[0]
+        top_documents = (result.get("documents") or [[]])[0]
+        if not top_ids or (top_ids[0] != doc_id and top_documents[0] != text):
+            raise ValueError(f"검증 검색 실패: {doc_id} -> {top_ids[:1]}")
+
+def publish_collection_version(collection_name: str, physical_name: str) -> None:
+    """
+    새 버전 공개 (alias 교체 -> 레지스트리 갱신 -> 오래된 버전 삭제)
+    - 교체 전까지 검색은 기존 버전을 사용하고, 직전 버전은 rollback용으로 유지
+    """
+    retired = collection_aliases.swap(collection_name, physical_name)
+    save_collection_manifest(load_collection_manifest())
+    collection_registry.refresh(collection_name)
+    logger.info(f"[CHROMA] 컬렉션 교체: {collection_name} -> {physical_name}")
+    if retired and retired in _list_collection_names():
+        client.delete_collection(retired)
+        logger.info(f"[CHROMA] 오래된 버전 컬렉션 삭제됨: {retired}")
+
+def rollback_collection(collection_name: str) -> Optional[str]:
+    """
+    직전 버전으로 되돌림 (현재 버전은 previous로 남아 다시 되돌릴 수 있음)
+    - 출력: 되돌린 실제 컬렉션 이름 (직전 버전이 없으면 None)
+    """
+    with collection_build_lock():
+        physical_name = collection_aliases.rollback(collection_name)
+        if physical_name is None:
+            logger.warning(f"[CHROMA] 되돌릴 이전 버전이 없습니다: {collection_name}")
+            return None
+        save_collection_manifest(load_collection_manifest())
+    collection_registry.refresh(collection_name)
+    logger.info(f"[CHROMA] 컬렉션 되돌림: {collection_name} -> {physical_name}")
+    return physical_name
+
+class CollectionEntry:
+    """검색에 필요한 컬렉션 정보 (핸들, 임계값, 임베딩 모델, 문서 수)"""
+
+    def __init__(self, name: str, collection, version: int):
+        metadata = collection.metadata or {}
+        self.name = name
+        self.physical_name = collection.name
+        self.collection = collection
+        self.embedding_model = metadata.get('embedding_model')
+        self.similarity_threshold = float(metadata.get('similarity_threshold', 0.7))
+        self.search_top_k = int(metadata.get('search_top_k', 5))
+        self.dimension = int(metadata.get('hnsw:dimension', 384))
+        self.count = collection.count()
+        self.version = version
+
+class CollectionRegistry:
+    """
+    컬렉션 핸들/메타데이터 레지스트리
+    - list_collections/get_collection/count 조회를 검색마다 하지 않고 한 번만 수행
+    - 인덱스를 다시 만들거나 문서를 추가/삭제한 뒤 refresh()로 갱신
+    - version은 refresh될 때마다 증가 (컬렉션 변경 감지용)
+    - 논리 이름으로 관리하며 실제 컬렉션은 collection_aliases의 현재 버전
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Optional[CollectionEntry]] = {}
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[CollectionEntry]:
+        """컬렉션 정보 반환 (처음 조회 시에만 클라이언트에서 읽어옴)"""
+        if name in self._entries:
+            return self._entries[name]
+        return self.refresh(name)
+
+    def refresh(self, name: Optional[str] = None) -> Optional[CollectionEntry]:
+        """
+        컬렉션 정보 갱신
+        - name 지정 시 해당 컬렉션만, 생략 시 알려진/존재하는 모든 컬렉션 갱신
+        """
+        with self._lock:
+            available = _list_collection_names()
+            logical_names = [collection_aliases.logical_name(physical) for physical in available]
+            names = [name] if name else list(dict.fromkeys([*self._entries, *logical_names]))
+            for collection_name in names:
+                version = self._versions.get(collection_name, 0) + 1
+                self._versions[collection_name] = version
+                physical_name = collection_aliases.resolve(collection_name)
+                if physical_name in available:
+                    entry = CollectionEntry(collection_name, client.get_collection(physical_name), version)
+                    logger.info(f"[CHROMA] 레지스트리 갱신: {collection_name} -> {physical_name} (v{version}, 문서 수: {entry.count}, 모델: {entry.embedding_model})")
+                else:
+                    entry = None
+                    logger.warning(f"[CHROMA] 레지스트리 갱신: 컬렉션 없음 - {collection_name}")
+                self._entries[collection_name] = entry
+            return self._entries.get(name) if name else None
+
+    def version(self, name: str) -> int:
+        """컬렉션 버전 반환 (한 번도 조회되지 않았으면 0)"""
+        return self._versions.get(name, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """레지스트리 상태 반환"""
+        return {
+            name: {
+                'version': self._versions.get(name, 0),
+                'collection': entry.physical_name if entry else None,
+                'count': entry.count if entry else None
+            }
+            for name, entry in self._entries.items()
+        }
+
+# 전역 컬렉션 레지스트리
+collection_registry = CollectionRegistry()
+
 def initialize_collections():
     """모든 컬렉션 초기화 (DB -> RAG 순서)"""
     try:
@@ -70,71 +433,315 @@ def initialize_rag_collections():
     """
     config.RAG_CHROMA_COLLECTIONS 기반으로 여러 문서/이미지/컬렉션을 일괄 초기화
     - glob 패턴이 path에 들어오면 모든 파일을 반복 처리
+    - 영구 저장 모드에서는 파일 지문(sha256)이 바뀐 파일만 다시 임베딩
+    - 변경된 파일은 IngestionPipeline으로 적재 (프로세스 풀 파싱 -> 배치 임베딩/저장)
     """
     for item in config.RAG_CHROMA_COLLECTIONS:
-        print(f"\n[초기화] {item['collection']} ({item['type']}) - {item['path']}")
-        docs = []
+        collection_name = item["collection"]
+        print(f"\n[초기화] {collection_name} ({item['type']}) - {item['path']}")
         
         # 1. 파일 목록 수집
+        file_paths = []
         if item["type"] in ["file", "docx", "pdf", "txt"]:
             if "*" in item["path"]:
                 # glob 패턴으로 여러 파일 처리
-                for file_path in glob.glob(item["path"]):
-                    print(f"[파일] {file_path}")
-                    docs.extend(load_documents(file_path))
+                file_paths = sorted(glob.glob(item["path"]))
             else:
                 # 단일 파일 처리
-                print(f"[파일] {item['path']}")
-                docs.extend(load_documents(item["path"]))
+                file_paths = [item["path"]]
+        file_paths = [path for path in file_paths if os.path.exists(path)]
         
-        if not docs:
-            logger.warning(f"{item['collection']}에 변환할 문서가 없습니다.")
+        if not file_paths:
+            logger.warning(f"{collection_name}에 변환할 문서가 없습니다.")
             continue
-            
+        
         try:
-            # 2. 임베딩 모델 초기화
-            embeddings = get_hf_embedding(item["embedding_model"])
-            
-            # 3. 컬렉션 생성 또는 가져오기
-            if item["collection"] not in client.list_collections():
-                collection = client.create_collection(
-                    name=item["collection"],
-                    metadata={
-                        "hnsw:space": item.get("hnsw:space", "cosine"),
-                        "hnsw:construction_ef": item.get("hnsw:construction_ef", 200),
-                        "hnsw:search_ef": item.get("hnsw:search_ef", 200),
-                        "hnsw:M": item.get("hnsw:M", 32),
-                        "embedding_model": item["embedding_model"],
-                        "type": item["type"],
-                        "parser": item["parser"],
-                        "search_top_k": item["search_top_k"],
-                        "similarity_threshold": item.get("similarity_threshold", 0.6)
-                    }
-                )
-            else:
-                collection = client.get_collection(item["collection"])
-            
-            # 4. 문서 임베딩 생성 및 저장
-            texts = [doc.page_content for doc in docs]
-            metadatas = [doc.metadata for doc in docs]
-            embeddings_list = get_openai_embeddings().embed_documents(texts)
-            
-            # 5. 컬렉션에 추가
-            collection.add(
-                documents=texts,
-                embeddings=embeddings_list,
-                metadatas=metadatas,
-                ids=[str(i) for i in range(len(docs))]
+            # 2. 컬렉션 재사용 여부 판단 (설정 또는 적재 방식이 바뀌었으면 새 버전 컬렉션에 적재)
+            #    잠금 안에서 manifest를 다시 읽어 다른 워커가 먼저 적재/공개한 결과 반영
+            with collection_build_lock():
+                manifest = load_collection_manifest()
+                entry = manifest.get(collection_name, {})
+                config_fingerprint = _collection_config_fingerprint(item)
+                new_version = None
+                if (_can_reuse_collection(collection_name, entry, config_fingerprint)
+                        and entry.get("ingestion_version") == RAG_INGESTION_VERSION):
+                    collection = get_live_collection(collection_name)
+                    stored_files = entry.get("files", {})
+                else:
+                    new_version, collection = create_collection_version(
+                        collection_name,
+                        _build_collection_metadata(item, default_ef=200, default_m=32, default_threshold=0.6)
+                    )
+                    stored_files = {}
+                
+                # 3. 더 이상 존재하지 않는 파일의 청크 제거
+                for removed_path in set(stored_files) - set(file_paths):
+                    collection.delete(where={"source": removed_path})
+                    logger.info(f"[CHROMA] 삭제된 파일의 청크 제거: {removed_path}")
+                
+                current_files = {}
+                changed_files = []
+                for file_path in file_paths:
+                    fingerprint = compute_file_fingerprint(file_path)
+                    if stored_files.get(file_path) == fingerprint:
+                        print(f"[파일] {file_path} (변경 없음, 건너뜀)")
+                        current_files[file_path] = fingerprint
+                        continue
+                    
+                    print(f"[파일] {file_path}")
+                    changed_files.append((file_path, fingerprint))
+                
+                # 4. 변경된 파일 적재 (경로 해시 + 파일 지문 기반 ID로 파일 간 충돌 방지, 적재 완료된 파일만 지문 기록)
+                #    새 지문 ID로 적재를 마친 뒤에 이전 청크를 지우므로 재적재 중에도 기존 청크로 검색 가능
+                #    적재 실패/빈 결과면 이전 청크와 지문을 유지 (다음 기동 시 다시 시도)
+                try:
+                    progress = IngestionPipeline(collection, item["embedding_model"]).run(changed_files)
+                    for file_path, file_progress in progress.items():
+                        if file_progress.status == 'done':
+                            current_files[file_path] = file_progress.fingerprint
+                            if file_path in stored_files:
+                                _delete_stale_chunks(collection, file_path, file_progress.id_prefix)
+                            print(f"✓ {collection_name}에 {file_progress.chunks}개 문서 임베딩 저장 완료. ({file_path})")
+                        elif file_path in stored_files:
+                            current_files[file_path] = stored_files[file_path]
+                            logger.warning(f"[CHROMA] {file_path} 재적재 실패({file_progress.status}), 이전 청크 유지")
+                    
+                    # 5. 새 버전이면 모든 파일 적재 및 검증 검색 확인 후 공개 (실패 시 기존 버전 유지)
+                    #    파싱 오류도 빈 결과로 돌아오므로, 이전에 청크가 있던 파일이 비면 실패로 간주
+                    if new_version:
+                        failed = [path for path, p in progress.items() if p.status not in ('done', 'empty')]
+                        if failed:
+                            raise ValueError(f"적재 실패 파일: {failed}")
+                        emptied = [path for path, p in progress.items()
+                                   if p.status == 'empty' and path in entry.get("files", {})]
+                        if emptied:
+                            raise ValueError(f"이전에 청크가 있던 파일에서 청크를 얻지 못함: {emptied}")
+                        check_collection_version(
+                            collection,
+                            sum(p.embedded for p in progress.values()),
+                            item["embedding_model"]
+                        )
+                except Exception:
+                    if new_version:
+                        discard_collection_version(new_version)
+                    raise
+                
+                manifest[collection_name] = {
+                    "config_fingerprint": config_fingerprint,
+                    "ingestion_version": RAG_INGESTION_VERSION,
+                    "files": current_files,
+                    "updated_at": datetime.now().isoformat()
+                }
+                if new_version:
+                    publish_collection_version(collection_name, new_version)
+                save_collection_manifest(manifest)
+                collection_registry.refresh(collection_name)
+        
+        except Exception as e:
+            logger.error(f"[CHROMA] {collection_name} 처리 중 오류 발생: {str(e)}")
+            continue
+
+def _delete_stale_chunks(collection, file_path: str, id_prefix: str) -> None:
+    """파일의 청크 중 현재 ID 접두사(경로 해시 + 파일 지문)가 아닌 이전 지문의 청크 삭제"""
+    stored = collection.get(where={"source": file_path}, include=[])
+    stale_ids = [doc_id for doc_id in stored.get("ids") or [] if not doc_id.startswith(f"{id_prefix}-")]
+    if stale_ids:
+        collection.delete(ids=stale_ids)
+        logger.info(f"[CHROMA] 변경된 파일의 이전 청크 제거: {file_path} ({len(stale_ids)}개)")
+
+def _stable_document_id(doc_type: str, metadata: Dict[str, Any], row_hash: str) -> str:
+    """
+    [DB 문서 고정 ID]
+    - "{type}-{원본 ID}-{행 지문 앞 16자}" (예: pattern-12-3f2a...)
+    - 조회 순서와 무관하고, 행 내용이 바뀌면 ID도 바뀌므로 ID 비교만으로 변경 행을 찾을 수 있음
+    """
+    source_id = metadata.get(f"{doc_type}_id")
+    if source_id is None:
+        return f"{doc_type}-{row_hash[:16]}"
+    return f"{doc_type}-{source_id}-{row_hash[:16]}"
+
+def _load_db_documents(item: Dict[str, Any]) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
+    """
+    DB 컬렉션 원본 행을 문서로 변환
+    - 출력: (고정 ID 목록, 본문 목록, metadata 목록) - 같은 ID가 여러 번 나오면 첫 행만 사용
+    """
+    get_all_func = get_func_from_str(item["get_all_func"])
+    to_doc_func = get_func_from_str(item["to_doc_func"])
+    
+    ids, texts, metadatas = [], [], []
+    seen = set()
+    for row in get_all_func():
+        doc = to_doc_func(row)
+        
+        # 문서 내용 검증
+        if not doc.page_content or len(doc.page_content.strip()) == 0:
+            logger.warning(f"[CHROMA] 빈 문서 내용 발견, 건너뜀")
+            continue
+        
+        # metadata 필터링 (None 값 제거) 및 행 지문 기록
+        row_hash = compute_row_fingerprint(row)
+        metadata = {k: v for k, v in doc.metadata.items() if v is not None}
+        metadata["row_hash"] = row_hash
+        doc_id = _stable_document_id(item["type"], metadata, row_hash)
+        if doc_id in seen:
+            continue
+        seen.add(doc_id)
+        ids.append(doc_id)
+        texts.append(doc.page_content)
+        metadatas.append(metadata)
+    return ids, texts, metadatas
+
+def _embed_for_collection(embedding_model: str, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    문서 임베딩 생성 및 검증
+    - 출력: (임베딩 행렬, 유효한 행 위치) - NaN/Inf가 포함된 행은 제외
+    """
+    embedding_matrix = get_hf_embedding(embedding_model).embed_documents_array(texts)
+    if len(embedding_matrix) != len(texts):
+        raise ValueError("임베딩 생성 실패: 빈 임베딩 리스트")
+    
+    # 임베딩 차원 체크
+    embedding_dim = embedding_matrix.shape[1]
+    if embedding_dim != 384:  # KR-SBERT-V40K-klueNLI-augSTS 모델의 차원
+        raise ValueError(f"임베딩 차원 불일치: {embedding_dim} != 384")
+    
+    # 임베딩 값 체크 (NaN/Inf 포함 행 제외, 행렬 단위 검사)
+    finite_mask = np.isfinite(embedding_matrix).all(axis=1)
+    if not finite_mask.all():
+        logger.warning(f"[CHROMA] nan/inf 값이 포함된 임베딩 {int((~finite_mask).sum())}개 건너뜀")
+    return embedding_matrix, np.flatnonzero(finite_mask)
+
+def sync_db_collection(item: Dict[str, Any], force: bool = False) -> Dict[str, Any]:
+    """
+    [DB 컬렉션 동기화]
+    - 원본 행을 고정 ID(원본 ID + 행 지문)로 변환해 저장된 ID와 비교
+    - 새로 생기거나 바뀐 행만 임베딩 후 upsert, 그 다음 사라지거나 바뀐 행의 이전 문서 delete (배치 단위)
+      (ID에 행 지문이 포함되어 새/이전 문서 ID가 다르므로, 먼저 upsert하면 수정 중인 행이 검색에서 빠지지 않음)
+    - 설정이 바뀌었거나 영구 저장 모드가 아니면 새 버전 컬렉션에 전체 upsert 후 검증 검색을 거쳐 공개
+      (검색은 공개 전까지 기존 버전을 사용, 검증 실패 시 새 버전 폐기)
+    - force: 소스 지문이 같아도 저장된 ID와 비교 (컬렉션이 어긋났는지 검증할 때 사용)
+    - manifest 로드 ~ 소스 지문 기록/저장까지 collection_build_lock 안에서 수행 (다른 워커의 기록을 덮어쓰지 않음)
+    - 출력: {'upserted': n, 'deleted': n, 'total': n, 'upserted_ids': [...], 'deleted_ids': [...], 'failed_ids': [...],
+             'failed_reasons': {문서 ID: 실패 사유}}
+      (failed_ids: 임베딩이 유효하지 않아 저장하지 못한 문서)
+    """
+    collection_name = item["collection"]
+    ids, texts, metadatas = _load_db_documents(item)
+    
+    config_fingerprint = _collection_config_fingerprint(item)
+    source_fingerprint = _hash_text(config_fingerprint + "".join(sorted(ids)))
+    
+    # 재사용 판단 ~ 지문 기록은 프로세스 간 빌드 잠금 안에서 (다른 워커가 기록한 manifest/alias를 다시 읽은 뒤 판단)
+    with collection_build_lock():
+        # 1. 소스 지문 비교 (설정 지문 + 정렬된 문서 ID)
+        manifest = load_collection_manifest()
+        entry = manifest.get(collection_name, {})
+        can_reuse = _can_reuse_collection(collection_name, entry, config_fingerprint)
+        
+        if not force and can_reuse and entry.get("fingerprint") == source_fingerprint:
+            logger.info(f"[CHROMA] 변경 없음, 기존 컬렉션 재사용: {collection_name} ({len(ids)}개 문서)")
+            return {'upserted': 0, 'deleted': 0, 'total': len(ids), 'upserted_ids': [], 'deleted_ids': [], 'failed_ids': [],
+                    'failed_reasons': {}}
+        
+        # 2. 저장된 ID와 비교 (재사용 불가하면 새 버전 컬렉션)
+        new_version = None
+        if can_reuse:
+            collection = get_live_collection(collection_name)
+            stored_ids = set(collection.get(include=[]).get("ids") or [])
+        else:
+            new_version, collection = create_collection_version(
+                collection_name,
+                _build_collection_metadata(item, default_ef=100, default_m=16, default_threshold=0.8)  # DB 컬렉션은 더 높은 임계값 사용
             )
+            stored_ids = set()
+        current_ids = set(ids)
+        to_delete = sorted(stored_ids - current_ids)
+        pending = [i for i, doc_id in enumerate(ids) if doc_id not in stored_ids]
+        batch_size = config.CHROMA_SYNC_BATCH_SIZE
+        if not ids:
+            logger.warning(f"[CHROMA] 추가할 문서 없음: {collection_name}")
+        
+        # chatbot_collection인 경우 추가 문서 내용 로깅
+        if collection_name == "chatbot_collection":
+            for i in pending:
+                logger.info(f"[CHROMA] 추가 문서: pattern_id={metadatas[i].get('pattern_id')}, "
+                          f"pattern={texts[i][:100]}..., "
+                          f"domain={metadatas[i].get('domain')}, "
+                          f"category={metadatas[i].get('category')}, "
+                          f"threshold={metadatas[i].get('similarity_threshold')}")
+        
+        try:
+            # 3. 새로 생기거나 바뀐 행만 임베딩 후 upsert
+            upserted_ids = []
+            failed_ids = []
+            failed_reasons = {}
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start:start + batch_size]
+                embedding_matrix, keep = _embed_for_collection(item["embedding_model"], [texts[i] for i in batch])
+                kept = set(keep.tolist())
+                rejected = [ids[batch[i]] for i in range(len(batch)) if i not in kept]
+                failed_ids.extend(rejected)
+                failed_reasons.update((doc_id, '임베딩에 NaN/Inf 값 포함') for doc_id in rejected)
+                if len(keep) == 0:
+                    continue
+                batch_ids = [ids[batch[i]] for i in keep]
+                collection.upsert(
+                    ids=batch_ids,
+                    documents=[texts[batch[i]] for i in keep],
+                    embeddings=embedding_matrix[keep].tolist(),
+                    metadatas=[metadatas[batch[i]] for i in keep]
+                )
+                upserted_ids.extend(batch_ids)
+            upserted = len(upserted_ids)
+            if pending and upserted == 0:
+                raise ValueError("모든 임베딩이 유효하지 않음")
             
-            print(f"✓ {item['collection']}에 {len(docs)}개 문서 임베딩 저장 완료.")
+            # 4. 사라지거나 바뀐 행의 이전 문서 삭제 (새 문서 upsert 이후)
+            #    새 문서 임베딩에 실패한 원본 행은 이전 문서를 남겨 검색에서 빠지지 않게 함 (다음 동기화 때 다시 시도)
+            if failed_ids:
+                failed_sources = {doc_id.rsplit('-', 1)[0] for doc_id in failed_ids if doc_id.count('-') == 2}
+                to_delete = [doc_id for doc_id in to_delete
+                             if doc_id.count('-') != 2 or doc_id.rsplit('-', 1)[0] not in failed_sources]
+            for start in range(0, len(to_delete), batch_size):
+                collection.delete(ids=to_delete[start:start + batch_size])
             
-        except Exception as e:
-            logger.error(f"[CHROMA] {item['collection']} 처리 중 오류 발생: {str(e)}")
-            continue
+            # 5. 새 버전이면 검증 검색 (실패 시 새 버전 폐기, 기존 버전 유지)
+            if new_version:
+                check_collection_version(collection, upserted, item["embedding_model"])
+        except Exception:
+            if new_version:
+                discard_collection_version(new_version)
+            raise
+        if new_version:
+            publish_collection_version(collection_name, new_version)
+        
+        # 6. 소스 지문 기록 (저장하지 못한 문서는 제외 - 다음 동기화 때 지문이 달라 다시 시도)
+        if failed_ids:
+            failed = set(failed_ids)
+            source_fingerprint = _hash_text(config_fingerprint + "".join(sorted(doc_id for doc_id in ids if doc_id not in failed)))
+        manifest[collection_name] = {
+            "config_fingerprint": config_fingerprint,
+            "fingerprint": source_fingerprint,
+            "row_count": len(ids),
+            "updated_at": datetime.now().isoformat()
+        }
+        save_collection_manifest(manifest)
+    logger.info(f"[CHROMA] 동기화 완료: {collection_name} (upsert {upserted}개, delete {len(to_delete)}개, 전체 {len(ids)}개)")
+    return {
+        'upserted': upserted,
+        'deleted': len(to_delete),
+        'total': len(ids),
+        'upserted_ids': upserted_ids,
+        'deleted_ids': to_delete,
+        'failed_ids': failed_ids,
+        'failed_reasons': failed_reasons
+    }
 
 def initialize_db_collections():
-    """DB 컬렉션 초기화"""
+    """
+    DB 컬렉션 초기화
+    - 영구 저장 모드에서는 저장된 컬렉션과 비교해 바뀐 행만 delete/upsert (sync_db_collection)
+    """
     try:
         # 컬렉션 설정 로드
         collections = config.DB_CHROMA_COLLECTIONS
@@ -145,117 +752,8 @@ def initialize_db_collections():
             logger.info(f"[CHROMA] 컬렉션 초기화 시작: {collection_name}")
             
             try:
-                # 1. 기존 컬렉션 삭제
-                if collection_name in client.list_collections():
-                    client.delete_collection(collection_name)
-                    logger.info(f"[CHROMA] 기존 컬렉션 삭제됨: {collection_name}")
-                
-                # 2. 새 컬렉션 생성
-                metadata = {
-                    "hnsw:space": item.get("hnsw:space", "cosine"),
-                    "hnsw:construction_ef": item.get("hnsw:construction_ef", 100),
-                    "hnsw:search_ef": item.get("hnsw:search_ef", 100),
-                    "hnsw:M": item.get("hnsw:M", 16),
-                    "embedding_model": item["embedding_model"],
-                    "type": item["type"],
-                    "parser": item["parser"],
-                    "search_top_k": item["search_top_k"],
-                    "similarity_threshold": item.get("similarity_threshold", 0.8)  # DB 컬렉션은 더 높은 임계값 사용
-                }
-                
-                collection = client.create_collection(
-                    name=collection_name,
-                    metadata=metadata
-                )
-                logger.info(f"[CHROMA] 새 컬렉션 생성됨: {collection_name} (metadata: {metadata})")
-                
-                # 3. 데이터 로드 함수 가져오기
-                get_all_func = get_func_from_str(item["get_all_func"])
-                to_doc_func = get_func_from_str(item["to_doc_func"])
-                
-                # 4. 데이터 로드 및 변환
-                raw_docs = get_all_func()
-                documents = [to_doc_func(doc) for doc in raw_docs]
-                
-                # 5. 데이터가 있으면 컬렉션 업데이트
-                if documents:
-                    # metadata에서 None 값 제거
-                    filtered_metadatas = []
-                    valid_docs = []
-                    valid_texts = []
-                    
-                    for doc in documents:
-                        # 5-1. 문서 내용 검증
-                        if not doc.page_content or len(doc.page_content.strip()) == 0:
-                            logger.warning(f"[CHROMA] 빈 문서 내용 발견, 건너뜀")
-                            continue
-                            
-                        # 5-2. metadata 필터링
-                        metadata = {k: v for k, v in doc.metadata.items() if v is not None}
-                        filtered_metadatas.append(metadata)
-                        valid_docs.append(doc)
-                        valid_texts.append(doc.page_content)
-                        
-                        # 5-3. chatbot_collection인 경우 문서 내용 로깅
-                        if collection_name == "chatbot_collection":
-                            logger.info(f"[CHROMA] 추가 문서: pattern_id={metadata.get('pattern_id')}, "
-                                      f"pattern={doc.page_content[:100]}..., "
-                                      f"domain={metadata.get('domain')}, "
-                                      f"category={metadata.get('category')}, "
-                                      f"threshold={metadata.get('similarity_threshold')}")
-                    
-                    if not valid_docs:
-                        logger.warning(f"[CHROMA] 유효한 문서가 없습니다: {collection_name}")
-                        continue
-                    
-                    try:
-                        # 6. 임베딩 모델 초기화
-                        embeddings = get_hf_embedding(item["embedding_model"])
-                        
-                        # 7. 문서 임베딩 생성
-                        embeddings_list = embeddings.embed_documents(valid_texts)
-                        
-                        # 7-1. 임베딩 정상 여부 체크
-                        if not embeddings_list or len(embeddings_list) == 0:
-                            raise ValueError("임베딩 생성 실패: 빈 임베딩 리스트")
-                            
-                        # 7-2. 임베딩 차원 체크
-                        embedding_dim = len(embeddings_list[0])
-                        if embedding_dim != 384:  # KR-SBERT-V40K-klueNLI-augSTS 모델의 차원
-                            raise ValueError(f"임베딩 차원 불일치: {embedding_dim} != 384")
-                            
-                        # 7-3. 임베딩 값 체크 및 NaN/Inf 처리
-                        valid_embeddings = []
-                        valid_metadatas = []
-                        valid_texts_filtered = []
-                        
-                        for i, (emb, meta, text) in enumerate(zip(embeddings_list, filtered_metadatas, valid_texts)):
-                            if any(np.isnan(x) for x in emb) or any(np.isinf(x) for x in emb):
-                                logger.warning(f"[CHROMA] 문서 {i}의 임베딩에 nan/inf 값 포함, 건너뜀")
-                                continue
-                            valid_embeddings.append(emb)
-                            valid_metadatas.append(meta)
-                            valid_texts_filtered.append(text)
-                        
-                        if not valid_embeddings:
-                            raise ValueError("모든 임베딩이 유효하지 않음")
-                        
-                        logger.info(f"[CHROMA] 임베딩 생성 완료: {len(valid_embeddings)}개 문서, 차원={embedding_dim}")
-                        
-                        # 8. 새 데이터 추가 (임베딩 포함)
-                        collection.add(
-                            documents=valid_texts_filtered,
-                            embeddings=valid_embeddings,
-                            metadatas=valid_metadatas,
-                            ids=[str(i) for i in range(len(valid_embeddings))]
-                        )
-                        logger.info(f"[CHROMA] {len(valid_embeddings)}개 문서 추가됨: {collection_name}")
-                        
-                    except Exception as e:
-                        logger.error(f"[CHROMA] 임베딩 생성/저장 중 오류 발생: {str(e)}")
-                        raise
-                else:
-                    logger.warning(f"[CHROMA] 추가할 문서 없음: {collection_name}")
+                sync_db_collection(item)
+                collection_registry.refresh(collection_name)
                     
             except Exception as e:
                 logger.error(f"[CHROMA] 컬렉션 {collection_name} 처리 중 오류 발생: {str(e)}")
@@ -267,6 +765,139 @@ def initialize_db_collections():
         logger.error(f"[CHROMA] 컬렉션 초기화 중 오류 발생: {str(e)}")
         raise
 
+def _get_searchable_collection(collection_name: str) -> Optional[CollectionEntry]:
+    """
+    검색 가능한 컬렉션 정보 반환 (레지스트리 조회)
+    - 컬렉션이 없거나 데이터가 없으면 None
+    """
+    entry = collection_registry.get(collection_name)
+    if entry is None:
+        logger.error(f"[검색] 컬렉션이 존재하지 않습니다: {collection_name}")
+        return None
+    if entry.count == 0:
+        logger.warning(f"[검색] 컬렉션에 데이터가 없습니다: {collection_name}")
+        return None
+    return entry
+
+def _run_collection_query(collection, query_embedding: List[float], n_results: int) -> Dict[str, Any]:
+    """컬렉션 유사도 검색 실행"""
+    try:
+        # query_embeddings 방식으로 검색
+        return collection.query(
+            query_embeddings=[query_embedding],
+            n_results=n_results,
+            include=["metadatas", "distances", "documents"]
+        )
+    except AttributeError:
+        # search 방식으로 검색 (이전 버전 호환)
+        return collection.search(
+            query_embeddings=[query_embedding],
+            n_results=n_results,
+            include=["metadatas", "distances", "documents"]
+        )
+
+def _query_collection(entry: CollectionEntry, query_embedding: List[float], top_k: int) -> List[Document]:
+    """
+    [쿼리 임베딩으로 단일 컬렉션 검색]
+    - 입력:
+        - entry: 레지스트리의 컬렉션 정보
+        - query_embedding: 미리 계산된 쿼리 임베딩
+        - top_k: 반환할 결과 수
+    - 출력: 컬렉션 임계값으로 필터링된 Document 리스트
+    """
+    collection_name = entry.name
+    
+    # 1. 쿼리 임베딩 정상 여부 체크
+    if any(np.isnan(x) for x in query_embedding):
+        logger.error("[검색] 쿼리 임베딩에 nan 값 포함")
+        return []
+    if any(np.isinf(x) for x in query_embedding):
+        logger.error("[검색] 쿼리 임베딩에 inf 값 포함")
+        return []
+    
+    # 2. 임베딩 차원 검증
+    if not validate_embedding_dimension(query_embedding, entry.dimension):
+        logger.error(f"[검색] 임베딩 차원 불일치: 컬렉션({entry.dimension}) != 쿼리({len(query_embedding)})")
+        return []
+    
+    # 3. 유사도 검색 (top_k를 2배로 늘려서 필터링 여유 확보, 문서 수를 넘지 않도록 제한)
+    try:
+        results = _run_collection_query(entry.collection, query_embedding, min(top_k * 2, entry.count))
+    except Exception as e:
+        # 컬렉션이 다시 만들어져 핸들이 무효화된 경우 레지스트리 갱신 후 1회 재시도
+        logger.warning(f"[검색] {collection_name} 검색 실패, 레지스트리 갱신 후 재시도: {str(e)}")
+        entry = collection_registry.refresh(collection_name)
+        if entry is None or entry.count == 0:
+            return []
+        results = _run_collection_query(entry.collection, query_embedding, min(top_k * 2, entry.count))
+    
+    # 3-3. 검색 결과 정상 여부 체크
+    if not results or not results.get('distances'):
+        logger.error("[검색] 검색 결과 없음")
+        return []
+        
+    # 3-4. 거리 값 정상 여부 체크
+    distances = results['distances'][0]
+    if any(np.isnan(d) for d in distances):
+        logger.error("[검색] 검색 결과에 nan 거리 포함")
+        return []
+    if any(np.isinf(d) for d in distances):
+        logger.error("[검색] 검색 결과에 inf 거리 포함")
+        return []
+    
+    # 4. 검색 결과 로깅
+    if results and results.get('documents'):
+        logger.info(f"[검색] {collection_name} 검색 결과 수: {len(results['documents'][0])}")
+        for i, doc in enumerate(results['documents'][0]):
+            distance = results['distances'][0][i] if results['distances'] else float('inf')
+            similarity = 1.0 - (distance / 2.0) if distance != float('inf') else 0.0
+            logger.info(f"[검색] 결과 {i+1}: 유사도={similarity:.4f}, 거리={distance:.4f}")
+    else:
+        logger.warning("[검색] 검색 결과가 없습니다")
+        return []
+    
+    # 5. 검색 결과를 Document로 변환 및 필터링
+    documents = []
+    # 컬렉션의 임계값 (레지스트리에 캐시된 값, 기본값 0.7)
+    collection_threshold = entry.similarity_threshold
+    logger.info(f"[검색] 컬렉션 임계값: {collection_threshold}")
+    
+    ids = results['ids'][0] if results.get('ids') else []
+    for i, doc in enumerate(results['documents'][0]):
+        metadata = results['metadatas'][0][i] if results['metadatas'] else {}
+        distance = results['distances'][0][i] if results['distances'] else float('inf')
+        
+        # 5-1. 기본 유사도 점수 계산 (거리를 유사도로 변환)
+        similarity_score = 1.0 - (distance / 2.0) if distance != float('inf') else 0.0
+        
+        # 5-2. 검색 가중치 적용
+        search_weight = metadata.get('search_weight', 0.5)
+        weighted_score = similarity_score * search_weight
+        
+        # 5-3. 임계값 체크 (컬렉션의 임계값 사용)
+        if similarity_score < collection_threshold:
+            logger.debug(f"[검색] 임계값 미달: {similarity_score:.4f} < {collection_threshold} (문서: {doc[:100]}...)")
+            continue
+        
+        # 5-4. Document 생성
+        document = Document(
+            page_content=doc,
+            metadata={
+                **metadata,
+                'similarity_score': similarity_score,
+                'weighted_score': weighted_score,
+                'distance': distance,
+                'similarity_threshold': collection_threshold,
+                'collection_name': collection_name,
+                'document_id': ids[i] if i < len(ids) else None
+            }
+        )
+        documents.append(document)
+        logger.info(f"[검색] 문서 추가됨: 유사도={similarity_score:.4f}, 내용={doc[:100]}...")
+            
+    logger.info(f"[검색] {collection_name} 최종 필터링된 문서 수: {len(documents)}")
+    return documents
+
 def search_similar_in_collection(collection_name: str, query: str, top_k: int = 5) -> List[Document]:
     """
     [ChromaDB 컬렉션에서 유사 문서 검색]
@@ -278,134 +909,94 @@ def search_similar_in_collection(collection_name: str, query: str, top_k: int =
         - 검색된 Document 리스트
     """
     try:
-        # 1. 컬렉션 존재 여부 확인 (수정된 로직)
-        available_collections = client.list_collections()
-        collection_names = [col.name for col in available_collections]
-        
-        if collection_name not in collection_names:
-            logger.error(f"[검색] 컬렉션이 존재하지 않습니다: {collection_name}")
-            logger.info(f"[검색] 사용 가능한 컬렉션: {available_collections}")
-            return []
-        
-        # 2. 컬렉션 가져오기
-        collection = client.get_collection(collection_name)
-        
-        # 3. 컬렉션 상태 로깅
-        logger.info(f"[검색] 컬렉션: {collection_name}")
-        current_model = collection.metadata.get('embedding_model')
-        logger.info(f"[검색] 임베딩 모델: {current_model}")
-        
-        # 4. 컬렉션 데이터 확인
-        count = collection.count()
-        logger.info(f"[검색] 컬렉션 데이터 수: {count}")
-        if count == 0:
-            logger.warning(f"[검색] 컬렉션에 데이터가 없습니다: {collection_name}")
+        # 1. 컬렉션 정보 가져오기 (레지스트리)
+        entry = _get_searchable_collection(collection_name)
+        if entry is None:
             return []
         
-        # 5. 임베딩 차원 확인 및 검증
-        collection_dimension = collection.metadata.get('hnsw:dimension', 384)
-        
-        # 6. 쿼리 임베딩 생성 (컬렉션의 모델 사용)
-        query_embedding = get_hf_embedding(current_model).embed_query(query)
-        logger.info(f"[검색] 쿼리 임베딩 차원: {len(query_embedding)}")
+        # 2. 쿼리 임베딩 생성 (컬렉션의 모델 사용)
+        query_embedding = get_hf_embedding(entry.embedding_model).embed_query(query)
         
-        # 6-1. 쿼리 임베딩 정상 여부 체크
-        if any(np.isnan(x) for x in query_embedding):
-            logger.error("[검색] 쿼리 임베딩에 nan 값 포함")
-            return []
-        if any(np.isinf(x) for x in query_embedding):
-            logger.error("[검색] 쿼리 임베딩에 inf 값 포함")
-            return []
+        # 3. 검색 및 임계값 필터링
+        return _query_collection(entry, query_embedding, top_k)
         
-        # 7. 임베딩 차원 검증
-        if not validate_embedding_dimension(query_embedding, collection_dimension):
-            logger.error(f"[검색] 임베딩 차원 불일치: 컬렉션({collection_dimension}) != 쿼리({len(query_embedding)})")
-            return []
+    except Exception as e:
+        logger.error(f"[검색] 오류 발생: {str(e)}")
+        return []
+
+def embed_query_for_collection(collection_name: str, query: str) -> Optional[List[float]]:
+    """컬렉션의 임베딩 모델로 쿼리 임베딩 계산 (쿼리 임베딩 캐시 사용, 컬렉션이 없으면 None)"""
+    entry = collection_registry.get(collection_name)
+    if entry is None:
+        return None
+    return get_hf_embedding(entry.embedding_model).embed_query(query)
+
+def _resolve_top_k(entry: CollectionEntry, top_k: Optional[Union[int, Dict[str, int]]]) -> int:
+    """컬렉션별 top_k 결정 (인자 > 컬렉션 metadata의 search_top_k)"""
+    if isinstance(top_k, dict):
+        top_k = top_k.get(entry.name)
+    if top_k:
+        return int(top_k)
+    return entry.search_top_k
+
+def search_many(query: str, collections: List[str], top_k: Optional[Union[int, Dict[str, int]]] = None) -> Dict[str, List[Document]]:
+    """
+    [여러 컬렉션 동시 검색]
+    - 입력:
+        - query: 검색 쿼리
+        - collections: 검색할 컬렉션 이름 리스트
+        - top_k: 공통 top_k 또는 {컬렉션명: top_k} (생략 시 컬렉션 metadata의 search_top_k)
+    - 출력:
+        - {컬렉션명: 임계값으로 필터링된 Document 리스트}
+    - 동작:
+        - 임베딩 모델별로 쿼리 임베딩을 한 번만 계산
+        - 대상 컬렉션이 여러 개이면 스레드 풀에서 병렬 검색
+    """
+    results: Dict[str, List[Document]] = {name: [] for name in collections}
+    try:
+        # 1. 검색 가능한 컬렉션 수집 (중복 제거)
+        targets = []
+        for collection_name in dict.fromkeys(collections):
+            entry = _get_searchable_collection(collection_name)
+            if entry is not None:
+                targets.append(entry)
+        if not targets:
+            return results
         
-        # 8. 유사도 검색 (top_k를 2배로 늘려서 필터링 여유 확보)
-        try:
-            # 8-1. query_embeddings 방식으로 검색
-            results = collection.query(
-                query_embeddings=[query_embedding],
-                n_results=top_k * 2,
-                include=["metadatas", "distances", "documents"]
-            )
-        except AttributeError:
-            # 8-2. search 방식으로 검색 (이전 버전 호환)
-            results = collection.search(
-                query_embeddings=[query_embedding],
-                n_results=top_k * 2,
-                include=["metadatas", "distances", "documents"]
-            )
+        # 2. 임베딩 모델별로 쿼리 임베딩 1회 계산
+        query_embeddings: Dict[str, List[float]] = {}
+        for entry in targets:
+            if entry.embedding_model not in query_embeddings:
+                query_embeddings[entry.embedding_model] = get_hf_embedding(entry.embedding_model).embed_query(query)
         
-        # 8-3. 검색 결과 정상 여부 체크
-        if not results or not results.get('distances'):
-            logger.error("[검색] 검색 결과 없음")
-            return []
-            
-        # 8-4. 거리 값 정상 여부 체크
-        distances = results['distances'][0]
-        if any(np.isnan(d) for d in distances):
-            logger.error("[검색] 검색 결과에 nan 거리 포함")
-            return []
-        if any(np.isinf(d) for d in distances):
-            logger.error("[검색] 검색 결과에 inf 거리 포함")
-            return []
+        def _search(entry: CollectionEntry):
+            try:
+                k = _resolve_top_k(entry, top_k)
+                return entry.name, _query_collection(entry, query_embeddings[entry.embedding_model], k)
+            except Exception as e:
+                logger.error(f"[다중 검색] {entry.name} 검색 중 오류 발생: {str(e)}")
+                return entry.name, []
         
-        # 9. 검색 결과 로깅
-        if results and results.get('documents'):
-            logger.info(f"[검색] 검색 결과 수: {len(results['documents'][0])}")
-            for i, doc in enumerate(results['documents'][0]):
-                distance = results['distances'][0][i] if results['distances'] else float('inf')
-                similarity = 1.0 - (distance / 2.0) if distance != float('inf') else 0.0
-                logger.info(f"[검색] 결과 {i+1}: 유사도={similarity:.4f}, 거리={distance:.4f}")
+        # 3. 컬렉션 검색 (2개 이상이면 병렬)
+        if len(targets) == 1:
+            searched = [_search(targets[0])]
         else:
-            logger.warning("[검색] 검색 결과가 없습니다")
-            return []
+            searched = list(_search_executor.map(_search, targets))
         
-        # 10. 검색 결과를 Document로 변환 및 필터링
-        documents = []
-        if results and results.get('documents'):
-            # 컬렉션의 임계값 가져오기 (기본값 0.7로 설정)
-            collection_threshold = float(collection.metadata.get('similarity_threshold', 0.7))
-            logger.info(f"[검색] 컬렉션 임계값: {collection_threshold}")
-            
-            for i, doc in enumerate(results['documents'][0]):
-                metadata = results['metadatas'][0][i] if results['metadatas'] else {}
-                distance = results['distances'][0][i] if results['distances'] else float('inf')
-                
-                # 10-1. 기본 유사도 점수 계산 (거리를 유사도로 변환)
-                similarity_score = 1.0 - (distance / 2.0) if distance != float('inf') else 0.0
-                
-                # 10-2. 검색 가중치 적용
-                search_weight = metadata.get('search_weight', 0.5)
-                weighted_score = similarity_score * search_weight
-                
-                # 10-3. 임계값 체크 (컬렉션의 임계값 사용)
-                if similarity_score < collection_threshold:
-                    logger.debug(f"[검색] 임계값 미달: {similarity_score:.4f} < {collection_threshold} (문서: {doc[:100]}...)")
-                    continue
-                
-                # 10-4. Document 생성
-                document = Document(
-                    page_content=doc,
-                    metadata={
-                        **metadata,
-                        'similarity_score': similarity_score,
-                        'weighted_score': weighted_score,
-                        'distance': distance,
-                        'similarity_threshold': collection_threshold
-                    }
-                )
-                documents.append(document)
-                logger.info(f"[검색] 문서 추가됨: 유사도={similarity_score:.4f}, 내용={doc[:100]}...")
-                
-        logger.info(f"[검색] 최종 필터링된 문서 수: {len(documents)}")
-        return documents
+        for collection_name, docs in searched:
+            results[collection_name] = docs
+        logger.info(f"[다중 검색] 완료 - " + ", ".join(f"{name}: {len(docs)}건" for name, docs in results.items()))
+        return results
         
     except Exception as e:
-        logger.error(f"[검색] 오류 발생: {str(e)}")
-        return []
+        logger.error(f"[다중 검색] 오류 발생: {str(e)}")
+        return results
+
+def merge_search_results(results: Dict[str, List[Document]], collection_names: List[str]) -> List[Document]:
+    """지정한 컬렉션들의 검색 결과를 합쳐 유사도(similarity_score) 내림차순으로 정렬"""
+    merged = [doc for name in collection_names for doc in results.get(name, [])]
+    merged.sort(key=lambda x: x.metadata.get('similarity_score', 0), reverse=True)
+    return merged
 
 def validate_embedding_dimension(query_embedding: List[float], collection_dimension: int) -> bool:
     """
@@ -423,6 +1014,10 @@ def validate_embedding_dimension(query_embedding: List[float], collection_dimens
         return False
     return True
 
+def get_rag_collection_names() -> List[str]:
+    """config에 정의된 RAG 컬렉션 이름 목록"""
+    return [item['collection'] for item in config.RAG_CHROMA_COLLECTIONS]
+
 def search_rag_documents(query: str) -> List[Document]:
     """
     [RAG ChromaDB에서 유사 문서 검색]
@@ -431,20 +1026,17 @@ def search_rag_documents(query: str) -> List[Document]:
     """
     try:
         logger.info(f"[RAG 검색] 시작 - 쿼리: {query}")
-        all_docs = []
-        # config에 정의된 모든 RAG 컬렉션에서 검색
-        for collection_config in config.RAG_CHROMA_COLLECTIONS:
-            collection_name = collection_config['collection']
-            top_k = collection_config.get('search_top_k', 5)
-            
-            docs = search_similar_in_collection(collection_name, query, top_k=top_k)
-            
+        # config에 정의된 모든 RAG 컬렉션을 한 번의 임베딩으로 검색
+        collection_names = get_rag_collection_names()
+        top_k = {item['collection']: item.get('search_top_k', 5) for item in config.RAG_CHROMA_COLLECTIONS}
+        results = search_many(query, collection_names, top_k=top_k)
+        
+        for collection_name, docs in results.items():
             if docs:
                 logger.info(f"[RAG 검색] 컬렉션 '{collection_name}'에서 {len(docs)}개 문서 발견")
-                all_docs.extend(docs)
         
         # 유사도 점수(similarity_score) 기준으로 정렬
-        all_docs.sort(key=lambda x: x.metadata.get('similarity_score', 0), reverse=True)
+        all_docs = merge_search_results(results, collection_names)
 
         if not all_docs:
             logger.warning(f"[RAG 검색] 모든 RAG 컬렉션에서 '{query}'에 대한 문서를 찾지 못했습니다.")
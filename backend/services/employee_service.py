@@ -1,11 +1,106 @@
 import re
+import threading
+import time
+import logging
+from typing import Any, Dict, List, Optional
 from database import get_db_connection
+from config import config
+from core.utils.aho_corasick import AhoCorasick
+from core.utils.template_utils import render_template
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+class EmployeeDirectory:
+    """
+    [직원 디렉터리 캐시]
+    - employees 테이블을 한 번에 불러와 이름별 정보와 Aho-Corasick(전체 이름) 인덱스를 메모리에 보관
+    - 메시지 한 번 순회로 실제 직원 이름을 찾고, 직원 정보는 DB 재조회 없이 반환
+    - check_interval초마다 테이블 변경 여부(행 수/최대 수정 시각/최대 ID)를 확인해 바뀐 경우에만 다시 로드
+    """
+
+    def __init__(self, check_interval: float = 60):
+        self.check_interval = check_interval
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._names = AhoCorasick().build()
+        self._fingerprint = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """다음 조회 시 변경 여부를 바로 확인하도록 무효화"""
+        with self._lock:
+            self._fingerprint = None
+            self._checked_at = 0.0
+
+    def refresh(self, force: bool = False) -> bool:
+        """변경된 경우에만 다시 로드 (다시 로드했으면 True)"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._fingerprint is not None and now - self._checked_at < self.check_interval:
+                return False
+            conn = get_db_connection()
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute('''
+                        SELECT COUNT(*) as row_count, MAX(updated_at) as last_updated, MAX(id) as max_id
+                        FROM employees
+                    ''')
+                    row = cursor.fetchone()
+                    fingerprint = (row['row_count'], row['last_updated'], row['max_id'])
+                    self._checked_at = now
+                    if not force and fingerprint == self._fingerprint:
+                        return False
+                    cursor.execute('''
+                        SELECT name, position, dept_nm, email, phone FROM employees ORDER BY id
+                    ''')
+                    employees = cursor.fetchall()
+            finally:
+                conn.close()
+            by_name: Dict[str, Dict[str, Any]] = {}
+            names = AhoCorasick()
+            for employee in employees:
+                if employee['name'] and employee['name'] not in by_name:
+                    by_name[employee['name']] = employee
+                    names.add(employee['name'], employee['name'])
+            self._by_name, self._names = by_name, names.build()
+            self._fingerprint = fingerprint
+        logger.info(f"[EMPLOYEE] 직원 디렉터리 갱신: {len(by_name)}명")
+        return True
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """이름이 정확히 일치하는 직원 정보 반환 (없으면 None)"""
+        self.refresh()
+        return self._by_name.get(name)
+
+    def find_names(self, text: str) -> List[str]:
+        """메시지에 포함된 직원 이름 목록 (등장 순서, 겹치면 긴 이름 우선)"""
+        self.refresh()
+        found = sorted(((start, -len(name), name) for start, name, _ in self._names.search(text)))
+        names, end = [], -1
+        for start, neg_len, name in found:
+            if start >= end:
+                names.append(name)
+                end = start - neg_len
+        return names
+
+    def search(self, keyword: str) -> List[Dict[str, Any]]:
+        """이름에 keyword가 포함된 직원 목록"""
+        self.refresh()
+        return [employee for name, employee in self._by_name.items() if keyword and keyword in name]
+
+# 전역 직원 디렉터리
+employee_directory = EmployeeDirectory(check_interval=config.EMPLOYEE_CACHE_CHECK_INTERVAL)
 
 def extract_employee_name(user_message):
     """
     Extract employee name from user message for both static and dynamic patterns.
     Returns the name string or None if not found.
     """
+    # 직원 디렉터리에 있는 실제 이름을 먼저 찾음 (메시지 한 번 순회)
+    names = employee_directory.find_names(user_message)
+    if names:
+        return names[0]
     # 동적 패턴: {name} 정보, {name}씨 정보 등
     match = re.search(r'(\b[가-힣]{2,4})[\s씨]*정보', user_message)
     if match:
@@ -22,28 +117,14 @@ def extract_employee_name(user_message):
 
 def get_employee_info_and_fill_template(name, response_template):
     """
-    Given a name and a response template, fetch employee info from DB and fill the template.
+    Given a name and a response template, fetch employee info from the directory cache and fill the template.
     Returns the filled response string, or None if not found.
     """
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cursor:
-            cursor.execute('''
-                SELECT name, position, dept_nm, email, phone FROM employees WHERE name = %s
-            ''', (name,))
-            employee = cursor.fetchone()
-        if employee:
-            response_text = response_template
-            response_text = response_text.replace('{employee.name}', employee['name'])
-            response_text = response_text.replace('{employee.position}', employee['position'] or '')
-            response_text = response_text.replace('{employee.dept_nm}', employee['dept_nm'] or '')
-            response_text = response_text.replace('{employee.email}', employee['email'] or '')
-            response_text = response_text.replace('{employee.phone}', employee['phone'] or '')
-            return response_text
-        else:
-            return None
-    finally:
-        conn.close()
+    employee = employee_directory.get(name)
+    if employee:
+        return render_template(response_template, {'employee': employee})
+    else:
+        return None
 
 def get_employee_list():
     """
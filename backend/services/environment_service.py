@@ -1,8 +1,14 @@
 import os
+import hashlib
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from database import get_db_connection
+from common.http_client import CircuitBreaker, create_session, guarded_get
 from common.logger import setup_logger
+from common.sse_broker import SSEBroker
+from config import config
 import json
 
 logger = setup_logger('environment_service')
@@ -16,12 +22,27 @@ class EnvironmentService:
             'lat': '37.5301',  # 강동구 위도
             'lon': '127.1238'  # 강동구 경도
         }
-        self.sse_clients = set()
+        # 외부 API 호출 (연결 풀 세션 + 재시도/백오프, 소스별 회로 차단기, 두 소스 동시 조회)
+        self.weather_url = config.ENV_WEATHER_URL
+        self.air_url = config.ENV_AIR_QUALITY_URL
+        self.timeout = (config.ENV_FETCH_CONNECT_TIMEOUT, config.ENV_FETCH_READ_TIMEOUT)
+        self.session = create_session(pool_size=2, retries=config.ENV_FETCH_RETRIES, backoff_factor=config.ENV_FETCH_BACKOFF)
+        self.weather_breaker = CircuitBreaker('weather', config.ENV_BREAKER_FAILURES, config.ENV_BREAKER_RESET)
+        self.air_breaker = CircuitBreaker('air_quality', config.ENV_BREAKER_FAILURES, config.ENV_BREAKER_RESET)
+        self._fetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='environment-fetch')
+        # 갱신은 한 번에 하나만 (스케줄러와 백그라운드 재검증이 겹치지 않도록)
+        self._update_lock = threading.Lock()
+        # 환경 정보 SSE 브로커 (구독자별 큐, 주기적 heartbeat)
+        self.broker = SSEBroker('environment', queue_size=config.SSE_QUEUE_SIZE, heartbeat_interval=config.SSE_HEARTBEAT_INTERVAL)
+        # 최신 환경 정보 스냅샷 (저장 시에만 갱신, 조회 API는 DB 대신 이 값을 사용)
+        self._snapshot = None
+        self._snapshot_etag = None
+        self._snapshot_loaded = False
+        self._snapshot_lock = threading.Lock()
 
     def fetch_weather(self):
         """날씨 정보 조회"""
         try:
-            url = f"https://api.openweathermap.org/data/2.5/weather"
             params = {
                 'lat': self.location['lat'],
                 'lon': self.location['lon'],
@@ -29,8 +50,7 @@ class EnvironmentService:
                 'units': 'metric',
                 'lang': 'kr'
             }
-            response = requests.get(url, params=params)
-            response.raise_for_status()
+            response = guarded_get(self.session, self.weather_breaker, self.weather_url, self.timeout, params=params)
             data = response.json()
             
             return {
@@ -41,16 +61,15 @@ class EnvironmentService:
         except requests.exceptions.RequestException as e:
             logger.error(f"날씨 정보 조회 실패: {str(e)}")
             return None
-        except (KeyError, IndexError) as e:
+        except (KeyError, IndexError, ValueError) as e:
             logger.error(f"날씨 정보 파싱 실패: {str(e)}")
             return None
 
     def fetch_air_quality(self):
         """대기질 정보 조회"""
         try:
-            url = f"http://openapi.seoul.go.kr:8088/{self.air_api_key}/xml/ListAirQualityByDistrictService/1/5/111274/"
-            response = requests.get(url)
-            response.raise_for_status()
+            url = self.air_url.format(api_key=self.air_api_key)
+            response = guarded_get(self.session, self.air_breaker, url, self.timeout)
             
             # XML 파싱
             import xml.etree.ElementTree as ET
@@ -136,15 +155,46 @@ class EnvironmentService:
             if conn:
                 conn.close()
 
+    def _set_snapshot(self, env):
+        """스냅샷 교체 (ETag는 내용 해시)"""
+        etag = hashlib.sha1(json.dumps(env, sort_keys=True, default=str).encode('utf-8')).hexdigest() if env else None
+        with self._snapshot_lock:
+            self._snapshot = env
+            self._snapshot_etag = etag
+            self._snapshot_loaded = True
+
+    def get_snapshot(self):
+        """
+        최신 환경 정보 스냅샷 조회
+        - 최초 1회만 DB에서 읽고, 이후에는 update_environment_data 저장 시 갱신된 값을 반환
+        - 출력: (환경 정보 또는 None, ETag 또는 None)
+        """
+        if not self._snapshot_loaded:
+            self._set_snapshot(self.get_latest_environment())
+        with self._snapshot_lock:
+            return self._snapshot, self._snapshot_etag
+
+    def fetch_all(self):
+        """날씨/대기질 동시 조회 - (날씨, 대기질), 실패한 쪽은 None"""
+        weather_future = self._fetch_executor.submit(self.fetch_weather)
+        air_future = self._fetch_executor.submit(self.fetch_air_quality)
+        return weather_future.result(), air_future.result()
+
     def update_environment_data(self):
-        """환경 정보 업데이트 및 저장"""
+        """환경 정보 업데이트 및 저장 (이미 다른 스레드가 갱신 중이면 그 갱신이 끝날 때까지 대기)"""
+        with self._update_lock:
+            return self._update_environment_data()
+
+    def _update_environment_data(self):
         try:
-            weather_data = self.fetch_weather()
-            air_data = self.fetch_air_quality()
+            weather_data, air_data = self.fetch_all()
 
             if weather_data and air_data:
                 if self.save_environment_data(weather_data, air_data):
-                    self.notify_clients({
+                    # 저장된 행으로 스냅샷 갱신 (created_at 포함)
+                    self._set_snapshot(self.get_latest_environment())
+                    env, _ = self.get_snapshot()
+                    self.notify_clients(env or {
                         'temp': weather_data['temp'],
                         'main': weather_data['main'],
                         'weather_desc': weather_data['weather_desc'],
@@ -159,40 +209,61 @@ class EnvironmentService:
             logger.error(f"환경 정보 업데이트 실패: {str(e)}")
             return False
 
+    def refresh_in_background(self):
+        """
+        백그라운드 갱신 시작 (이미 갱신 중이면 건너뜀)
+        - 출력: 새 갱신을 시작했으면 True
+        """
+        if not self._update_lock.acquire(blocking=False):
+            return False
+
+        def run():
+            try:
+                self._update_environment_data()
+            finally:
+                self._update_lock.release()
+
+        threading.Thread(target=run, name='environment-refresh', daemon=True).start()
+        return True
+
+    def revalidate_if_stale(self, env):
+        """스냅샷이 없거나 ENV_STALE_SECONDS 이상 지났으면 백그라운드 갱신 시작 (기다리지 않음)"""
+        if env and env.get('timestamp') and \
+                (datetime.now() - datetime.fromisoformat(env['timestamp'])).total_seconds() <= config.ENV_STALE_SECONDS:
+            return False
+        if self.refresh_in_background():
+            logger.info("환경 정보가 없거나 오래되어 백그라운드에서 새로운 데이터를 조회합니다.")
+            return True
+        return False
+
     def get_current_environment(self):
-        """현재 환경 정보 조회"""
+        """
+        현재 환경 정보 조회 (stale-while-revalidate)
+        - 스냅샷을 바로 반환하고, 없거나 오래된 경우 백그라운드 갱신만 시작 (외부 API 응답을 기다리지 않음)
+        - 갱신 결과는 스냅샷과 SSE로 전달
+        """
         try:
-            # 먼저 최신 데이터 조회
-            env = self.get_latest_environment()
-            
-            # 데이터가 없거나 10분 이상 지난 경우 새로운 데이터 조회
-            if not env or (env.get('timestamp') and 
-                (datetime.now() - datetime.fromisoformat(env['timestamp'])).total_seconds() > 600):
-                logger.info("환경 정보가 없거나 오래되어 새로운 데이터를 조회합니다.")
-                if self.update_environment_data():
-                    env = self.get_latest_environment()
-            
+            env, _ = self.get_snapshot()
+            self.revalidate_if_stale(env)
             return env
         except Exception as e:
             logger.error(f"현재 환경 정보 조회 실패: {str(e)}")
             return None
 
-    def add_sse_client(self, client):
-        """SSE 클라이언트 추가"""
-        self.sse_clients.add(client)
-
-    def remove_sse_client(self, client):
-        """SSE 클라이언트 제거"""
-        self.sse_clients.discard(client)
+    def fetch_stats(self):
+        """외부 API 회로 차단기 상태"""
+        return {
+            'weather': self.weather_breaker.stats(),
+            'air_quality': self.air_breaker.stats()
+        }
 
     def notify_clients(self, data):
-        """SSE 클라이언트에게 데이터 전송"""
-        for client in self.sse_clients:
-            try:
-                client.send(f"data: {json.dumps(data)}\n\n")
-            except Exception as e:
-                logger.error(f"SSE 클라이언트 알림 실패: {str(e)}")
-                self.remove_sse_client(client)
+        """SSE 구독자에게 환경 정보 전송"""
+        delivered = self.broker.publish({
+            'status': 'success',
+            'data': data
+        })
+        logger.info(f"환경 정보 SSE 전송: {delivered}명")
 
 # 싱글톤 인스턴스
 environment_service = EnvironmentService() 
\ No newline at end of file
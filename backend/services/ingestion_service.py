@@ -0,0 +1,234 @@
+import hashlib
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import get_config
+from core.embeddings.hf_embedding import get_hf_embedding
+from core.parsers.document_loader import load_documents
+import logging
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 설정 로드
+config = get_config()
+
+# 파싱 결과 청크 (본문, metadata)
+Chunk = Tuple[str, Dict[str, Any]]
+
+def parse_file(file_path: str) -> List[Chunk]:
+    """
+    [파일 파싱 및 청크 분할 - 작업 프로세스에서 실행]
+    - 프로세스 간 전달을 위해 Document 대신 (본문, metadata) 튜플 리스트 반환
+    """
+    return [(doc.page_content, dict(doc.metadata)) for doc in load_documents(file_path)]
+
+def chunk_id_prefix(file_path: str, fingerprint: str) -> str:
+    """청크 ID 접두사 "{경로 sha256 앞 8자}-{파일 지문 앞 16자}" (내용이 같은 파일도 경로가 다르면 ID가 다름)"""
+    return f"{hashlib.sha256(file_path.encode('utf-8')).hexdigest()[:8]}-{fingerprint[:16]}"
+
+class FileProgress:
+    """파일별 적재 진행 상황"""
+
+    def __init__(self, file_path: str, fingerprint: str):
+        self.file_path = file_path
+        self.fingerprint = fingerprint
+        self.id_prefix = chunk_id_prefix(file_path, fingerprint)
+        self.status = 'pending'  # pending -> parsing -> embedding -> done | empty | failed
+        self.chunks = 0
+        self.embedded = 0
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round((self.finished_at or time.time()) - self.started_at, 2)
+        return {
+            'status': self.status,
+            'chunks': self.chunks,
+            'embedded': self.embedded,
+            'error': self.error,
+            'elapsed_sec': elapsed
+        }
+
+class IngestionPipeline:
+    """
+    [RAG 문서 스트리밍 적재 파이프라인]
+    - 파싱: 파일 단위로 프로세스 풀에서 실행 (동시 파싱 파일 수는 workers * 2로 제한)
+    - 청크는 batch_size 단위로 크기가 제한된 큐를 거쳐 임베딩/저장 단계로 전달
+      (임베딩이 느리면 파싱 결과 전달이 대기하므로 전체 코퍼스를 메모리에 올리지 않음)
+    - 임베딩: 컬렉션에 설정된 SBERT 모델로 배치 임베딩 후 collection.add
+    - 파일별 진행 상황 기록, 실패한 파일은 이번에 저장된 청크를 지우고 failed로 표시
+    """
+
+    _SENTINEL = None
+
+    def __init__(self, collection, embedding_model: str, workers: Optional[int] = None,
+                 batch_size: Optional[int] = None, queue_size: Optional[int] = None):
+        self.collection = collection
+        self.embedding_model = embedding_model
+        self.workers = config.INGESTION_WORKERS if workers is None else workers
+        self.batch_size = batch_size or config.INGESTION_BATCH_SIZE
+        self.queue: "queue.Queue" = queue.Queue(maxsize=queue_size or config.INGESTION_QUEUE_SIZE)
+        self.progress: Dict[str, FileProgress] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def run(self, files: List[Tuple[str, str]]) -> Dict[str, FileProgress]:
+        """
+        파일 목록 적재
+        - 입력: [(파일 경로, 파일 지문)] - 청크 ID는 "{경로 해시 앞 8자}-{지문 앞 16자}-{순번}"
+        - 출력: 파일 경로별 FileProgress
+        """
+        self.progress = {path: FileProgress(path, fingerprint) for path, fingerprint in files}
+        if not files:
+            return self.progress
+
+        start = time.time()
+        embeddings = get_hf_embedding(self.embedding_model)
+        self._stopped.clear()
+        producer = threading.Thread(target=self._produce, args=(files,), name='ingestion-parse', daemon=True)
+        producer.start()
+        try:
+            self._consume(embeddings)
+        except Exception:
+            # 파싱 단계가 큐에서 대기하지 않도록 중단 표시 후 큐 비우기
+            self._stopped.set()
+            while self.queue.get() is not self._SENTINEL:
+                pass
+            raise
+        finally:
+            producer.join()
+
+        for progress in self.progress.values():
+            if progress.status == 'embedding':
+                progress.status = 'done' if progress.embedded == progress.chunks else 'failed'
+                progress.finished_at = time.time()
+        done = sum(1 for p in self.progress.values() if p.status == 'done')
+        chunks = sum(p.embedded for p in self.progress.values())
+        logger.info(f"[INGEST] 적재 완료: 파일 {done}/{len(files)}개, 청크 {chunks}개, {time.time() - start:.2f}초")
+        return self.progress
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """파일별 진행 상황"""
+        with self._lock:
+            return {path: progress.to_dict() for path, progress in self.progress.items()}
+
+    # 파싱 단계 (생산자)
+    def _produce(self, files: List[Tuple[str, str]]) -> None:
+        try:
+            if self.workers <= 1:
+                # 작업 프로세스 없이 현재 스레드에서 파싱
+                for path, _ in files:
+                    if self._stopped.is_set():
+                        return
+                    self._mark_parsing(path)
+                    try:
+                        chunks = parse_file(path)
+                    except Exception as e:
+                        self._fail(path, e)
+                        continue
+                    self._enqueue(path, chunks)
+                return
+
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                pending: Dict[Future, str] = {}
+                remaining = iter(files)
+                max_in_flight = self.workers * 2
+                while True:
+                    for path, _ in remaining:
+                        if self._stopped.is_set():
+                            break
+                        self._mark_parsing(path)
+                        pending[executor.submit(parse_file, path)] = path
+                        if len(pending) >= max_in_flight:
+                            break
+                    if not pending:
+                        break
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        path = pending.pop(future)
+                        try:
+                            chunks = future.result()
+                        except Exception as e:
+                            self._fail(path, e)
+                            continue
+                        self._enqueue(path, chunks)
+        finally:
+            self.queue.put(self._SENTINEL)
+
+    def _mark_parsing(self, path: str) -> None:
+        with self._lock:
+            progress = self.progress[path]
+            progress.status = 'parsing'
+            progress.started_at = time.time()
+
+    def _enqueue(self, path: str, chunks: List[Chunk]) -> None:
+        """파싱 결과를 배치 단위로 큐에 전달 (큐가 가득 차면 대기)"""
+        if self._stopped.is_set():
+            return
+        with self._lock:
+            progress = self.progress[path]
+            progress.chunks = len(chunks)
+            if not chunks:
+                progress.status = 'empty'
+                progress.finished_at = time.time()
+                logger.warning(f"[INGEST] {path}에서 변환할 문서가 없습니다.")
+                return
+            progress.status = 'embedding'
+        for offset in range(0, len(chunks), self.batch_size):
+            self.queue.put((path, offset, chunks[offset:offset + self.batch_size]))
+
+    # 임베딩/저장 단계 (소비자)
+    def _consume(self, embeddings) -> None:
+        while True:
+            item = self.queue.get()
+            if item is self._SENTINEL:
+                return
+            path, offset, batch = item
+            progress = self.progress[path]
+            if progress.status == 'failed':
+                continue
+            try:
+                texts = [text for text, _ in batch]
+                vectors = embeddings.embed_documents_array(texts)
+                self.collection.add(
+                    documents=texts,
+                    embeddings=vectors.tolist(),
+                    metadatas=[metadata for _, metadata in batch],
+                    ids=[f"{progress.id_prefix}-{offset + i}" for i in range(len(batch))]
+                )
+            except Exception as e:
+                self._fail(path, e)
+                self._remove_partial(path)
+                continue
+            with self._lock:
+                progress.embedded += len(batch)
+                if progress.embedded == progress.chunks:
+                    progress.status = 'done'
+                    progress.finished_at = time.time()
+                    logger.info(f"[INGEST] {path}: {progress.chunks}개 청크 저장 완료 ({progress.finished_at - progress.started_at:.2f}초)")
+
+    def _fail(self, path: str, error: Exception) -> None:
+        with self._lock:
+            progress = self.progress[path]
+            progress.status = 'failed'
+            progress.error = str(error)
+            progress.finished_at = time.time()
+        logger.error(f"[INGEST] {path} 적재 실패: {str(error)}")
+
+    def _remove_partial(self, path: str) -> None:
+        """실패한 파일의 이번 적재로 저장된 청크만 제거 (이전 지문의 청크는 유지, 다음 기동 시 다시 적재)"""
+        prefix = f"{self.progress[path].id_prefix}-"
+        try:
+            stored = self.collection.get(where={"source": path}, include=[])
+            partial_ids = [doc_id for doc_id in stored.get("ids") or [] if doc_id.startswith(prefix)]
+            if partial_ids:
+                self.collection.delete(ids=partial_ids)
+        except Exception as e:
+            logger.warning(f"[INGEST] {path} 부분 적재 청크 제거 실패: {str(e)}")
@@ -3,6 +3,7 @@ from typing import List, Dict, Any
 from langchain.schema import Document
 from database import get_db_connection
 from core.converters.pattern_converter import pattern_to_document
+from core.handlers.registry import handler_registry
 
 # 로거 설정
 logger = logging.getLogger(__name__)
@@ -47,6 +48,9 @@ def get_all_patterns():
                 if row.get('route_code') and not row.get('route_type'):
                     logger.warning(f"[get_all_patterns] 라우트 정보 누락: route_code={row.get('route_code')}")
             
+            # 패턴에 설정된 핸들러가 실제로 등록되어 있는지 검증
+            handler_registry.validate(row.get('response_handler') for row in results)
+            
             logger.info(f"[get_all_patterns] 전체 패턴 반환: {len(results)}")
             return results
     finally:
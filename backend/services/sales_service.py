@@ -1,6 +1,120 @@
 from database import get_db_connection
+from config import config
+from core.utils.template_utils import render_template
+import threading
+import time
+import logging
+from typing import Any, Dict, Optional
 import numpy as np
-from sklearn.linear_model import LinearRegression
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+class SalesAggregateCache:
+    """
+    [연도별 매출 집계 캐시]
+    - GROUP BY year 쿼리 한 번으로 전체 연도의 합계/월평균/순이익/성장률을 메모리에 보관
+    - check_interval초마다 sales_history 변경 여부(행 수/합계/최대 ID)를 확인해 바뀐 경우에만 다시 집계
+    - 데이터를 직접 수정한 경우 invalidate()로 즉시 무효화
+    """
+
+    def __init__(self, check_interval: float = 60):
+        self.check_interval = check_interval
+        self._table: Dict[int, Dict[str, Any]] = {}
+        self._fingerprint = None
+        self._checked_at = 0.0
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """집계가 다시 만들어질 때마다 증가"""
+        return self._version
+
+    def invalidate(self) -> None:
+        """다음 조회 시 변경 여부를 바로 확인하도록 무효화"""
+        with self._lock:
+            self._fingerprint = None
+            self._checked_at = 0.0
+
+    def _load(self, cursor) -> Dict[int, Dict[str, Any]]:
+        cursor.execute('''
+            SELECT 
+                year,
+                SUM(sales) as total_sales,
+                SUM(sales)/12 as monthly_sales,
+                SUM(net_profit) as total_profit,
+                COUNT(*) as months
+            FROM sales_history 
+            GROUP BY year
+            ORDER BY year
+        ''')
+        table = {}
+        for row in cursor.fetchall():
+            year = int(row['year'])
+            prev = table.get(year - 1)
+            # 성장률 계산 (전년도 데이터가 없으면 0)
+            if prev and prev['total_sales'] > 0:
+                growth_rate = (row['total_sales'] - prev['total_sales']) / prev['total_sales'] * 100
+            else:
+                growth_rate = 0
+            table[year] = {
+                'year': year,
+                'total_sales': row['total_sales'],
+                'monthly_sales': row['monthly_sales'],
+                'total_profit': row['total_profit'],
+                'months': row['months'],
+                'profit_rate': round(row['total_profit'] / row['total_sales'], 4) if row['total_sales'] else 0,
+                'growth_rate': growth_rate
+            }
+        return table
+
+    def refresh(self, force: bool = False) -> bool:
+        """변경된 경우에만 다시 집계 (다시 집계했으면 True)"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._fingerprint is not None and now - self._checked_at < self.check_interval:
+                return False
+            conn = get_db_connection()
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute('''
+                        SELECT COUNT(*) as row_count, COALESCE(SUM(sales), 0) as sales_sum,
+                               COALESCE(SUM(net_profit), 0) as profit_sum, COALESCE(MAX(id), 0) as max_id
+                        FROM sales_history
+                    ''')
+                    row = cursor.fetchone()
+                    fingerprint = (row['row_count'], row['sales_sum'], row['profit_sum'], row['max_id'])
+                    self._checked_at = now
+                    if not force and fingerprint == self._fingerprint:
+                        return False
+                    self._table = self._load(cursor)
+                    self._fingerprint = fingerprint
+                    self._version += 1
+            finally:
+                conn.close()
+            logger.info(f"[SALES] 매출 집계 갱신: {len(self._table)}개 연도 (v{self._version})")
+            return True
+
+    def get(self, year) -> Optional[Dict[str, Any]]:
+        """연도별 집계 반환 (없으면 None)"""
+        self.refresh()
+        return self._table.get(int(year))
+
+    def all(self) -> Dict[int, Dict[str, Any]]:
+        """전체 연도 집계 반환 (연도 오름차순)"""
+        self.refresh()
+        return dict(self._table)
+
+# 매출 응답 템플릿 기본 포매터
+SALES_TEMPLATE_FORMATTERS = {
+    'sales.total_sales': 'comma',
+    'sales.monthly_sales': 'comma',
+    'sales.growth_rate': 'percent'
+}
+
+# 전역 매출 집계 캐시
+sales_aggregates = SalesAggregateCache(check_interval=config.SALES_CACHE_CHECK_INTERVAL)
 
 def get_sales_info_and_fill_template(year: str, response_template: str) -> str:
     """
@@ -10,105 +124,111 @@ def get_sales_info_and_fill_template(year: str, response_template: str) -> str:
         - response_template: 응답 템플릿
     - 출력: 채워진 응답 문자열
     """
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cursor:
-            # 현재 연도의 매출 정보 조회
-            cursor.execute('''
-                SELECT 
-                    year,
-                    SUM(sales) as total_sales,
-                    SUM(sales)/12 as monthly_sales
-                FROM sales_history 
-                WHERE year = %s
-                GROUP BY year
-            ''', (year,))
-            current_sales = cursor.fetchone()
-            
-            if not current_sales:
-                return None
-                
-            # 전년도 매출 정보 조회
-            prev_year = int(year) - 1
-            cursor.execute('''
-                SELECT SUM(sales) as prev_total_sales
-                FROM sales_history 
-                WHERE year = %s
-                GROUP BY year
-            ''', (prev_year,))
-            prev_sales = cursor.fetchone()
-            
-            # 성장률 계산
-            if prev_sales and prev_sales['prev_total_sales'] > 0:
-                growth_rate = (current_sales['total_sales'] - prev_sales['prev_total_sales']) / prev_sales['prev_total_sales'] * 100
-            else:
-                growth_rate = 0
-            
-            # 응답 템플릿 채우기
-            response_text = response_template
-            response_text = response_text.replace('{year}', str(current_sales['year']))
-            response_text = response_text.replace('{sales.year}', str(current_sales['year']))
-            response_text = response_text.replace('{sales.total_sales}', format(current_sales['total_sales'], ','))
-            response_text = response_text.replace('{sales.monthly_sales}', format(current_sales['monthly_sales'], ','))
-            response_text = response_text.replace('{sales.growth_rate}', f"{growth_rate:.1f}%")
-            return response_text
-            
-    finally:
-        conn.close()
+    current_sales = sales_aggregates.get(year)
+    if not current_sales:
+        return None
+    
+    # 응답 템플릿 채우기 (컴파일된 템플릿으로 한 번에 렌더링)
+    return render_template(
+        response_template,
+        {'year': current_sales['year'], 'sales': current_sales},
+        SALES_TEMPLATE_FORMATTERS
+    )
 
 # 연도별 매출 집계 함수
 def get_sales_summary(year):
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cursor:
-            sql = """
-                SELECT SUM(sales) as total_sales, SUM(net_profit) as total_profit
-                FROM sales_history
-                WHERE year = %s
-            """
-            cursor.execute(sql, (year,))
-            row = cursor.fetchone()
-            if not row or not row['total_sales']:
-                return {'total_sales': 0, 'total_profit': 0, 'profit_rate': 0}
-            profit_rate = row['total_profit'] / row['total_sales'] if row['total_sales'] else 0
-            return {
-                'total_sales': int(row['total_sales']),
-                'total_profit': int(row['total_profit']),
-                'profit_rate': round(profit_rate, 4)
-            }
-    finally:
-        conn.close()
+    row = sales_aggregates.get(year)
+    if not row or not row['total_sales']:
+        return {'total_sales': 0, 'total_profit': 0, 'profit_rate': 0}
+    return {
+        'total_sales': int(row['total_sales']),
+        'total_profit': int(row['total_profit']),
+        'profit_rate': row['profit_rate']
+    }
+
+class SalesForecaster:
+    """
+    [매출 예측 (선형회귀)]
+    - 매출 집계가 바뀔 때만 한 번 학습 (집계 캐시 version 기준)
+    - 매출/순이익 두 목표를 NumPy 최소제곱(lstsq) 한 번으로 동시에 학습
+    - 학습된 계수와 연도별 예측값을 캐시해 요청 시에는 조회만 수행
+    """
+
+    def __init__(self, aggregates: SalesAggregateCache, start_year: int = 2015, end_year: int = 2025):
+        self.aggregates = aggregates
+        self.start_year = start_year
+        self.end_year = end_year
+        self._coef: Optional[np.ndarray] = None
+        self._x_mean = 0.0
+        self._fitted_version = None
+        self._predictions: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> bool:
+        """집계가 바뀌었으면 다시 학습 (학습했으면 True)"""
+        self.aggregates.refresh()
+        if self._fitted_version == self.aggregates.version:
+            return False
+        with self._lock:
+            version = self.aggregates.version
+            if self._fitted_version == version:
+                return False
+            rows = [row for year, row in sorted(self.aggregates.all().items()) if self.start_year <= year <= self.end_year]
+            if len(rows) < 3:
+                # 데이터가 부족하면 예측하지 않음 (0 반환)
+                self._coef = None
+            else:
+                # 연도를 평균 중심으로 옮겨 수치 안정성 확보 후 [x, 1] 설계행렬로 두 목표 동시 학습
+                years = np.array([row['year'] for row in rows], dtype=np.float64)
+                self._x_mean = years.mean()
+                X = np.column_stack([years - self._x_mean, np.ones_like(years)])
+                Y = np.array([[float(row['total_sales']), float(row['total_profit'])] for row in rows])
+                self._coef, *_ = np.linalg.lstsq(X, Y, rcond=None)
+            self._predictions = {}
+            self._fitted_version = version
+        logger.info(f"[SALES] 매출 예측 모델 학습: {len(rows)}개 연도 (집계 v{version})")
+        return True
+
+    def predict_many(self, target_years) -> Dict[int, Dict[str, Any]]:
+        """여러 연도 예측 (학습된 계수로 한 번에 계산, 결과 캐시)"""
+        self.refresh()
+        target_years = [int(year) for year in target_years]
+        with self._lock:
+            missing = [year for year in target_years if year not in self._predictions]
+            if missing:
+                if self._coef is None:
+                    for year in missing:
+                        self._predictions[year] = {'total_sales': 0, 'total_profit': 0, 'profit_rate': 0}
+                else:
+                    X = np.column_stack([np.array(missing, dtype=np.float64) - self._x_mean, np.ones(len(missing))])
+                    for year, (pred_sales, pred_profit) in zip(missing, X @ self._coef):
+                        pred_sales, pred_profit = int(pred_sales), int(pred_profit)
+                        profit_rate = pred_profit / pred_sales if pred_sales else 0
+                        self._predictions[year] = {
+                            'total_sales': pred_sales,
+                            'total_profit': pred_profit,
+                            'profit_rate': round(profit_rate, 4)
+                        }
+            return {year: self._predictions[year] for year in target_years}
+
+# 전역 매출 예측기
+sales_forecaster = SalesForecaster(sales_aggregates)
 
 # AI 예측(선형회귀 기반) 함수
 def predict_sales(target_year):
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cursor:
-            sql = """
-                SELECT year, SUM(sales) as total_sales, SUM(net_profit) as total_profit
-                FROM sales_history
-                WHERE year >= 2015 AND year <= 2025
-                GROUP BY year
-                ORDER BY year
-            """
-            cursor.execute(sql)
-            rows = cursor.fetchall()
-            if len(rows) < 3:
-                # 데이터가 부족하면 0 반환
-                return {'total_sales': 0, 'total_profit': 0, 'profit_rate': 0}
-            X = np.array([[r['year']] for r in rows])
-            y_sales = np.array([r['total_sales'] for r in rows])
-            y_profit = np.array([r['total_profit'] for r in rows])
-            # 선형회귀 모델 학습
-            model_sales = LinearRegression().fit(X, y_sales)
-            model_profit = LinearRegression().fit(X, y_profit)
-            pred_sales = int(model_sales.predict([[target_year]])[0])
-            pred_profit = int(model_profit.predict([[target_year]])[0])
-            profit_rate = pred_profit / pred_sales if pred_sales else 0
-            return {
-                'total_sales': pred_sales,
-                'total_profit': pred_profit,
-                'profit_rate': round(profit_rate, 4)
-            }
-    finally:
-        conn.close() 
\ No newline at end of file
+    return sales_forecaster.predict_many([target_year])[int(target_year)]
+
+# 연도 구간 매출/예측 일괄 조회 함수 (컬럼 배열 형태)
+def get_sales_range(from_year: int, to_year: int) -> Dict[str, Any]:
+    years = list(range(from_year, to_year + 1))
+    summaries = [get_sales_summary(year) for year in years]
+    predictions = sales_forecaster.predict_many(years)
+    return {
+        'years': years,
+        'total_sales': [summary['total_sales'] for summary in summaries],
+        'profit_rate': [summary['profit_rate'] for summary in summaries],
+        'ai_predict': {
+            'total_sales': [predictions[year]['total_sales'] for year in years],
+            'profit_rate': [predictions[year]['profit_rate'] for year in years]
+        }
+    }
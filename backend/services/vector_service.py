@@ -0,0 +1,271 @@
+import json
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import get_config
+from database import get_db_connection
+from core.utils.pattern_matcher import pattern_matcher
+from services.chroma_service import (
+    collection_registry,
+    get_live_collection,
+    sync_db_collection
+)
+import logging
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 설정 로드
+config = get_config()
+
+# 컬렉션 유형별 변경 감지 대상 테이블 (행 수 + MAX(updated_at))
+WATCHED_TABLES = {
+    'pattern': ['patterns', 'patterns_responses', 'responses', 'routes'],
+    'widget': ['widgets']
+}
+
+def _parse_document_id(doc_id: str) -> Optional[Tuple[str, int]]:
+    """고정 문서 ID("{type}-{원본 ID}-{행 지문}")에서 (유형, 원본 ID) 추출 (원본 ID가 없으면 None)"""
+    parts = doc_id.split('-')
+    if len(parts) != 3 or not parts[1].isdigit():
+        return None
+    return parts[0], int(parts[1])
+
+class VectorSyncService:
+    """
+    [MySQL -> Chroma 변경 동기화]
+    - poll(): 컬렉션별 감시 테이블의 (행 수, MAX(updated_at))를 이전 값과 비교해 바뀐 컬렉션만 동기화
+    - notify_change(): 저장 직후 호출하면 다음 poll에서 변경 감지 없이 바로 동기화
+    - 동기화는 sync_db_collection으로 바뀐 행만 임베딩/upsert/delete 후 컬렉션 레지스트리 갱신
+    - 바뀐 패턴/위젯은 vector_store(vector_status)와 vector_update_logs에 결과 기록
+    """
+
+    def __init__(self):
+        self._watermarks: Dict[str, Tuple] = {}
+        self._dirty = set()
+        self._dirty_lock = threading.Lock()
+        # 동기화는 한 번에 하나 (스케줄러 주기 작업과 새벽 검증 작업이 겹치지 않도록)
+        self._sync_lock = threading.Lock()
+        self._stats = {
+            'runs': 0,
+            'upserted': 0,
+            'deleted': 0,
+            'failed': 0,
+            'errors': 0,
+            'last_sync_at': None,
+            'last_error': None
+        }
+
+    @staticmethod
+    def _collections() -> Dict[str, Dict[str, Any]]:
+        return {item["collection"]: item for item in config.DB_CHROMA_COLLECTIONS}
+
+    @staticmethod
+    def _read_watermark(tables: List[str]) -> Tuple:
+        """감시 테이블별 (테이블, 행 수, 최종 수정 시각)"""
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(" UNION ALL ".join(
+                    f"SELECT '{table}' AS table_name, COUNT(*) AS row_count, MAX(updated_at) AS last_updated FROM `{table}`"
+                    for table in tables
+                ))
+                return tuple(
+                    (row['table_name'], row['row_count'], str(row['last_updated']))
+                    for row in cursor.fetchall()
+                )
+        finally:
+            conn.close()
+
+    def notify_change(self, doc_type: Optional[str] = None) -> None:
+        """원본 데이터 변경 알림 (doc_type: 'pattern'/'widget', None이면 전체)"""
+        names = [name for name, item in self._collections().items() if doc_type is None or item["type"] == doc_type]
+        with self._dirty_lock:
+            self._dirty.update(names)
+        logger.info(f"[VECTOR] 변경 알림: {names}")
+        # 패턴 사전 매처는 벡터 동기화를 기다리지 않고 바로 갱신
+        if doc_type in (None, 'pattern'):
+            pattern_matcher.refresh()
+
+    def poll(self) -> Dict[str, Dict[str, Any]]:
+        """변경된 컬렉션만 동기화 - 컬렉션별 동기화 결과 반환"""
+        results = {}
+        for name, item in self._collections().items():
+            tables = WATCHED_TABLES.get(item["type"])
+            try:
+                watermark = self._read_watermark(tables) if tables else None
+            except Exception as e:
+                logger.error(f"[VECTOR] 변경 감지 실패: {name} - {str(e)}")
+                continue
+            with self._dirty_lock:
+                notified = name in self._dirty
+                self._dirty.discard(name)
+            if not notified and watermark is not None and watermark == self._watermarks.get(name):
+                continue
+            result = self.sync(item)
+            if result is None:
+                # 실패 시 다음 주기에 다시 시도
+                with self._dirty_lock:
+                    self._dirty.add(name)
+                continue
+            if result['failed_ids']:
+                # 저장하지 못한 문서는 소스 지문에서 빠져 있으므로 다음 주기에 다시 시도
+                with self._dirty_lock:
+                    self._dirty.add(name)
+            self._watermarks[name] = watermark
+            results[name] = result
+        return results
+
+    def sync(self, item: Dict[str, Any], force: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        컬렉션 하나 동기화 (실패 시 None)
+        - force: 소스 지문이 같아도 저장된 ID와 비교 (검증용)
+        """
+        collection_name = item["collection"]
+        with self._sync_lock:
+            self._stats['runs'] += 1
+            try:
+                result = sync_db_collection(item, force=force)
+                collection_registry.refresh(collection_name)
+            except Exception as e:
+                self._stats['errors'] += 1
+                self._stats['last_error'] = f"{collection_name}: {str(e)}"
+                logger.error(f"[VECTOR] 동기화 실패: {collection_name} - {str(e)}")
+                return None
+            self._stats['upserted'] += result['upserted']
+            self._stats['deleted'] += result['deleted']
+            self._stats['failed'] += len(result['failed_ids'])
+            self._stats['last_sync_at'] = datetime.now().isoformat()
+
+        if result['upserted'] or result['deleted'] or result['failed_ids']:
+            logger.info(f"[VECTOR] {collection_name} 동기화: upsert {result['upserted']}개, "
+                        f"delete {result['deleted']}개, 실패 {len(result['failed_ids'])}개")
+            if item["type"] == 'pattern':
+                # 알림 없이 DB에서 직접 바뀐 패턴도 사전 매처에 반영
+                pattern_matcher.refresh()
+            try:
+                self._record(item, result)
+            except Exception as e:
+                logger.error(f"[VECTOR] vector_store 상태 기록 실패: {collection_name} - {str(e)}")
+        return result
+
+    def _record(self, item: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """
+        바뀐 원본 행의 처리 결과를 vector_store / vector_update_logs에 기록
+        - 원본 ID 하나에 문서가 여러 개일 수 있으므로 (패턴별 응답마다 문서), 바뀐 원본 ID의 vector_store 행은
+          모두 지우고 컬렉션에 남아 있는 문서마다 한 행씩 다시 기록
+        - 컬렉션에 문서가 남지 않은 원본 ID는 기존 행의 vector_status만 갱신
+        """
+        doc_type = item["type"]
+        id_column = f"{doc_type}_id"
+        if id_column not in ('pattern_id', 'widget_id'):
+            return
+
+        # 1. 바뀐 원본 ID 및 임베딩에 실패한 원본 ID별 실패 사유
+        touched = set()
+        failed_sources: Dict[int, List[str]] = {}
+        for doc_ids, failed in ((result['deleted_ids'], False), (result['upserted_ids'], False), (result['failed_ids'], True)):
+            for doc_id in doc_ids:
+                parsed = _parse_document_id(doc_id)
+                if parsed and parsed[0] == doc_type:
+                    touched.add(parsed[1])
+                    if failed:
+                        reasons = failed_sources.setdefault(parsed[1], [])
+                        reason = result.get('failed_reasons', {}).get(doc_id)
+                        if reason and reason not in reasons:
+                            reasons.append(reason)
+        if not touched:
+            return
+        source_ids = sorted(touched)
+
+        # 2. 바뀐 원본 ID의 현재 문서(임베딩/본문)를 컬렉션에서 모두 다시 읽음 (바뀌지 않은 다른 응답 문서 포함)
+        live_docs: Dict[int, List[Tuple]] = {}
+        stored = get_live_collection(item["collection"]).get(
+            where={id_column: {"$in": source_ids}},
+            include=["embeddings", "documents", "metadatas"]
+        )
+        for doc_id, embedding, document, metadata in zip(
+                stored["ids"], stored["embeddings"], stored["documents"], stored["metadatas"]):
+            parsed = _parse_document_id(doc_id)
+            if parsed and parsed[1] in touched:
+                live_docs.setdefault(parsed[1], []).append((embedding, document, metadata or {}))
+
+        statuses = {
+            source_id: 'failed' if source_id in failed_sources else ('synced' if source_id in live_docs else 'deleted')
+            for source_id in source_ids
+        }
+
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                inserts = [
+                    (
+                        source_id,
+                        json.dumps([float(value) for value in embedding]),
+                        document,
+                        metadata.get('response', ''),
+                        doc_type
+                    )
+                    for source_id, docs in live_docs.items()
+                    for embedding, document, metadata in docs
+                ]
+                if live_docs:
+                    rewritten = sorted(live_docs)
+                    cursor.execute(
+                        f"DELETE FROM vector_store WHERE {id_column} IN ({', '.join(['%s'] * len(rewritten))})",
+                        rewritten
+                    )
+                    cursor.executemany(f'''
+                        INSERT INTO vector_store ({id_column}, vector, pattern_text, response, vector_type, vector_status)
+                        VALUES (%s, %s, %s, %s, %s, 'synced')
+                    ''', inserts)
+                status_updates = [
+                    (status, source_id) for source_id, status in statuses.items() if source_id not in live_docs
+                ]
+                if status_updates:
+                    cursor.executemany(f'UPDATE vector_store SET vector_status = %s WHERE {id_column} = %s', status_updates)
+                if doc_type == 'pattern':
+                    cursor.executemany('''
+                        INSERT INTO vector_update_logs (pattern_id, status, error_message)
+                        VALUES (%s, %s, %s)
+                    ''', [
+                        (source_id, status, ('; '.join(failed_sources[source_id]) or None) if status == 'failed' else None)
+                        for source_id, status in statuses.items()
+                    ])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def validate(self) -> Dict[str, Dict[str, Any]]:
+        """전체 DB 컬렉션을 저장된 ID와 비교해 어긋난 문서 정리 (소스 지문 무시)"""
+        results = {}
+        for name, item in self._collections().items():
+            result = self.sync(item, force=True)
+            if result is not None:
+                results[name] = result
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """동기화 실행/처리 건수 및 마지막 동기화 시각"""
+        with self._dirty_lock:
+            pending = sorted(self._dirty)
+        return {**self._stats, 'pending': pending}
+
+# 전역 벡터 동기화 서비스
+vector_sync = VectorSyncService()
+
+def sync_vector_store() -> Dict[str, Dict[str, Any]]:
+    """변경된 DB 컬렉션 동기화 (스케줄러 주기 작업)"""
+    return vector_sync.poll()
+
+def notify_vector_change(doc_type: Optional[str] = None) -> None:
+    """패턴/위젯 저장 후 호출 - 다음 동기화 주기에 해당 컬렉션 동기화"""
+    vector_sync.notify_change(doc_type)
+
+def validate_vector_store() -> Dict[str, Dict[str, Any]]:
+    """전체 DB 컬렉션 검증 및 정리"""
+    return vector_sync.validate()
@@ -2,6 +2,7 @@ from services.chat_service import get_ai_response
 from core.converters.widget_converter import widget_to_document
 from common.logger import setup_logger
 from database import get_db_connection
+from core.utils.common_utils import normalize_text
 import re
 
 logger = setup_logger('widget_service')
@@ -25,8 +26,7 @@ def get_all_widgets():
 
 def is_all_widget_query(query):
     """한글 쿼리에서 공백/특수문자 제거 후 전체 위젯 요청 패턴 유연하게 인식"""
-    norm = re.sub(r'\s+', '', query)
-    norm = re.sub(r'[\W_]+', '', norm)  # 한글, 영문, 숫자만 남김
+    norm = normalize_text(query)  # 한글, 영문, 숫자만 남김
     patterns = [
         '전체위젯', '모든위젯', '지원하는위젯', '위젯정보'
     ]
@@ -102,4 +102,6 @@ def upsert_widget(widget):
             conn.commit()
     finally:
         conn.close()
-    # 벡터스토어 동기화 코드 제거 (chroma_service.py에서 일괄 처리) 
\ No newline at end of file
+    # 벡터스토어 동기화 요청 (다음 동기화 주기에 widget_collection 반영)
+    from services.vector_service import notify_vector_change
+    notify_vector_change('widget') 
\ No newline at end of file